@@ -0,0 +1,203 @@
+# jobs.py
+"""
+Background jobs for computations too long for one HTTP request.
+
+A job is identified by the hash of its kind, canonical inputs and the
+source version of its code (`kernels.py` and the Python files of the app
+it runs). Submitting the same inputs again returns the existing job,
+whether it is queued, running or done, so repeated requests reuse in-flight
+work and finished results. Only failed jobs are run again, and a code change
+gives new job ids, so results of older code are never served.
+
+Job state lives in SQLite (`jobs.sqlite`, WAL mode). The worker process
+running a job writes its own progress rows there, so any process can poll
+them, and the server streams them as Server-Sent Events. Jobs still queued
+or running when the server stopped are started again on the next start.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import traceback
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+import kernels
+
+JOBS_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobs.sqlite")
+PROGRESS_INTERVAL = 0.2  # s between progress writes from a worker
+FINISHED = ("done", "failed")
+JOB_APPS = {"fin-optimization": "webAppOpt", "hourly-simulation": "webAppCycle"}  # app folder each kind runs
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, updated);
+"""
+
+
+def canonical_inputs(inputs) -> str:
+    return json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+
+
+@lru_cache(maxsize=None)
+def source_version(kind) -> str:
+    """Hash of kernels.py and every Python file of the app that `kind` runs."""
+    paths = [os.path.abspath(kernels.__file__)]
+    for folder, dirs, files in os.walk(kernels.APP_DIRS[JOB_APPS[kind]]):
+        dirs[:] = sorted(d for d in dirs if d not in ("__pycache__", "cache", "user_data"))
+        paths += [os.path.join(folder, name) for name in sorted(files) if name.endswith(".py")]
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.relpath(path, kernels.REPO_ROOT).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def job_id(kind, inputs) -> str:
+    key = f"{kind}:{source_version(kind)}:{canonical_inputs(inputs)}"
+    return hashlib.sha256(key.encode()).hexdigest()[:20]
+
+
+class JobStore:
+    def __init__(self, path=JOBS_DB):
+        self.path = path
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """One transaction: committed (or rolled back) and the connection closed on exit."""
+        with contextlib.closing(sqlite3.connect(self.path, timeout=10)) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.row_factory = sqlite3.Row
+            with db:
+                yield db
+
+    @staticmethod
+    def _as_dict(row, with_result=True):
+        job = {k: row[k] for k in ("id", "kind", "status", "progress", "message", "error", "created", "updated")}
+        job["inputs"] = json.loads(row["inputs"])
+        if with_result:
+            job["result"] = json.loads(row["result"]) if row["result"] else None
+        return job
+
+    def get(self, job, with_result=True):
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job,)).fetchone()
+        return self._as_dict(row, with_result) if row else None
+
+    def list(self, status=None, limit=50):
+        query, args = "SELECT * FROM jobs", []
+        if status:
+            query += " WHERE status = ?"
+            args.append(status)
+        query += " ORDER BY updated DESC LIMIT ?"
+        args.append(int(limit))
+        with self._connect() as db:
+            return [self._as_dict(row, with_result=False) for row in db.execute(query, args)]
+
+    def claim(self, kind, inputs):
+        """(job, created): the existing job for these inputs, or a new queued one."""
+        key, now = job_id(kind, inputs), time.time()
+        with self._connect() as db:
+            row = db.execute("SELECT status FROM jobs WHERE id = ?", (key,)).fetchone()
+            if row is not None and row["status"] != "failed":
+                created = False
+            else:
+                db.execute("INSERT OR REPLACE INTO jobs(id, kind, inputs, status, created, updated) "
+                           "VALUES (?, ?, ?, 'queued', ?, ?)", (key, kind, canonical_inputs(inputs), now, now))
+                created = True
+        return self.get(key, with_result=False), created
+
+    def update(self, job, **fields):
+        fields["updated"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as db:
+            db.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job))
+
+    def unfinished(self):
+        with self._connect() as db:
+            rows = db.execute("SELECT * FROM jobs WHERE status IN ('queued', 'running') ORDER BY created").fetchall()
+        return [self._as_dict(row, with_result=False) for row in rows]
+
+
+def execute(job, kind, inputs, db_path=JOBS_DB):
+    """Run one job in a worker process, writing status and progress to the store."""
+    store = JobStore(db_path)
+    store.update(job, status="running", progress=0.0, message="started")
+    last = [0.0]
+
+    def progress(fraction, message=""):
+        now = time.monotonic()
+        if now - last[0] >= PROGRESS_INTERVAL:
+            last[0] = now
+            store.update(job, progress=min(max(float(fraction), 0.0), 1.0), message=message)
+
+    try:
+        result = kernels.JOBS[kind](inputs, progress)
+    except Exception as exc:
+        store.update(job, status="failed", error=f"{type(exc).__name__}: {exc}",
+                     message=traceback.format_exc(limit=3).splitlines()[-1])
+        return False
+    store.update(job, status="done", progress=1.0, message="finished", result=json.dumps(result))
+    return True
+
+
+class JobManager:
+    """Deduplicating front of the job pool; safe to call from the event loop."""
+
+    def __init__(self, executor, db_path=JOBS_DB):
+        self.executor = executor
+        self.db_path = db_path
+        self.store = JobStore(db_path)
+        self._futures = {}
+        for job in self.store.unfinished():
+            self._start(job["id"], job["kind"], job["inputs"])
+
+    def submit(self, kind, inputs):
+        """(job, deduplicated). Raises ValueError for an unknown kind or non-object inputs.
+
+        Raises BrokenProcessPool if the job pool can no longer start work.
+        """
+        if kind not in kernels.JOBS:
+            raise ValueError(f"Unknown job kind {kind!r}; expected one of {list(kernels.JOBS)}")
+        if not isinstance(inputs, dict):
+            raise ValueError("inputs must be a JSON object")
+        job, created = self.store.claim(kind, inputs)
+        if created:
+            try:
+                self._start(job["id"], kind, inputs)
+            except BrokenProcessPool as exc:
+                # Failed rows are claimed again, so the job can be resubmitted once the pool is back
+                self.store.update(job["id"], status="failed", error=f"BrokenProcessPool: {exc}")
+                raise
+        return job, not created
+
+    def _start(self, job, kind, inputs):
+        future = self.executor.submit(execute, job, kind, inputs, self.db_path)
+        self._futures[job] = future
+
+        def finished(f):
+            self._futures.pop(job, None)
+            if f.exception() is not None:  # the worker itself died
+                self.store.update(job, status="failed", error=repr(f.exception()))
+
+        future.add_done_callback(finished)
+
+    def running(self):
+        return len(self._futures)
@@ -0,0 +1,236 @@
+# kernels.py
+"""
+The apps' calculation code, loaded into the API's worker processes.
+
+Each app's modules are imported from their own folder. Single-file kernels
+are loaded by path under a private name, so `webAppOpt/simulation.py` and
+`webAppCycle/simulation.py` never collide in `sys.modules`. Every kernel
+takes a list of request bodies and returns one JSON-ready result per item,
+so the server can hand a whole batch to a worker in one round trip.
+"""
+
+import importlib
+import importlib.util
+import math
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+APP_DIRS = {
+    "webApp": os.path.join(REPO_ROOT, "webApp"),
+    "webAppOpt": os.path.join(REPO_ROOT, "webAppOpt"),
+    "webAppCycle": os.path.join(REPO_ROOT, "webAppCycle"),
+}
+
+MAX_POINTS = 10000  # per boundary-layer profile; bounds the work and the response size
+
+_modules = {}
+
+
+class KernelError(ValueError):
+    """Bad request body for a kernel; reported to the client as a 400."""
+
+
+def _load_file(name, path):
+    if name not in _modules:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[name] = module
+    return _modules[name]
+
+
+def fin_module():
+    return _load_file("_kernel_fin_simulation", os.path.join(APP_DIRS["webAppOpt"], "simulation.py"))
+
+
+def boundary_layer_module():
+    return _load_file("_kernel_boundary_layer", os.path.join(APP_DIRS["webApp"], "boundary_layer.py"))
+
+
+def cooling_modules():
+    # Tab1 is a package with top-level imports of its app, so it needs the app folder on the path
+    if "cooling" not in _modules:
+        if APP_DIRS["webAppCycle"] not in sys.path:
+            sys.path.insert(0, APP_DIRS["webAppCycle"])
+        _modules["cooling"] = (importlib.import_module("Tab1.calculations"),
+                               importlib.import_module("functions"))
+    return _modules["cooling"]
+
+
+def warm():
+    """Process-pool initializer: import every kernel once per worker."""
+    fin_module()
+    boundary_layer_module()
+    cooling_modules()
+
+
+def jsonable(value):
+    """Plain Python types only; NaN/inf become None."""
+    if isinstance(value, dict):
+        return {str(k): jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return jsonable(value.tolist())
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return value if math.isfinite(value) else None
+    return value
+
+
+def _names(values) -> str:
+    # str(), not repr(), so NumPy scalars read as plain text: 'Oil', not np.str_('Oil')
+    return ", ".join(f"'{v}'" for v in values)
+
+
+# --- Kernels ---
+def fin_spacing(items):
+    """Optimal and suggested fin spacing. Item: {"oil": name} or {"props": {...}}, optional "delta_T"."""
+    sim = fin_module()
+    results = []
+    for item in items:
+        if "props" in item:
+            props = item["props"]
+        elif item.get("oil") in sim.oil_data:
+            props = sim.oil_data[item["oil"]]
+        else:
+            raise KernelError(f"Unknown oil '{item.get('oil')}'; expected one of {_names(sim.oil_data)} or 'props'")
+        fluid, summary = sim.oil_summary(props, float(item.get("delta_T", sim.delta_T)))
+        results.append(jsonable({"oil": item.get("oil"), "fluid": fluid, "summary": summary}))
+    return results
+
+
+def boundary_layer(items):
+    """Flat-plate boundary layer. Item: {"fluid", "velocity", "film_temperature", "points"}."""
+    bl = boundary_layer_module()
+    results = []
+    for item in items:
+        fluid = item.get("fluid", "Oil")
+        if fluid not in bl.FLUIDS:
+            raise KernelError(f"Unknown fluid '{fluid}'; expected one of {_names(bl.FLUIDS)}")
+        velocity = float(item.get("velocity", 1.0))
+        if velocity <= 0:
+            raise KernelError("velocity must be positive")
+        points = int(item.get("points", 500))
+        if not 2 <= points <= MAX_POINTS:
+            raise KernelError(f"points must be between 2 and {MAX_POINTS}")
+        props = bl.fluid_properties(fluid, float(item.get("film_temperature", 50)))
+        profile = bl.boundary_layer(velocity, props["nu"], props["Pr"], n=points)
+        results.append(jsonable({
+            "fluid": fluid,
+            "properties": props,
+            "profile": profile,
+            "delta_end": profile["delta"][-1],
+            "delta_t_end": profile["delta_t"][-1],
+            "Re_end": profile["Re_x"][-1],
+        }))
+    return results
+
+
+def cooling_load(items):
+    """Tab 1 steady-state loads. Item: {"inputs": {...}} overriding the defaults.
+
+    All items run as one vectorized `calculate_outputs_batch` call. Without a
+    `solar_irradiance` input, the peak façade irradiance over the whole weather
+    archive is used.
+    """
+    calculations, functions = cooling_modules()
+    defaults = functions.get_default_inputs()
+    rows = []
+    for item in items:
+        row = dict(defaults)
+        for key, value in dict(item.get("inputs", {})).items():
+            if key in defaults and isinstance(defaults[key], (int, float)) and not isinstance(defaults[key], bool):
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    raise KernelError(f"Invalid number for {key}: '{value}'") from None
+            row[key] = value
+        rows.append(row)
+    frame = pd.DataFrame(rows)
+    if "solar_irradiance" in frame and frame["solar_irradiance"].isna().any():
+        raise KernelError("solar_irradiance must be given for every room in a batch, or for none")
+    outputs = calculations.calculate_outputs_batch(frame, defaults)
+    return [jsonable(row) for row in outputs.to_dict(orient="records")]
+
+
+KERNELS = {
+    "fin-spacing": fin_spacing,
+    "boundary-layer": boundary_layer,
+    "cooling-load": cooling_load,
+}
+
+
+# --- Long-running jobs (see jobs.py); each reports progress(fraction, message) ---
+def fin_optimization_job(inputs, progress):
+    """Fin spacing for several oils. Inputs: {"oils": [names], "delta_T"}; all oils by default."""
+    sim = fin_module()
+    oils = inputs.get("oils") or list(sim.oil_data)
+    unknown = [oil for oil in oils if oil not in sim.oil_data]
+    if unknown:
+        raise KernelError(f"Unknown oils {_names(unknown)}")
+    results = {}
+    for i, oil in enumerate(oils):
+        def generation(xk, convergence=0.0, i=i, oil=oil):
+            progress((i + min(convergence, 1.0)) / len(oils), f"{oil}: spacing {xk[0] * 1000:.2f} mm")
+        fluid, summary = sim.oil_summary(sim.oil_data[oil], float(inputs.get("delta_T", sim.delta_T)), generation)
+        results[oil] = {"fluid": fluid, "summary": summary}
+        progress((i + 1) / len(oils), f"{oil} done")
+    return jsonable(results)
+
+
+def hourly_simulation_job(inputs, progress):
+    """Tab 1 transient runs with energy totals.
+
+    Inputs: {"start": date, "days": n, "configs": [{input overrides}, ...]}.
+    """
+    _, functions = cooling_modules()
+    energy = importlib.import_module("Tab1.energy")
+    configs = inputs.get("configs") or [{}]
+    start = inputs.get("start", "2024-07-01")
+    results = []
+    for i, overrides in enumerate(configs):
+        room = dict(functions.get_default_inputs(), **overrides)
+        if "days" in inputs:
+            room["simulation_days"] = int(inputs["days"])
+        summary = energy.energy_summary(room, start)
+        if summary is None:
+            raise KernelError(f"No weather data from {start}")
+        totals, monthly, _ = summary
+        results.append({"inputs": overrides, "totals": totals, "monthly": monthly.reset_index().to_dict(orient="records")})
+        progress((i + 1) / len(configs), f"configuration {i + 1}/{len(configs)}")
+    return jsonable(results)
+
+
+JOBS = {
+    "fin-optimization": fin_optimization_job,
+    "hourly-simulation": hourly_simulation_job,
+}
+
+
+def run_batch(kernel, items):
+    """[(HTTP status, result or error message)] for each item of one batch.
+
+    A failing batch is retried item by item, so one bad request does not
+    fail the others.
+    """
+    func = KERNELS[kernel]
+    try:
+        return [(200, r) for r in func(items)]
+    except Exception:
+        return [_run_one(func, item) for item in items]
+
+
+def _run_one(func, item):
+    try:
+        return 200, func([item])[0]
+    except (ValueError, TypeError) as exc:  # KernelError and bad numbers in the body
+        return 400, str(exc)
+    except Exception as exc:
+        return 500, f"{type(exc).__name__}: {exc}"
@@ -0,0 +1,319 @@
+# main.py
+"""
+HTTP compute API for the simulation kernels (standard library asyncio only).
+
+    GET  /health
+    GET  /api/stats
+    POST /api/fin-spacing      {"oil": "Shell Risella X 430", "delta_T": 15}
+    POST /api/boundary-layer   {"fluid": "Oil", "velocity": 1.0, "film_temperature": 50}
+    POST /api/cooling-load     {"inputs": {"floor_area": 30, "num_people": 3}}
+
+    POST /api/jobs             {"kind": "fin-optimization", "inputs": {...}}
+    GET  /api/jobs             recent jobs (?status=running)
+    GET  /api/jobs/<id>        state, progress and result (polling)
+    GET  /api/jobs/<id>/events progress as Server-Sent Events
+
+Everything else is served from `front_end/static`.
+
+Kernels run in a process pool (see `kernels.py`), so the event loop only
+parses requests and writes responses. Requests for the same kernel that
+arrive within a few milliseconds are sent to a worker as one batch. For the
+cooling load that batch is a single vectorized call. Identical bodies
+share one in-flight computation, and finished responses are kept in an LRU.
+Long computations go through `jobs.py` on a separate pool, so they never
+hold up the request workers.
+
+    python back_end/python_app/main.py --port 8000 --workers 4 --job-workers 1
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import mimetypes
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+
+import jobs
+import kernels
+
+STATIC_DIR = os.path.join(kernels.REPO_ROOT, "front_end", "static")
+MAX_BODY_BYTES = 1 << 20
+BATCH_WINDOW = 0.005  # s to wait for more requests before dispatching a batch
+MAX_BATCH = 256
+CACHE_ENTRIES = 2048
+EVENT_POLL = 0.25  # s between job-state checks of an event stream
+
+
+def canonical_key(kernel, body) -> str:
+    payload = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{kernel}:{payload}".encode()).hexdigest()
+
+
+class ResponseCache:
+    """LRU of encoded (status, body bytes) responses."""
+
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if key in self._items:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+
+class Batcher:
+    """Collects requests for one kernel and runs them in the pool in batches."""
+
+    def __init__(self, kernel, pool, window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        self.kernel = kernel
+        self.pool = pool
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = []        # (key, body)
+        self._inflight = {}       # key -> Future shared by identical requests
+        self._timer = None
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, key, body) -> asyncio.Future:
+        if key in self._inflight:
+            return self._inflight[key]
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self._pending.append((key, body))
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._dispatch)
+        return future
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        keys = [key for key, _ in batch]
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.pool, kernels.run_batch, self.kernel, [body for _, body in batch])
+        except Exception as exc:  # worker died or the batch could not be pickled
+            results = [(500, f"{type(exc).__name__}: {exc}")] * len(batch)
+        for key, result in zip(keys, results):
+            future = self._inflight.pop(key)
+            if not future.done():
+                future.set_result(result)
+
+
+class ComputeServer:
+    def __init__(self, pool, job_pool):
+        self.pool = pool
+        self.jobs = jobs.JobManager(job_pool)
+        self.cache = ResponseCache()
+        self.batchers = {name: Batcher(name, pool) for name in kernels.KERNELS}
+        self.started = time.time()
+
+    # --- Routing ---
+    async def dispatch(self, method, path, body):
+        """(status, content type, body) for one request; body is bytes or an async iterator."""
+        path, _, query = path.partition("?")
+        if path == "/health":
+            return self._json(200, {"status": "ok"})
+        if path == "/api/stats":
+            return self._json(200, self.stats())
+        if path == "/api/jobs" or path.startswith("/api/jobs/"):
+            return self.job_route(method, path, body, query)
+        if path.startswith("/api/"):
+            kernel = path[len("/api/"):]
+            if kernel not in kernels.KERNELS:
+                return self._json(404, {"error": f"Unknown endpoint {path}"})
+            if method != "POST":
+                return self._json(405, {"error": "Use POST with a JSON body"})
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                return self._json(400, {"error": "Body is not valid JSON"})
+            if not isinstance(payload, dict):
+                return self._json(400, {"error": "Body must be a JSON object"})
+            return await self.compute(kernel, payload)
+        if method in ("GET", "HEAD"):
+            return self._static(path)
+        return self._json(405, {"error": "Method not allowed"})
+
+    async def compute(self, kernel, payload):
+        key = canonical_key(kernel, payload)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        status, result = await self.batchers[kernel].submit(key, payload)
+        response = self._json(status, result if status == 200 else {"error": result})
+        if status in (200, 400):  # server errors may be transient, so they are not cached
+            self.cache.put(key, response)
+        return response
+
+    def job_route(self, method, path, body, query):
+        parts = path.strip("/").split("/")  # ["api", "jobs", id, "events"]
+        if len(parts) == 2:
+            if method == "POST":
+                try:
+                    payload = json.loads(body or b"{}")
+                    job, deduplicated = self.jobs.submit(payload.get("kind"), payload.get("inputs", {}))
+                except (ValueError, AttributeError) as exc:
+                    return self._json(400, {"error": str(exc)})
+                except BrokenProcessPool:
+                    return self._json(503, {"error": "Job workers are unavailable; try again later"})
+                return self._json(202, dict(job, deduplicated=deduplicated))
+            status = dict(p.partition("=")[::2] for p in query.split("&") if p).get("status")
+            return self._json(200, self.jobs.store.list(status=status))
+        job = self.jobs.store.get(parts[2])
+        if job is None:
+            return self._json(404, {"error": f"Unknown job {parts[2]}"})
+        if len(parts) == 4 and parts[3] == "events":
+            return 200, "text/event-stream", self.job_events(parts[2])
+        return self._json(200, job)
+
+    async def job_events(self, job_id):
+        """SSE stream: a "progress" event per state change, then "done" or "failed"."""
+        last = None
+        while True:
+            job = self.jobs.store.get(job_id, with_result=False)
+            state = (job["status"], job["progress"], job["message"])
+            if state != last:
+                last = state
+                event = job["status"] if job["status"] in jobs.FINISHED else "progress"
+                yield f"event: {event}\ndata: {json.dumps(job)}\n\n".encode()
+                if event != "progress":
+                    return
+            await asyncio.sleep(EVENT_POLL)
+
+    def stats(self):
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "cache": {"entries": len(self.cache._items), "hits": self.cache.hits, "misses": self.cache.misses},
+            "batches": {name: {"batches": b.batches, "items": b.items} for name, b in self.batchers.items()},
+            "jobs_running": self.jobs.running(),
+        }
+
+    @staticmethod
+    def _json(status, data):
+        return status, "application/json", json.dumps(data).encode()
+
+    @staticmethod
+    def _static(path):
+        relative = os.path.normpath(path.lstrip("/") or "index.html")
+        full = os.path.join(STATIC_DIR, relative)
+        if relative.startswith("..") or not os.path.isfile(full):
+            return 404, "text/plain", b"Not found"
+        with open(full, "rb") as f:
+            return 200, mimetypes.guess_type(full)[0] or "application/octet-stream", f.read()
+
+    # --- HTTP/1.1 ---
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode("latin-1").split(maxsplit=2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    status, content_type, body = self._json(413, {"error": "Body too large"})
+                    keep_alive = False
+                else:
+                    request_body = await reader.readexactly(length) if length else b""
+                    keep_alive = (headers.get("connection", "").lower() != "close"
+                                  and version.strip().upper() == "HTTP/1.1")
+                    if method == "OPTIONS":
+                        status, content_type, body = 204, "text/plain", b""
+                    else:
+                        status, content_type, body = await self.dispatch(method, path, request_body)
+
+                reason = HTTPStatus(status).phrase
+                if not isinstance(body, bytes):
+                    await self._stream(writer, status, reason, content_type, body)
+                    break
+                head = (f"HTTP/1.1 {status} {reason}\r\n"
+                        f"Content-Type: {content_type}\r\n"
+                        f"Content-Length: {len(body)}\r\n"
+                        "Access-Control-Allow-Origin: *\r\n"
+                        "Access-Control-Allow-Headers: Content-Type\r\n"
+                        "Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+                writer.write(head.encode("latin-1") + (b"" if method == "HEAD" else body))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+    @staticmethod
+    async def _stream(writer, status, reason, content_type, chunks):
+        head = (f"HTTP/1.1 {status} {reason}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                "Cache-Control: no-cache\r\n"
+                "Access-Control-Allow-Origin: *\r\n"
+                "Connection: close\r\n\r\n")
+        writer.write(head.encode("latin-1"))
+        async for chunk in chunks:
+            writer.write(chunk)
+            await writer.drain()
+
+
+async def serve(host, port, workers, job_workers):
+    with ProcessPoolExecutor(max_workers=workers, initializer=kernels.warm) as pool, \
+            ProcessPoolExecutor(max_workers=job_workers) as job_pool:
+        app = ComputeServer(pool, job_pool)
+        server = await asyncio.start_server(app.handle, host, port)
+        print(f"Compute API on http://{host}:{port} ({pool._max_workers} workers, {job_workers} job workers)")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--job-workers", type=int, default=1)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.job_workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+#!/usr/bin/env sh
+# Start the compute API (see back_end/python_app/main.py for endpoints)
+exec python "$(dirname "$0")/../back_end/python_app/main.py" "$@"
@@ -142,82 +142,33 @@
 
 
 import streamlit as st
-import numpy as np
-import plotly.graph_objects as go
 from dataclasses import dataclass
 from report import show_html_report
+from boundary_layer import boundary_layer, fluid_properties
+from cancellation import run_latest
+from lazy import lazy
 
-# --- Page Config ---
-st.set_page_config(page_title="Boundary Layer Calculator", layout="wide")
-
-# --- Data Structure for Report Inputs ---
-@dataclass
-class ReportData:
-    fluid_name: str
-    Pr: float
-    delta_end: float
-    delta_t_end: float
-    Re_end: float
-
-# --- Viscosity Function for Oil ---
-def kinematic_viscosity_oil(T):
-    """
-    Estimate kinematic viscosity [m²/s] of oil based on temperature using log-log interpolation.
-    """
-    T1, nu1 = 40, 43.0e-6   # in m²/s
-    T2, nu2 = 100, 7.6e-6   # in m²/s
-    log_nu1 = np.log10(nu1)
-    log_nu2 = np.log10(nu2)
-    log_nu_T = log_nu1 + ((T - T1) / (T2 - T1)) * (log_nu2 - log_nu1)
-    return 10**log_nu_T
-
-# --- Title and Description ---
-st.title("🧮 Boundary Layer Thickness Calculator")
-
-# --- Full-Page Two-Column Layout ---
-left_col, right_col = st.columns([1, 1], gap="Large")
-
-# === LEFT COLUMN: Inputs + Plots ===
-with left_col:
-    st.markdown("""
-    - Select the **fluid** and **flow velocity** below.
-    - See how the boundary layers change in real-time.
-    """)
+# Loaded by the first figure, after the page and its widgets are already shown
+go = lazy("plotly.graph_objects")
 
-    # --- Fluid Selection ---
-    fluid_choice = st.selectbox("Select Fluid", options=["Oil", "Air"])
-
-    # --- Film Temperature for Oil ---
-    if fluid_choice == "Oil":
-        T_film = st.slider("Mean Film Temperature (°C)", min_value=20, max_value=100, value=50, step=1)
-        k = 0.15            # W/m·K
-        rho = 835           # kg/m³
-        cp = 2100           # J/kg·K
-        nu = kinematic_viscosity_oil(T_film)  # dynamic based on temperature
-    else:  # Air
-        k = 0.0267          # W/m·K
-        rho = 1.145         # kg/m³
-        cp = 1005           # J/kg·K
-        nu = 1.62e-5        # m²/s
-
-    # --- User Input ---
-    U = st.slider("Flow Velocity (m/s)", min_value=1.0, max_value=100.0, value=1.0, step=1.0)
 
+# --- Calculation and Figures (only for the latest slider values) ---
+def compute_figures(token, fluid_choice, T_film, U):
     # --- Derived Properties ---
-    alpha = k / (rho * cp)
-    Pr = nu / alpha
+    props = fluid_properties(fluid_choice, T_film)
+    Pr = props["Pr"]
 
     # --- Calculation ---
-    x = np.linspace(0.0001, 0.036, 500)
-    Re_x = U * x / nu
-    delta = 5.0 * np.sqrt(nu * x / U)
-    delta_t = delta / Pr**(1/3)
+    bl = boundary_layer(U, props["nu"], Pr)
+    x, Re_x, delta, delta_t = bl["x"], bl["Re_x"], bl["delta"], bl["delta_t"]
 
     # --- Values for Report ---
     delta_end = delta[-1]
     delta_t_end = delta_t[-1]
     Re_end = Re_x[-1]
 
+    token.check()
+
     # --- Plot 1: Boundary Layer Thicknesses (Interactive) ---
     fig1 = go.Figure()
     fig1.add_trace(go.Scatter(
@@ -256,7 +207,8 @@ with left_col:
         width=850,
         height=500
     )
-    st.plotly_chart(fig1, use_container_width=False)
+
+    token.check()
 
     # --- Plot 2: Reynolds Number ---
     fig2 = go.Figure()
@@ -277,6 +229,50 @@ with left_col:
         width=850,
         height=500
     )
+    return Pr, delta_end, delta_t_end, Re_end, fig1, fig2
+
+
+# --- Page Config ---
+st.set_page_config(page_title="Boundary Layer Calculator", layout="wide")
+
+# --- Data Structure for Report Inputs ---
+@dataclass
+class ReportData:
+    fluid_name: str
+    Pr: float
+    delta_end: float
+    delta_t_end: float
+    Re_end: float
+
+# --- Title and Description ---
+st.title("🧮 Boundary Layer Thickness Calculator")
+
+# --- Full-Page Two-Column Layout ---
+left_col, right_col = st.columns([1, 1], gap="Large")
+
+# === LEFT COLUMN: Inputs + Plots ===
+with left_col:
+    st.markdown("""
+    - Select the **fluid** and **flow velocity** below.
+    - See how the boundary layers change in real-time.
+    """)
+
+    # --- Fluid Selection ---
+    fluid_choice = st.selectbox("Select Fluid", options=["Oil", "Air"])
+
+    # --- Film Temperature for Oil ---
+    T_film = 50
+    if fluid_choice == "Oil":
+        T_film = st.slider("Mean Film Temperature (°C)", min_value=20, max_value=100, value=50, step=1)
+
+    # --- User Input ---
+    U = st.slider("Flow Velocity (m/s)", min_value=1.0, max_value=100.0, value=1.0, step=1.0)
+
+    # Microseconds to compute, so no debounce; a newer rerun still supersedes this one
+    Pr, delta_end, delta_t_end, Re_end, fig1, fig2 = run_latest(
+        "boundary_layer", compute_figures, fluid_choice, T_film, U, debounce=0)
+
+    st.plotly_chart(fig1, use_container_width=False)
     st.plotly_chart(fig2, use_container_width=False)
 
 # === RIGHT COLUMN: Live Report Output ===
@@ -0,0 +1,42 @@
+# boundary_layer.py
+import numpy as np
+
+# Fluid properties: k (W/m·K), rho (kg/m³), cp (J/kg·K); nu (m²/s) for air,
+# oil viscosity depends on the film temperature
+FLUIDS = {
+    "Oil": {"k": 0.15, "rho": 835, "cp": 2100},
+    "Air": {"k": 0.0267, "rho": 1.145, "cp": 1005, "nu": 1.62e-5},
+}
+PLATE_LENGTH = 0.036  # m
+
+
+# --- Viscosity Function for Oil ---
+def kinematic_viscosity_oil(T):
+    """
+    Estimate kinematic viscosity [m²/s] of oil based on temperature using log-log interpolation.
+    """
+    T1, nu1 = 40, 43.0e-6   # in m²/s
+    T2, nu2 = 100, 7.6e-6   # in m²/s
+    log_nu1 = np.log10(nu1)
+    log_nu2 = np.log10(nu2)
+    log_nu_T = log_nu1 + ((T - T1) / (T2 - T1)) * (log_nu2 - log_nu1)
+    return 10**log_nu_T
+
+
+def fluid_properties(fluid_choice, T_film=50):
+    """k, rho, cp, nu, alpha and Pr of the selected fluid."""
+    props = dict(FLUIDS[fluid_choice])
+    if "nu" not in props:
+        props["nu"] = kinematic_viscosity_oil(T_film)  # dynamic based on temperature
+    props["alpha"] = props["k"] / (props["rho"] * props["cp"])
+    props["Pr"] = props["nu"] / props["alpha"]
+    return props
+
+
+def boundary_layer(U, nu, Pr, n=500, length=PLATE_LENGTH):
+    """Laminar flat-plate Re_x, δ(x) and δₜ(x) along the plate."""
+    x = np.linspace(0.0001, length, n)
+    Re_x = U * x / nu
+    delta = 5.0 * np.sqrt(nu * x / U)
+    delta_t = delta / Pr**(1/3)
+    return {"x": x, "Re_x": Re_x, "delta": delta, "delta_t": delta_t}
@@ -0,0 +1,106 @@
+# cancellation.py
+"""
+Only the latest requested computation gets the CPU.
+
+Each expensive stage has a generation number per session, kept in
+`st.session_state`, so the counters go away with the session. `run_latest`
+claims a new generation, waits out a short debounce, and runs the work in a
+worker thread. Meanwhile the script thread refreshes a status line, so
+Streamlit can stop the run at once when the user moves a widget again. The
+stopped run cancels its token on the way out. The work checks `token.cancelled`
+(e.g. in the optimizer callback) and gives up early. Values the user only
+passes through during the debounce never start any work.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+DEBOUNCE_SECONDS = float(os.environ.get("DEBOUNCE_SECONDS", "0.3"))
+POLL_SECONDS = 0.1
+
+
+class Cancelled(Exception):
+    """Raised by `Token.check` once a newer computation has superseded this one."""
+
+
+class Token:
+    # Holds the session's Generations itself: the worker thread has no script context to look it up
+    def __init__(self, generations, key, generation):
+        self._generations = generations
+        self.key = key
+        self.generation = generation
+
+    @property
+    def cancelled(self) -> bool:
+        return self._generations.current(self.key) != self.generation
+
+    def check(self):
+        if self.cancelled:
+            raise Cancelled(self.key)
+
+    def cancel(self):
+        self._generations.retire(self)
+
+
+class Generations:
+    """Latest generation number per stage of one session."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current = {}
+
+    def start(self, key) -> Token:
+        with self._lock:
+            generation = self._current[key] = self._current.get(key, 0) + 1
+        return Token(self, key, generation)
+
+    def current(self, key):
+        with self._lock:
+            return self._current.get(key)
+
+    def retire(self, token):
+        with self._lock:
+            if self._current.get(token.key) == token.generation:
+                self._current[token.key] = token.generation + 1
+
+
+SESSION_KEY = "_cancellation_generations"
+_local_generations = Generations()  # bare mode, outside a Streamlit session
+_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="latest")
+
+
+def _session_generations() -> Generations:
+    if get_script_run_ctx() is None:
+        return _local_generations
+    if SESSION_KEY not in st.session_state:
+        st.session_state[SESSION_KEY] = Generations()
+    return st.session_state[SESSION_KEY]
+
+
+def run_latest(stage, func, *args, debounce=DEBOUNCE_SECONDS, label="Computing…", **kwargs):
+    """Return func(token, *args, **kwargs), computed as the latest request of `stage`."""
+    token = _session_generations().start(stage)
+    status = st.empty()
+    try:
+        # Every status update is a point where Streamlit can stop this run for a newer one
+        deadline = time.monotonic() + debounce
+        while time.monotonic() < deadline:
+            status.caption("⏳ Waiting for input to settle…")
+            time.sleep(min(POLL_SECONDS, max(deadline - time.monotonic(), 0)))
+        token.check()
+        future = _executor.submit(func, token, *args, **kwargs)
+        started = time.monotonic()
+        while not future.done():
+            status.caption(f"⚙️ {label} {time.monotonic() - started:.1f} s")
+            time.sleep(POLL_SECONDS)
+        return future.result()
+    except BaseException:
+        token.cancel()
+        raise
+    finally:
+        status.empty()
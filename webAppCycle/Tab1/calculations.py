@@ -1,6 +1,14 @@
 # calculations.py
 import math
 
+import numpy as np
+import pandas as pd
+
+from functions import get_default_inputs
+from memo import memoize
+from .solar import peak_irradiance
+
+@memoize(maxsize=256)
 def calculate_outputs(inputs):
     outputs = {}
 
@@ -15,9 +23,14 @@ def calculate_outputs(inputs):
     outputs["Q_trans_windows"] = inputs["window_u_value"] * inputs["window_area"] * delta_t
 
     # Solar Gains
-    solar_radiation = 500  # W/m² default (can be added to inputs)
-    sunshine_hours = 4
-    outputs["Q_solar"] = solar_radiation * inputs["window_area"] * inputs["shading_coefficient"] * sunshine_hours
+    if "solar_irradiance" in inputs:
+        # Façade irradiance (W/m²) from solar.py, through SHGC and shading
+        outputs["Q_solar"] = (inputs["solar_irradiance"] * inputs["window_area"] *
+                              inputs["window_shgc"] * inputs["shading_coefficient"])
+    else:
+        solar_radiation = 500  # W/m² default (can be added to inputs)
+        sunshine_hours = 4
+        outputs["Q_solar"] = solar_radiation * inputs["window_area"] * inputs["shading_coefficient"] * sunshine_hours
 
     # Internal Gains
     outputs["Q_int_sensible_total"] = (
@@ -39,3 +52,46 @@ def calculate_outputs(inputs):
     outputs["shr"] = outputs["sensible_cooling_load"] / outputs["total_cooling_load"]
 
     return outputs
+
+
+def input_columns(configs) -> dict:
+    """Column arrays from a DataFrame, structured array or dict of arrays."""
+    if isinstance(configs, pd.DataFrame):
+        return {k: configs[k].to_numpy() for k in configs.columns}
+    if isinstance(configs, np.ndarray) and configs.dtype.names:
+        return {k: configs[k] for k in configs.dtype.names}
+    return {k: np.asarray(v) for k, v in dict(configs).items()}
+
+
+def _solar_column(orientations, period):
+    """Peak façade irradiance per row, evaluated once per distinct orientation."""
+    names, inverse = np.unique(np.asarray(orientations, dtype=str), return_inverse=True)
+    peaks = np.array([peak_irradiance(name, *period) for name in names])
+    return peaks[inverse.ravel()]
+
+
+def calculate_outputs_batch(configs, defaults=None, solar_period=(None, None)) -> pd.DataFrame:
+    """Evaluate `calculate_outputs` for many rooms at once.
+
+    `configs` holds one row per room (DataFrame, structured array or dict of
+    equal-length arrays); any input it does not vary is taken from
+    `defaults` (`get_default_inputs()` if not given). The same formulas run
+    once on whole columns, and the result has one column per output.
+
+    Unless `solar_irradiance` is given, each row uses the peak hourly
+    irradiance on its `window_orientation` over `solar_period` (the whole
+    weather dataset by default).
+    """
+    columns = input_columns(configs)
+    n = len(next(iter(columns.values()))) if columns else 0
+    inputs = dict(defaults or get_default_inputs())
+    for key, values in columns.items():
+        inputs[key] = values.astype(np.float64) if values.dtype.kind in "biuf" else values
+    if "solar_irradiance" not in columns:
+        orientation = np.broadcast_to(np.asarray(inputs["window_orientation"]), (n,))
+        inputs["solar_irradiance"] = _solar_column(orientation, solar_period)
+
+    # Unmemoized: column arrays would only bloat the result cache
+    with np.errstate(divide="ignore", invalid="ignore"):
+        outputs = calculate_outputs.__wrapped__(inputs)
+    return pd.DataFrame({k: np.broadcast_to(np.asarray(v, dtype=np.float64), (n,)) for k, v in outputs.items()})
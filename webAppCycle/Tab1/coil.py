@@ -0,0 +1,138 @@
+# coil.py
+"""
+Cooling-coil and dehumidification model over hourly time series.
+
+Bypass-factor model: a fraction `coil_bypass_factor` of the air passes the
+coil untouched, the rest leaves saturated at the apparatus dew point
+(`coil_adp`). When the entering air is already drier than the ADP the coil
+runs dry and removes sensible heat only. The coil sees mixed air: return air
+from the zone plus the scheduled ventilation air. Infiltration enters the
+zone directly, so it reaches the coil through the return air.
+
+All states are arrays; a season of hours is evaluated in a few array
+operations. The dew-point check applies the ASHRAE 62.1 limit described in
+`results.py`.
+"""
+
+import numpy as np
+import pandas as pd
+
+import psychrometrics as psy
+from comfort import run_lengths
+from . import schedules
+
+DEFAULT_ADP = 10.0            # °C
+DEFAULT_BYPASS = 0.15
+SUPPLY_DELTA_T = 11.0         # K between room and supply air at full sensible capacity
+DEW_POINT_LIMIT = 15.6        # °C, ASHRAE 62.1 (60 °F)
+UNOCCUPIED_RH_LIMIT = 65.0    # %, allowed instead during short unoccupied periods
+UNOCCUPIED_MAX_HOURS = 12
+
+
+def coil_process(t_in, w_in, airflow, adp=DEFAULT_ADP, bypass=DEFAULT_BYPASS,
+                 cp=1.005, hfg=2450.0, pressure=psy.STANDARD_PRESSURE) -> dict:
+    """Leaving state and coil loads for entering air (°C, kg/kg) at `airflow` kg/s.
+
+    `cp` and `hfg` are in kJ/kg(K) as in `get_default_inputs`. Loads are in
+    W, condensate in kg/h.
+    """
+    t_in = np.asarray(t_in, dtype=float)
+    w_in = np.asarray(w_in, dtype=float)
+    w_adp = psy.sat_hum_ratio(adp, pressure)
+
+    t_out = adp + bypass * (t_in - adp)
+    wet = w_in > w_adp
+    w_out = np.where(wet, w_adp + bypass * (w_in - w_adp), w_in)
+    # A dry coil cannot cool below the entering dew point without condensing
+    t_out = np.maximum(t_out, np.where(wet, t_out, psy.dew_point_from_vapor_pressure(
+        t_in, psy.vapor_pressure_from_hum_ratio(w_in, pressure))))
+
+    sensible = airflow * cp * 1000.0 * (t_in - t_out)
+    condensate = airflow * (w_in - w_out)  # kg/s
+    latent = condensate * hfg * 1000.0
+    total = sensible + latent
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shr = np.where(total > 0, sensible / total, 1.0)
+    return {
+        "leaving_temp": t_out,
+        "leaving_hum_ratio": w_out,
+        "leaving_rh": np.minimum(psy.rel_hum_from_hum_ratio(t_out, w_out, pressure), 1.0) * 100.0,
+        "sensible": sensible,
+        "latent": latent,
+        "total": total,
+        "shr": shr,
+        "condensate": condensate * 3600.0,
+        "wet": wet,
+    }
+
+
+def dew_point_violations(indoor_temp, indoor_rh_pct, occupied, timestamps=None) -> np.ndarray:
+    """Hours breaking the ASHRAE 62.1 indoor dew-point limit.
+
+    The limit is waived in unoccupied periods of at most 12 hours, as long
+    as RH stays at or below 65 %.
+    """
+    dew = psy.dew_point(indoor_temp, np.clip(np.asarray(indoor_rh_pct, dtype=float), 1e-3, 100.0) / 100.0)
+    unoccupied = ~np.asarray(occupied, dtype=bool)
+    starts, lengths = run_lengths(unoccupied, timestamps)
+    short = np.zeros(len(unoccupied), dtype=bool)
+    for s, n in zip(starts[lengths <= UNOCCUPIED_MAX_HOURS].tolist(), lengths[lengths <= UNOCCUPIED_MAX_HOURS].tolist()):
+        short[s:s + n] = True
+    exempt = short & (np.asarray(indoor_rh_pct) <= UNOCCUPIED_RH_LIMIT)
+    return (dew > DEW_POINT_LIMIT) & ~exempt
+
+
+def hourly_coil(inputs, hourly: pd.DataFrame) -> pd.DataFrame:
+    """Coil operation for each hour of a `transient.simulate` result."""
+    hour_of_day = hourly["Timestamp"].dt.hour.to_numpy()
+    cp = inputs["specific_heat_air"]
+    hfg = inputs["latent_heat_vaporization"]
+    volume = inputs["floor_area"] * inputs["room_height"]
+
+    supply = inputs["ac_sensible_capacity"] / (cp * SUPPLY_DELTA_T)  # kg/s
+    outdoor_air = inputs["air_density"] * volume * inputs["ventilation_rate"] / 3600.0
+    outdoor_air = outdoor_air * schedules.expand(inputs["ventilation_schedule"], hour_of_day)
+    oa_fraction = np.minimum(outdoor_air / supply, 1.0) if supply > 0 else np.zeros(len(hourly))
+
+    t_room = hourly["Indoor Temperature"].to_numpy()
+    w_room = hourly["Humidity Ratio (g/kg)"].to_numpy() / 1000.0
+    t_mix = oa_fraction * hourly["Outdoor Temperature"].to_numpy() + (1 - oa_fraction) * t_room
+    w_mix = oa_fraction * hourly["Outdoor Humidity Ratio (g/kg)"].to_numpy() / 1000.0 + (1 - oa_fraction) * w_room
+
+    coil = coil_process(t_mix, w_mix, supply, inputs.get("coil_adp", DEFAULT_ADP),
+                        inputs.get("coil_bypass_factor", DEFAULT_BYPASS), cp, hfg)
+
+    # Part load: the coil cycles so that supply air meets the zone's sensible load
+    room_capacity = supply * cp * 1000.0 * (t_room - coil["leaving_temp"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        runtime = np.clip(np.where(room_capacity > 0, hourly["Sensible Load (W)"].to_numpy() / room_capacity, 0.0), 0.0, 1.0)
+
+    occupied = schedules.expand(inputs["occupancy_schedule"], hour_of_day) > 0
+    return pd.DataFrame({
+        "Timestamp": hourly["Timestamp"],
+        "Runtime Fraction": runtime,
+        "Entering Temperature": t_mix,
+        "Leaving Temperature": coil["leaving_temp"],
+        "Leaving RH (%)": coil["leaving_rh"],
+        "Coil Sensible (W)": runtime * coil["sensible"],
+        "Coil Latent (W)": runtime * coil["latent"],
+        "Coil SHR": coil["shr"],
+        "Condensate (kg/h)": runtime * coil["condensate"],
+        "Wet Coil": coil["wet"] & (runtime > 0),
+        "Dew Point Violation": dew_point_violations(t_room, hourly["Indoor RH (%)"].to_numpy(), occupied,
+                                                    hourly["Timestamp"].to_numpy()),
+    })
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    n = 24 * 184  # May to October
+    t_in = rng.uniform(20, 35, n)
+    w_in = psy.hum_ratio_from_rel_hum(t_in, rng.uniform(0.3, 0.8, n))
+    t = time.perf_counter()
+    coil = coil_process(t_in, w_in, 0.3)
+    violations = dew_point_violations(t_in, rng.uniform(30, 80, n), np.arange(n) % 24 >= 9)
+    print(f"{n} hours in {(time.perf_counter() - t) * 1000:.1f} ms, "
+          f"{coil['condensate'].sum():.0f} kg condensate, {violations.sum()} dew-point violations")
@@ -0,0 +1,72 @@
+# energy.py
+"""
+Cooling energy, unmet hours and degree-hours from the hourly simulation.
+
+The transient model already limits the delivered load to the AC capacity and
+runtime schedule; this module integrates its hourly output. Electricity is
+the delivered cooling divided by `ac_efficiency` (COP). Running totals come
+from `np.cumsum`, monthly totals from `np.add.reduceat` over the month
+boundaries. Results are memoized per (configuration, start date).
+"""
+
+import numpy as np
+import pandas as pd
+
+from memo import memoize
+from . import schedules
+from .transient import simulate
+
+UNMET_TOLERANCE = 0.2  # K above setpoint before an AC hour counts as unmet
+
+
+@memoize(maxsize=64)
+def _energy(inputs, start: str, base_temp):
+    hourly = simulate(inputs, start)
+    if hourly.empty:
+        return None
+
+    timestamps = hourly["Timestamp"].to_numpy()
+    hour_of_day = hourly["Timestamp"].dt.hour.to_numpy()
+    ac_hours = schedules.expand(inputs["ac_runtime_schedule"], hour_of_day) > 0
+    base = inputs["indoor_set_temp"] if base_temp is None else base_temp
+
+    # Each row is an hourly mean in W, so W summed over rows is Wh
+    sensible = hourly["Sensible Load (W)"].to_numpy() / 1000.0
+    latent = hourly["Latent Load (W)"].to_numpy() / 1000.0
+    cooling = sensible + latent
+    electric = cooling / inputs["ac_efficiency"]
+    shortfall = (np.maximum(hourly["Sensible Demand (W)"].to_numpy() / 1000.0 - sensible, 0.0) * ac_hours
+                 + np.maximum(hourly["Latent Demand (W)"].to_numpy() / 1000.0 - latent, 0.0) * ac_hours)
+    unmet = ac_hours & (hourly["Indoor Temperature"].to_numpy() > inputs["indoor_set_temp"] + UNMET_TOLERANCE)
+    degree_hours = np.maximum(hourly["Outdoor Temperature"].to_numpy() - base, 0.0)
+
+    series = {
+        "Cooling (kWh)": cooling,
+        "Sensible (kWh)": sensible,
+        "Latent (kWh)": latent,
+        "Electricity (kWh)": electric,
+        "Unmet Load (kWh)": shortfall,
+        "Unmet Hours": unmet.astype(np.float64),
+        "Cooling Degree-Hours": degree_hours,
+    }
+    cumulative = pd.DataFrame({k: np.cumsum(v) for k, v in series.items()},
+                              index=pd.DatetimeIndex(timestamps, name="Timestamp"))
+
+    months = pd.DatetimeIndex(timestamps).to_period("M")
+    bounds = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    monthly = pd.DataFrame({k: np.add.reduceat(v, bounds) for k, v in series.items()},
+                           index=pd.Index(months[bounds].astype(str), name="Month"))
+
+    totals = cumulative.iloc[-1].to_dict()
+    totals["Hours"] = len(hourly)
+    totals["Degree-Hour Base (°C)"] = base
+    return totals, monthly, cumulative
+
+
+def energy_summary(inputs, start, base_temp=None):
+    """(totals dict, monthly DataFrame, cumulative DataFrame) for one configuration.
+
+    Degree-hours use `base_temp`, or the cooling setpoint if not given.
+    Returns None when there is no weather data for the period.
+    """
+    return _energy(inputs, pd.Timestamp(start).date().isoformat(), base_temp)
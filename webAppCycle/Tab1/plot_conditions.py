@@ -12,54 +12,70 @@ Render a psychrometric chart with:
  - four colored dots at 6 AM, 12 PM, 6 PM, 12 AM
  - right-side y-axis
  - separate zoomed‐in figure
+
+Everything except the daily trajectory is identical for every date, so the
+chart background is drawn once, rasterized and cached; each date only draws
+its points, labels and title on a transparent layer that is alpha-composited
+over that image.
 """
 
+import io
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
 import streamlit as st
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon
-import psychrolib
-from psychrochart import PsychroChart
-from vienna_weather_july2024_data import load_weather_data
-import pandas as pd
-
-
-def group_hours_into_ranges(hours):
-    if not hours:
-        return "None"
-    hours = sorted(hours)
-    ranges = []
-    start = prev = hours[0]
-    for h in hours[1:]:
-        if h == prev + 1:
-            prev = h
-        else:
-            ranges.append((start, prev))
-            start = prev = h
-    ranges.append((start, prev))
-    return ", ".join(f"{s}–{e}" if s != e else f"{s}" for s, e in ranges)
+import psychrometrics as psy
+from lazy import lazy
+from weather_dataset import get_dataset
+from prerender import CONDITIONS, get_prerenderer
+from comfort import SUMMER_BOX, format_hour_ranges
 
+# Only needed when a chart is actually drawn; cached PNGs are served without them
+Image = lazy("PIL.Image")
+backend_agg = lazy("matplotlib.backends.backend_agg")
+mpl_figure = lazy("matplotlib.figure")
+patches = lazy("matplotlib.patches")
+psychrochart = lazy("psychrochart")
 
-def render_conditions(selected_date: str):
-    psychrolib.SetUnitSystem(psychrolib.SI)
-    pressure = 101325.0  # Pa
+# Comfort zone drawn on the chart and used for the opening-hours text
+COMFORT_ZONE = SUMMER_BOX
+HIGHLIGHT_HOURS = {6: 'red', 12: 'yellow', 18: 'blue', 0: 'green'}
+TEXT_BOX = dict(facecolor='white', edgecolor='white', boxstyle='round,pad=0.4', alpha=0.7)
+CHART_DPI = 110
+
+
+@dataclass(frozen=True)
+class ChartBackground:
+    rgba: np.ndarray   # cropped raster of the static chart
+    dpi: float
+    position: tuple    # axes rectangle, as fractions of the cropped image
+    xlim: tuple
+    ylim: tuple
+
+
+_background_lock = threading.Lock()
+
+
+def chart_background() -> ChartBackground:
+    """Draw the static psychrometric chart once and keep it as an RGBA layer."""
+    with _background_lock:
+        return _draw_background()
+
+
+@lru_cache(maxsize=1)
+def _draw_background() -> ChartBackground:
+    pressure = psy.STANDARD_PRESSURE  # Pa
 
     # --- Main psychrometric chart ---
-    chart = PsychroChart.create()
+    chart = psychrochart.PsychroChart.create()
     chart.config.chart_params.with_zones = False
     chart.config.chart_params.with_constant_h = True
     ax = chart.plot()
 
     # Comfort zone patch
-    T_min, T_max = 23.0, 25.0
-    RH_min_pct, RH_max_pct = 30, 60
-    rh_min, rh_max = RH_min_pct / 100.0, RH_max_pct / 100.0
-    corners = [
-        (T_min, 1000 * psychrolib.GetHumRatioFromRelHum(T_min, rh_min, pressure)),
-        (T_min, 1000 * psychrolib.GetHumRatioFromRelHum(T_min, rh_max, pressure)),
-        (T_max, 1000 * psychrolib.GetHumRatioFromRelHum(T_max, rh_max, pressure)),
-        (T_max, 1000 * psychrolib.GetHumRatioFromRelHum(T_max, rh_min, pressure)),
-    ]
-    comfort_patch = Polygon(corners, closed=True,
+    comfort_patch = patches.Polygon(COMFORT_ZONE.points, closed=True,
                             facecolor='skyblue', edgecolor='blue',
                             alpha=0.3, linewidth=1.0, zorder=0)
     ax.add_patch(comfort_patch)
@@ -76,9 +92,9 @@ def render_conditions(selected_date: str):
 
     # Captions — white text on black boxes with white edges, auto‑spaced
     captions = [
-        "Green ▲ shows optimal comfort:\n24.5 °C, 50 % RH",
-        "Shaded polygon is comfort zone:\n23–25 °C, 30–60 % RH",
-        "Colored ● at key times:\n6 AM (red), 12 PM (yellow), 6 PM (blue), 12 AM (green)",
+        "Green ▲ shows optimal comfort:\n24.5 °C, 50 % RH",
+        "Shaded polygon is comfort zone:\n23–25 °C, 30–60 % RH",
+        "Colored ● at key times:\n6 AM (red), 12 PM (yellow), 6 PM (blue), 12 AM (green)",
     ]
     base_y = 0.98
     spacing = 0.06
@@ -92,17 +108,12 @@ def render_conditions(selected_date: str):
             verticalalignment='top',
             horizontalalignment='left',
             color='black',
-            bbox=dict(
-                facecolor='white',
-                edgecolor='white',
-                boxstyle='round,pad=0.4',
-                alpha=0.7
-            )
+            bbox=TEXT_BOX
         )
 
     # Dew‑point line at 16.8°C
     dewpt = 16.8
-    w_crit = 1000 * psychrolib.GetHumRatioFromRelHum(dewpt, 1.0, pressure)
+    w_crit = 1000 * float(psy.hum_ratio_from_rel_hum(dewpt, 1.0, pressure))
     ax.hlines(w_crit,
               chart.config.limits.range_temp_c[0],
               chart.config.limits.range_temp_c[1],
@@ -112,51 +123,6 @@ def render_conditions(selected_date: str):
             f'Dew point {dewpt}°C',
             color='blue')
 
-    # Load and plot daily weather curve
-    weather_data = load_weather_data()
-    if selected_date not in weather_data:
-        st.warning(f"No weather data for {selected_date}")
-        return
-    daily = weather_data[selected_date]
-
-    # Track hours in comfort zone
-    zone_hours = [
-        int(r["Hour"])
-        for _, r in daily.iterrows()
-        if (T_min <= r["Temperature"] <= T_max)
-        and (RH_min_pct <= r["Relative Humidity (%)"] <= RH_max_pct)
-    ]
-    zone_str = group_hours_into_ranges(zone_hours)
-    ax.text(0.01, 0.8,
-            f"Hours in comfort zone/suggested hours to open the windows: {zone_str}",
-            transform=ax.transAxes, fontsize=14, fontweight='bold',
-            verticalalignment='top', horizontalalignment='left',
-            color='black',
-            bbox=dict(
-                facecolor='white',
-                edgecolor='white',
-                boxstyle='round,pad=0.4',
-                alpha=0.7))
-
-    points = []
-    highlight_hours = {6: 'red', 12: 'yellow', 18: 'blue', 0: 'green'}
-    for _, row in daily.iterrows():
-        hr = int(row["Hour"])
-        temp = row["Temperature"]
-        rh_pct = row["Relative Humidity (%)"]
-        w = 1000 * psychrolib.GetHumRatioFromRelHum(temp, rh_pct / 100.0, pressure)
-        points.append((temp, w))
-        ax.text(temp + 0.2, w + 0.0002, f"{hr}", fontsize=8, color='black')
-        if hr in highlight_hours:
-            ax.plot(temp, w, 'o',
-                    color=highlight_hours[hr], markersize=8)
-
-    if points:
-        # close the loop
-        pts_closed = points + [points[0]]
-        xs, ys = zip(*pts_closed)
-        ax.plot(xs, ys, color='black', linewidth=1.5)
-
     # Style axes and spines
     ax.tick_params(colors='black')
     ax.xaxis.label.set_color('black')
@@ -168,16 +134,95 @@ def render_conditions(selected_date: str):
     ax.yaxis.tick_right()
     if ax.get_legend():
         ax.get_legend().remove()
+    ax.set_title("")  # the per-date title goes on the overlay
+
+    # Rasterize and crop to the drawn content, leaving headroom for the title
+    fig = ax.get_figure()
+    fig.set_dpi(CHART_DPI)
+    canvas = backend_agg.FigureCanvasAgg(fig)
+    canvas.draw()
+    dpi = fig.dpi
+    height = canvas.get_width_height()[1]
+    tight = fig.get_tightbbox(canvas.get_renderer())
+    x0 = max(int((tight.x0 - 0.1) * dpi), 0)
+    x1 = int(np.ceil((tight.x1 + 0.1) * dpi))
+    y0 = max(int((tight.y0 - 0.1) * dpi), 0)
+    y1 = min(int(np.ceil((tight.y1 + 0.5) * dpi)), height)
+    rgba = np.asarray(canvas.buffer_rgba())[height - y1:height - y0, x0:x1].copy()
+
+    bounds = ax.get_window_extent()
+    crop_w, crop_h = x1 - x0, y1 - y0
+    position = ((bounds.x0 - x0) / crop_w, (bounds.y0 - y0) / crop_h,
+                bounds.width / crop_w, bounds.height / crop_h)
+    return ChartBackground(rgba, dpi, position, ax.get_xlim(), ax.get_ylim())
+
+
+def draw_conditions(selected_date: str, daily) -> "mpl_figure.Figure":
+    """Transparent figure with one day's trajectory, aligned to the background."""
+    bg = chart_background()
+    height, width = bg.rgba.shape[:2]
+    fig = mpl_figure.Figure(figsize=(width / bg.dpi, height / bg.dpi), dpi=bg.dpi)
+    fig.patch.set_alpha(0)
+    ax = fig.add_axes(bg.position)
+    ax.set_xlim(bg.xlim)
+    ax.set_ylim(bg.ylim)
+    ax.set_axis_off()
+
+    hours = daily["Hour"].to_numpy(dtype=int)
+    temps = daily["Temperature"].to_numpy(dtype=float)
+    rh_pct = daily["Relative Humidity (%)"].to_numpy(dtype=float)
+    w_daily = 1000 * psy.hum_ratio_from_rel_hum(temps, rh_pct / 100.0, psy.STANDARD_PRESSURE)
+
+    # Track hours in comfort zone
+    zone_str = format_hour_ranges(hours, COMFORT_ZONE.contains(temps, w_daily))
+    ax.text(0.01, 0.8,
+            f"Hours in comfort zone/suggested hours to open the windows: {zone_str}",
+            transform=ax.transAxes, fontsize=14, fontweight='bold',
+            verticalalignment='top', horizontalalignment='left',
+            color='black',
+            bbox=TEXT_BOX)
+
+    for hr, temp, w in zip(hours.tolist(), temps.tolist(), w_daily.tolist()):
+        ax.text(temp + 0.2, w + 0.0002, f"{hr}", fontsize=8, color='black')
+        if hr in HIGHLIGHT_HOURS:
+            ax.plot(temp, w, 'o',
+                    color=HIGHLIGHT_HOURS[hr], markersize=8)
+
+    if len(temps):
+        # close the loop
+        ax.plot(list(temps) + [temps[0]], list(w_daily) + [w_daily[0]],
+                color='black', linewidth=1.5)
 
     ax.set_title(f"Psychrometric Chart – {selected_date}",
                  color="black", pad=12)
+    return fig
 
-    # Render main figure
-    fig = ax.get_figure()
-    st.pyplot(fig)
+
+def conditions_png(selected_date: str):
+    """PNG bytes of the chart for one date, or None if the date is unknown."""
+    dataset = get_dataset()
+    if selected_date not in dataset:
+        return None
+    daily = dataset.day(selected_date, columns=["Hour", "Temperature", "Relative Humidity (%)"])
+    canvas = backend_agg.FigureCanvasAgg(draw_conditions(selected_date, daily))
+    canvas.draw()
+    overlay = Image.frombuffer("RGBA", canvas.get_width_height(), canvas.buffer_rgba(), "raw", "RGBA", 0, 1)
+    image = Image.alpha_composite(Image.fromarray(chart_background().rgba), overlay)
+
+    buffer = io.BytesIO()
+    image.convert("RGB").save(buffer, format="png", compress_level=1)
+    return buffer.getvalue()
+
+
+def render_conditions(selected_date: str):
+    png = get_prerenderer().get(CONDITIONS, selected_date, conditions_png)
+    if png is None:
+        st.warning(f"No weather data for {selected_date}")
+        return
+    st.image(png, use_container_width=True)
 
 
 if __name__ == "__main__":
     st.title("Vienna July 2024 Weather on Psychrometric Chart")
-    date = st.selectbox("Select date:", list(load_weather_data().keys()))
+    date = st.selectbox("Select date:", get_dataset().dates())
     render_conditions(date)
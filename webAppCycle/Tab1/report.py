@@ -3,22 +3,35 @@ import pandas as pd
 import math
 from functions import get_default_inputs
 from .calculations import calculate_outputs
-from plot_weather_data import plot_weather
-from vienna_weather_july2024_data import load_weather_data
+from .transient import simulate
+from .solar import peak_irradiance, surface_azimuth
+from .energy import energy_summary
+from .coil import DEW_POINT_LIMIT, hourly_coil
+from plot_weather_data import plot_weather, plot_weather_range
+from downsample import downsample_frame
+from weather_dataset import get_dataset
+from comfort import ZONES, monthly_summary, opening_windows
 from .results import show_parameter_descriptions
 
 def display_report():
     st.subheader("Weather Conditions")
-    weather_data = load_weather_data()
-    selected_date = st.selectbox("Select a date in July 2024:", list(weather_data.keys()))
-    daily_weather = weather_data[selected_date]
-    avg_temp = round(daily_weather["Temperature"].mean(), 2)
+    dataset = get_dataset()
+    selected_date = st.selectbox("Select a date in July 2024:", dataset.dates())
+    avg_temp = round(dataset.day_summary(selected_date)["Temperature mean"], 2)
 
     plot_weather(selected_date)
 
     from .plot_conditions import render_conditions
     render_conditions(selected_date)
 
+    with st.expander("📈 Weather Archive"):
+        plot_weather_range()
+
+    with st.expander("🪟 Window Opening Analysis"):
+        zone = ZONES[st.selectbox("Comfort zone:", list(ZONES))]
+        st.markdown("**Hours inside the comfort zone over the whole weather archive.**")
+        st.dataframe(monthly_summary(zone))
+        st.dataframe(opening_windows(zone))
 
     inputs = get_default_inputs()
     inputs["outdoor_temp_design_db"] = avg_temp
@@ -44,6 +57,16 @@ def display_report():
         except ValueError:
             st.warning(f"Invalid input for {k}. Using default value.")
 
+    try:
+        surface_azimuth(inputs["window_orientation"])
+        orientation_ok = True
+    except ValueError as exc:
+        orientation_ok = False
+        st.warning(f"{exc}. Using the default solar gain estimate; the hourly simulation and energy "
+                   "sections need a valid orientation and are skipped.")
+    if orientation_ok:
+        inputs["solar_irradiance"] = round(peak_irradiance(inputs["window_orientation"], selected_date, selected_date), 1)
+
     room_length = math.sqrt(inputs["floor_area"])
     perimeter = 4 * room_length
     total_wall_area = perimeter * inputs["room_height"]
@@ -57,10 +80,13 @@ def display_report():
         "window_shgc", "infiltration_rate_night", "infiltration_rate_day",
         "latent_gain_per_person", "indoor_set_temp", "ventilation_schedule",
         "initial_indoor_rh", "ac_runtime_schedule", "latent_heat_vaporization",
-        "occupancy_schedule", "specific_heat_air", "air_density"
+        "occupancy_schedule", "specific_heat_air", "air_density",
+        "thermal_capacity_per_area", "simulation_days", "time_step"
     ]
 
     computed_constants = {"wall_area": round(wall_area, 2)}
+    if "solar_irradiance" in inputs:
+        computed_constants["solar_irradiance"] = inputs["solar_irradiance"]
     for key in constant_keys:
         computed_constants[key] = inputs[key]
 
@@ -74,5 +100,33 @@ def display_report():
         st.subheader("Calculated Outputs")
         st.dataframe(pd.DataFrame(results.items(), columns=["Output", "Value"]))
 
+        hourly = simulate(inputs, selected_date) if orientation_ok else pd.DataFrame()
+        if not hourly.empty:
+            st.subheader("Hourly Simulation")
+            st.caption(f"{len(hourly) // 24} days from {selected_date}, time step {inputs['time_step']} h")
+            hourly = hourly.set_index("Timestamp")
+            st.line_chart(downsample_frame(hourly[["Outdoor Temperature", "Indoor Temperature"]]))
+            st.line_chart(downsample_frame(hourly[["Indoor RH (%)"]]))
+            st.line_chart(downsample_frame(hourly[["Sensible Load (W)", "Latent Load (W)"]]))
+
+            coil = hourly_coil(inputs, hourly.reset_index())
+            st.subheader("Cooling Coil & Dehumidification")
+            cols = st.columns(3)
+            cols[0].metric("Condensate", f"{coil['Condensate (kg/h)'].sum():.1f} kg")
+            cols[1].metric("Wet-coil hours", f"{int(coil['Wet Coil'].sum())} h")
+            cols[2].metric(f"Hours above {DEW_POINT_LIMIT} °C dew point", f"{int(coil['Dew Point Violation'].sum())} h")
+            st.line_chart(downsample_frame(coil.set_index("Timestamp")[["Coil Sensible (W)", "Coil Latent (W)"]]))
+
+        energy = energy_summary(inputs, selected_date) if orientation_ok else None
+        if energy is not None:
+            totals, monthly, _ = energy
+            st.subheader("Cooling Energy")
+            cols = st.columns(4)
+            cols[0].metric("Cooling delivered", f"{totals['Cooling (kWh)']:.0f} kWh")
+            cols[1].metric("Electricity (COP)", f"{totals['Electricity (kWh)']:.0f} kWh")
+            cols[2].metric("Unmet AC hours", f"{totals['Unmet Hours']:.0f} h")
+            cols[3].metric("Cooling degree-hours", f"{totals['Cooling Degree-Hours']:.0f} K·h")
+            st.dataframe(monthly.round(1))
+
     show_parameter_descriptions()
     return inputs
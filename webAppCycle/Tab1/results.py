@@ -13,6 +13,7 @@ def show_parameter_descriptions():
 
         ### 🔹 Computed Parameters
         - **wall_area**: Total wall area, minus window area, calculated based on floor area and room height.
+        - **solar_irradiance**: Peak hourly solar irradiance on the window façade for the selected date (W/m²).
 
         ### 🔹 Constant Parameters
         - **ventilation_rate**: Air change rate due to mechanical ventilation (1/hr).
@@ -37,6 +38,12 @@ def show_parameter_descriptions():
         - **occupancy_schedule**: Occupancy schedule of the room.
         - **specific_heat_air**: Specific heat of air (kJ/kg·K).
         - **air_density**: Density of air (kg/m³).
+        - **thermal_capacity_per_area**: Effective heat capacity of the room per floor area (kJ/m²·K).
+        - **simulation_days**: Number of days covered by the hourly simulation.
+        - **time_step**: Simulation time step (h), e.g. 1/60 for one minute.
+        - **coil_adp**: Apparatus dew point of the cooling coil (°C).
+        - **coil_bypass_factor**: Fraction of air passing the coil without contact (unitless).
+        - **ac_efficiency**: Coefficient of performance (COP) used to convert delivered cooling into electricity.
         """)
 
     with st.expander("📄 ASHRAE 62.1 Dew Point Limit Explanation"):
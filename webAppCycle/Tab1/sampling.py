@@ -0,0 +1,42 @@
+# sampling.py
+"""
+Room configuration generators for parametric runs of `calculate_outputs_batch`.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _round_integers(df, integer_keys):
+    if integer_keys is None:
+        integer_keys = [k for k in df.columns if k.startswith("num_")]
+    for key in integer_keys:
+        if key in df:
+            df[key] = np.rint(df[key]).astype(np.int64)
+    return df
+
+
+def grid(**values) -> pd.DataFrame:
+    """Full factorial design: one row per combination of the given value lists.
+
+    >>> grid(floor_area=[20, 50, 100], num_people=range(1, 6))  # 15 rows
+    """
+    keys = list(values)
+    axes = [np.asarray(list(v)) for v in values.values()]
+    mesh = np.meshgrid(*axes, indexing="ij")
+    return pd.DataFrame({k: m.ravel() for k, m in zip(keys, mesh)})
+
+
+def latin_hypercube(bounds: dict, n: int, seed=None, integer_keys=None) -> pd.DataFrame:
+    """`n` Latin-hypercube samples of the ranges in `bounds` ({key: (low, high)}).
+
+    Each range is split into `n` equal strata and every stratum is sampled
+    exactly once, in an independent random order per key. Keys in
+    `integer_keys` (default: the `num_*` counts) are rounded to integers.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for key, (low, high) in bounds.items():
+        strata = (rng.permutation(n) + rng.random(n)) / n
+        columns[key] = low + strata * (high - low)
+    return _round_integers(pd.DataFrame(columns), integer_keys)
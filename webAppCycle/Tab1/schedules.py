@@ -0,0 +1,102 @@
+# schedules.py
+"""
+Hourly schedules for occupancy, equipment, ventilation and AC runtime.
+
+A schedule spec is parsed once into a 24-value daily profile (fraction of
+full load per hour, 0-1) and cached per spec. Profiles are plain NumPy
+arrays, so they combine with `*` (both on), `np.maximum` (either on) and
+`1 - p` (inverse), and are expanded over a whole horizon by indexing with
+the hour of day of every step.
+
+Accepted specs:
+ - "9-17"              on from 09:00 to 17:00 (end hour excluded)
+ - "22-6"              wraps past midnight
+ - "8-12, 13-17"       union of ranges
+ - "9-17*0.5"          range at a fraction of full load (clipped to 1)
+ - "0-24"              the whole day
+ - "Day/Night", "Always", "24/7"   on all day
+ - "Day", "Night"      DAY_HOURS and its complement
+ - "Off", "Never", ""  off all day
+ - a sequence of 24 numbers, used as given
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+DAY_HOURS = (7, 19)  # "Day" runs from 07:00 to 19:00
+
+_RANGE = re.compile(r"^(\d{1,2})\s*-\s*(\d{1,2})(?:\s*\*\s*([0-9.]+))?$")
+_ALWAYS = {"day/night", "always", "24/7", "on"}
+_NEVER = {"off", "never", "none", ""}
+
+
+@lru_cache(maxsize=256)
+def _parse_text(text: str) -> np.ndarray:
+    key = text.strip().lower()
+    profile = np.zeros(24)
+    if key in _ALWAYS:
+        profile[:] = 1.0
+    elif key in _NEVER:
+        pass
+    elif key in ("day", "night"):
+        profile[DAY_HOURS[0]:DAY_HOURS[1]] = 1.0
+        if key == "night":
+            profile = 1.0 - profile
+    else:
+        for part in key.split(","):
+            match = _RANGE.match(part.strip())
+            if not match:
+                raise ValueError(f"Unrecognised schedule: {text!r}")
+            start, end = int(match.group(1)), int(match.group(2))
+            if start > 24 or end > 24:
+                raise ValueError(f"Hours must be between 0 and 24: {text!r}")
+            start %= 24  # an end of 24 stays 24, so "0-24" is the whole day
+            # A fraction of full load, clipped like the sequence form
+            level = min(float(match.group(3)), 1.0) if match.group(3) else 1.0
+            hours = np.arange(start, end) if start <= end else np.r_[start:24, 0:end]
+            profile[hours] = np.maximum(profile[hours], level)
+    profile.setflags(write=False)
+    return profile
+
+
+def parse(spec) -> np.ndarray:
+    """Read-only 24-value daily profile for `spec`; string specs are cached."""
+    if isinstance(spec, str):
+        return _parse_text(spec)
+    profile = np.clip(np.asarray(spec, dtype=float), 0.0, 1.0)
+    if profile.shape != (24,):
+        raise ValueError(f"A schedule needs 24 hourly values, got shape {profile.shape}")
+    return profile
+
+
+def mask(spec) -> np.ndarray:
+    """Boolean 24-hour mask: True wherever the schedule is not fully off."""
+    return parse(spec) > 0
+
+
+def hour_of_day(n_steps: int, steps_per_hour: int = 1, start_hour: int = 0) -> np.ndarray:
+    """Hour of day (0-23) of each step of a horizon starting at `start_hour`."""
+    return (start_hour + np.arange(n_steps) // steps_per_hour) % 24
+
+
+def expand(spec, hours: np.ndarray) -> np.ndarray:
+    """Profile values at each entry of an hour-of-day array."""
+    return parse(spec)[hours]
+
+
+def union(*specs) -> np.ndarray:
+    """Daily profile that is on whenever any of `specs` is (elementwise max)."""
+    return np.maximum.reduce([parse(s) for s in specs])
+
+
+def intersect(*specs) -> np.ndarray:
+    """Daily profile that is on only when all of `specs` are (elementwise product)."""
+    return np.multiply.reduce([parse(s) for s in specs])
+
+
+def split_rate(hours: np.ndarray, day_rate, night_rate, day_spec="Day") -> np.ndarray:
+    """Per-step rate switching between `day_rate` and `night_rate`, e.g. infiltration."""
+    day = expand(day_spec, hours)
+    return night_rate + day * (day_rate - night_rate)
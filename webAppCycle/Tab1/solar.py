@@ -0,0 +1,158 @@
+# solar.py
+"""
+Hourly solar gains through vertical glazing.
+
+For every weather timestamp at once: sun position (NOAA/Spencer series),
+clear-sky global horizontal irradiance (Haurwitz), reduction for cloud cover
+from the Meteostat condition code (Kasten-Czeplak), split into beam and
+diffuse (Erbs), and transposition onto a vertical façade (isotropic sky,
+ground reflectance 0.2). Gains through the glass apply SHGC and the shading
+coefficient.
+
+Results for the dataset are cached per (station, orientation, period).
+Azimuths are measured clockwise from north (east = 90°, south = 180°).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from weather_dataset import DEFAULT_STATION, STATIONS, get_dataset
+
+SOLAR_CONSTANT = 1367.0  # W/m²
+GROUND_REFLECTANCE = 0.2
+MIN_COS_ZENITH = 0.065  # below ~86° the beam component is dropped
+
+ORIENTATIONS = {
+    "north": 0.0, "northeast": 45.0, "east": 90.0, "southeast": 135.0,
+    "south": 180.0, "southwest": 225.0, "west": 270.0, "northwest": 315.0,
+    "n": 0.0, "ne": 45.0, "e": 90.0, "se": 135.0,
+    "s": 180.0, "sw": 225.0, "w": 270.0, "nw": 315.0,
+}
+
+# Meteostat condition code -> cloud cover fraction
+CLOUD_COVER = {1: 0.0, 2: 0.25, 3: 0.6, 4: 1.0}
+CLOUD_COVER_WEATHER = 1.0   # fog, rain, snow, storms (codes 5-27)
+CLOUD_COVER_UNKNOWN = 0.5
+
+
+def surface_azimuth(orientation) -> float:
+    """Façade azimuth in degrees from a name ("South", "north east", "SW", ...) or a number."""
+    if isinstance(orientation, (int, float, np.number)):
+        return float(orientation) % 360.0
+    # "Northeast", "north-east", "North East" and "north_east" are all the same key
+    key = "".join(str(orientation).lower().replace("-", " ").replace("_", " ").split())
+    if key not in ORIENTATIONS:
+        raise ValueError(f"Unknown window orientation: '{orientation}'")
+    return ORIENTATIONS[key]
+
+
+def sun_position(times_utc, latitude, longitude):
+    """(cos zenith, azimuth in degrees) for an array of UTC datetime64 values."""
+    t = pd.DatetimeIndex(np.asarray(times_utc, dtype="datetime64[ns]"))
+    hour = (t.hour + t.minute / 60.0 + t.second / 3600.0).to_numpy()
+    doy = t.dayofyear.to_numpy()
+    g = 2 * np.pi / 365.0 * (doy - 1 + (hour - 12) / 24.0)
+
+    eq_time = 229.18 * (0.000075 + 0.001868 * np.cos(g) - 0.032077 * np.sin(g)
+                        - 0.014615 * np.cos(2 * g) - 0.040849 * np.sin(2 * g))
+    decl = (0.006918 - 0.399912 * np.cos(g) + 0.070257 * np.sin(g)
+            - 0.006758 * np.cos(2 * g) + 0.000907 * np.sin(2 * g)
+            - 0.002697 * np.cos(3 * g) + 0.00148 * np.sin(3 * g))
+    solar_minutes = hour * 60.0 + eq_time + 4.0 * longitude
+    hour_angle = np.radians(solar_minutes / 4.0 - 180.0)
+
+    lat = np.radians(latitude)
+    cos_zenith = np.sin(lat) * np.sin(decl) + np.cos(lat) * np.cos(decl) * np.cos(hour_angle)
+    azimuth = np.degrees(np.arctan2(np.sin(hour_angle),
+                                    np.cos(hour_angle) * np.sin(lat) - np.tan(decl) * np.cos(lat))) + 180.0
+    return np.clip(cos_zenith, -1.0, 1.0), azimuth, doy
+
+
+def cloud_cover(condition_code):
+    """Cloud cover fraction (0-1) for Meteostat condition codes."""
+    code = np.asarray(condition_code, dtype=float)
+    cover = np.full(code.shape, CLOUD_COVER_UNKNOWN)
+    cover[code >= 5] = CLOUD_COVER_WEATHER
+    for c, value in CLOUD_COVER.items():
+        cover[code == c] = value
+    return cover
+
+
+def horizontal_irradiance(cos_zenith, doy, condition_code=None):
+    """(global, beam normal, diffuse horizontal) irradiance in W/m²."""
+    cz = np.maximum(cos_zenith, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ghi = np.where(cz > 0, 1098.0 * cz * np.exp(-0.057 / cz), 0.0)
+        if condition_code is not None:
+            ghi = ghi * (1 - 0.75 * cloud_cover(condition_code) ** 3.4)
+
+        extraterrestrial = SOLAR_CONSTANT * (1 + 0.033 * np.cos(2 * np.pi * doy / 365.0)) * cz
+        kt = np.clip(np.where(extraterrestrial > 0, ghi / extraterrestrial, 0.0), 0.0, 1.0)
+    diffuse_fraction = np.select(
+        [kt <= 0.22, kt <= 0.8],
+        [1 - 0.09 * kt, 0.9511 - 0.1604 * kt + 4.388 * kt**2 - 16.638 * kt**3 + 12.336 * kt**4],
+        0.165)
+    dhi = diffuse_fraction * ghi
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dni = np.where(cz > MIN_COS_ZENITH, (ghi - dhi) / cz, 0.0)
+    return ghi, dni, dhi
+
+
+def vertical_irradiance(times_utc, orientation, latitude, longitude, condition_code=None):
+    """Total irradiance (W/m²) on a vertical façade for every timestamp."""
+    cos_zenith, sun_az, doy = sun_position(times_utc, latitude, longitude)
+    ghi, dni, dhi = horizontal_irradiance(cos_zenith, doy, condition_code)
+    sin_zenith = np.sqrt(1 - cos_zenith**2)
+    cos_incidence = sin_zenith * np.cos(np.radians(sun_az - surface_azimuth(orientation)))
+    beam = dni * np.maximum(cos_incidence, 0.0)
+    return beam + 0.5 * dhi + 0.5 * GROUND_REFLECTANCE * ghi
+
+
+def window_gain(irradiance, inputs):
+    """Solar gain (W) through the glazing for a façade irradiance array."""
+    return irradiance * inputs["window_area"] * inputs["window_shgc"] * inputs["shading_coefficient"]
+
+
+def _station_times(timestamps, station):
+    offset = STATIONS[station].get("utc_offset", 0)
+    return np.asarray(timestamps, dtype="datetime64[ns]") - np.timedelta64(int(offset * 3600), "s")
+
+
+@lru_cache(maxsize=128)
+def _facade_irradiance(station, azimuth, start, end):
+    spec = STATIONS[station]
+    data = get_dataset().to_numpy(["Timestamp", "Condition Code"], start, end, station=station)
+    irradiance = vertical_irradiance(_station_times(data["Timestamp"], station), azimuth,
+                                     spec["latitude"], spec["longitude"], data["Condition Code"])
+    for arr in (data["Timestamp"], irradiance):
+        arr.setflags(write=False)
+    return data["Timestamp"], irradiance
+
+
+def facade_irradiance(orientation, start=None, end=None, station=DEFAULT_STATION):
+    """(timestamps, W/m²) on a façade for the dataset rows in [start, end], cached."""
+    def key(value):
+        return None if value is None else pd.Timestamp(value).isoformat()
+    return _facade_irradiance(station, surface_azimuth(orientation), key(start), key(end))
+
+
+def irradiance_for_weather(weather, orientation, station=DEFAULT_STATION):
+    """Façade irradiance for weather arrays that did not come from a cached query."""
+    spec = STATIONS[station]
+    return vertical_irradiance(_station_times(weather["Timestamp"], station), orientation,
+                               spec["latitude"], spec["longitude"], weather.get("Condition Code"))
+
+
+def peak_irradiance(orientation, start=None, end=None, station=DEFAULT_STATION) -> float:
+    """Highest hourly façade irradiance (W/m²) over the period, for design loads."""
+    _, irradiance = facade_irradiance(orientation, start, end, station)
+    return float(irradiance.max()) if len(irradiance) else 0.0
+
+
+if __name__ == "__main__":
+    for name in ("North", "East", "South", "West"):
+        times, irr = facade_irradiance(name)
+        daily = irr.sum() / max(len(times) / 24, 1) / 1000
+        print(f"{name:>5}: peak {irr.max():6.0f} W/m², mean daily {daily:.2f} kWh/m²")
@@ -0,0 +1,186 @@
+# transient.py
+"""
+Time-stepping zone model for Tab 1.
+
+One thermal node (room air plus the effective internal mass) is coupled to
+outdoors through the envelope UA and the outdoor-air flow, and one moisture
+node (the room air) exchanges water vapour with the outdoor air. Drivers are
+held constant within a step, so both balances are solved exactly with the
+step-response (exponential) update and stay stable at any step size.
+
+Every coefficient is computed for all steps at once with NumPy. Only the
+thermostat and humidistat, whose output depends on the previous state, run
+as a scalar loop over plain floats. Runs are memoized (and kept on disk) by
+their inputs.
+
+Units follow `functions.get_default_inputs`: `time_step` is in hours
+(1 = hourly, 1/60 = one minute), capacities in kW, gains in W.
+"""
+
+import numpy as np
+import pandas as pd
+
+import psychrometrics as psy
+from memo import memoize
+from weather_dataset import DEFAULT_STATION, data_version, get_dataset
+from . import schedules, solar
+
+WEATHER_COLUMNS = ["Timestamp", "Temperature", "Relative Humidity (%)", "Pressure"]
+DEFAULT_THERMAL_CAPACITY = 165  # kJ/m²K of floor area, ISO 13790 "medium"
+
+def simulation_period(start, days):
+    t0 = pd.Timestamp(start).normalize()
+    return t0, t0 + pd.Timedelta(days=days) - pd.Timedelta(1, "ns")
+
+
+def load_weather(start, days, station=DEFAULT_STATION) -> dict:
+    """Hourly weather arrays for `days` days from the date `start`."""
+    t0, t1 = simulation_period(start, days)
+    return get_dataset().to_numpy(WEATHER_COLUMNS, t0, t1, station=station)
+
+
+def _step_coefficients(h, cap, dt):
+    """Decay factor a = exp(-h·dt/cap) and gain k = (1-a)/h, with the h → 0 limit."""
+    a = np.exp(-h * dt / cap)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.where(h > 0, (1 - a) / h, dt / cap)
+    return a, k
+
+
+def _thermostat_loop(a, free, k, setpoint, capacity, x0):
+    """March x[i+1] = a·x + free - k·q with q the clipped load holding `setpoint`.
+
+    Returns the state at the end of each step, the delivered load and the
+    demand: the ideal load that would hold the zone at the setpoint, ignoring
+    capacity and schedule.
+    """
+    demand = np.maximum((free - (1 - a) * setpoint) / k, 0.0)
+    n = len(a)
+    a, free, k, capacity = a.tolist(), free.tolist(), k.tolist(), capacity.tolist()
+    state, load = [0.0] * n, [0.0] * n
+    x = float(x0)
+    for i in range(n):
+        x_free = a[i] * x + free[i]
+        need = (x_free - setpoint) / k[i]
+        if need < 0.0:
+            need = 0.0
+        q = need if need < capacity[i] else capacity[i]
+        x = x_free - k[i] * q
+        state[i] = x
+        load[i] = q
+    return np.array(state), np.array(load), demand
+
+
+@memoize(maxsize=32, disk=True, depends=(psy, schedules, solar), data_version=data_version)
+def simulate(inputs, start, weather=None, station=DEFAULT_STATION) -> pd.DataFrame:
+    """Run the zone model from `start` for `simulation_days` and return hourly results.
+
+    `weather` may be given as a dict of hourly arrays (`WEATHER_COLUMNS`,
+    plus "Condition Code" for cloud cover); otherwise it is read from the
+    weather dataset and the cached façade irradiance is used. The run is cut short if
+    the dataset has fewer days than requested.
+    """
+    days = max(int(inputs["simulation_days"]), 1)
+    t0, t1 = simulation_period(start, days)
+    if weather is None:
+        weather = load_weather(t0, days, station)
+        _, irradiance_h = solar.facade_irradiance(inputs["window_orientation"], t0, t1, station)
+    else:
+        irradiance_h = solar.irradiance_for_weather(weather, inputs["window_orientation"], station)
+    if len(weather["Timestamp"]) == 0:
+        return pd.DataFrame()
+
+    steps_per_hour = max(int(round(1 / float(inputs["time_step"]))), 1)
+    dt_h = 1.0 / steps_per_hour
+    dt = dt_h * 3600.0
+
+    # --- Drivers on the simulation grid (step midpoints) ---
+    w_hours = (np.asarray(weather["Timestamp"], dtype="datetime64[ns]") - t0.to_datetime64()) / np.timedelta64(1, "h")
+    n_hours = min(days * 24, int(w_hours[-1]) + 1)
+    t_mid = (np.arange(n_hours * steps_per_hour) + 0.5) * dt_h
+    hour_of_day = schedules.hour_of_day(len(t_mid), steps_per_hour)
+
+    pressure_h = np.asarray(weather["Pressure"], dtype=float) * 100.0  # hPa -> Pa
+    pressure_h = np.where(np.isfinite(pressure_h), pressure_h, psy.STANDARD_PRESSURE)
+    temp_h = np.asarray(weather["Temperature"], dtype=float)
+    w_out_h = psy.hum_ratio_from_rel_hum(temp_h, np.asarray(weather["Relative Humidity (%)"], dtype=float) / 100.0, pressure_h)
+    t_out = np.interp(t_mid, w_hours, temp_h)
+    w_out = np.interp(t_mid, w_hours, w_out_h)
+    pressure = float(np.mean(pressure_h))
+
+    occupied = schedules.expand(inputs["occupancy_schedule"], hour_of_day)
+    equipment_on = schedules.expand(inputs["equipment_schedule"], hour_of_day)
+    ventilated = schedules.expand(inputs["ventilation_schedule"], hour_of_day)
+    ac_on = schedules.expand(inputs["ac_runtime_schedule"], hour_of_day)
+
+    # --- Zone properties ---
+    volume = inputs["floor_area"] * inputs["room_height"]
+    air_mass = inputs["air_density"] * volume  # kg
+    cp = inputs["specific_heat_air"] * 1000.0  # J/kgK
+    hfg = inputs["latent_heat_vaporization"] * 1000.0  # J/kg
+    capacitance = air_mass * cp + inputs.get("thermal_capacity_per_area", DEFAULT_THERMAL_CAPACITY) * 1000.0 * inputs["floor_area"]
+    ua = (inputs["wall_u_value"] * inputs["wall_area"]
+          + inputs["roof_u_value"] * inputs["floor_area"]
+          + inputs["floor_u_value"] * inputs["floor_area"]
+          + inputs["window_u_value"] * inputs["window_area"])
+
+    ach = (ventilated * inputs["ventilation_rate"]
+           + schedules.split_rate(hour_of_day, inputs["infiltration_rate_day"], inputs["infiltration_rate_night"]))
+    m_air = air_mass * ach / 3600.0  # kg/s of outdoor air
+
+    q_sensible = (solar.window_gain(np.interp(t_mid, w_hours, irradiance_h), inputs)
+                  + occupied * inputs["num_people"] * inputs["sensible_gain_per_person"]
+                  + equipment_on * (inputs["num_computers"] * inputs["sensible_gain_per_computer"]
+                                    + inputs["num_lamps"] * inputs["sensible_gain_per_lamp"]))
+    q_latent = occupied * inputs["num_people"] * inputs["latent_gain_per_person"]
+
+    # --- Heat balance: C dT/dt = UA(To - T) + m cp (To - T) + Q - Q_ac ---
+    h = ua + m_air * cp
+    a_t, k_t = _step_coefficients(h, capacitance, dt)
+    free_t = (1 - a_t) * t_out + k_t * q_sensible
+    temp, sensible, sensible_demand = _thermostat_loop(
+        a_t, free_t, k_t, inputs["indoor_set_temp"],
+        ac_on * inputs["ac_sensible_capacity"] * 1000.0, inputs["initial_indoor_temp"])
+
+    # --- Moisture balance: M dW/dt = m (Wo - W) + (Q_lat - Q_lat_ac) / hfg ---
+    a_w, k_w = _step_coefficients(m_air, air_mass, dt)
+    free_w = (1 - a_w) * w_out + k_w * q_latent / hfg
+    w_set = float(psy.hum_ratio_from_rel_hum(inputs["indoor_set_temp"], inputs["indoor_set_rh"] / 100.0, pressure))
+    w0 = float(psy.hum_ratio_from_rel_hum(inputs["initial_indoor_temp"], inputs["initial_indoor_rh"] / 100.0, pressure))
+    hum_ratio, latent, latent_demand = _thermostat_loop(
+        a_w, free_w, k_w / hfg, w_set,
+        ac_on * inputs["ac_latent_capacity"] * 1000.0, w0)
+
+    # --- Hourly means ---
+    def hourly(x):
+        return x.reshape(n_hours, steps_per_hour).mean(axis=1)
+
+    temp_hr, w_hr = hourly(temp), hourly(np.maximum(hum_ratio, psy.MIN_HUM_RATIO))
+    rh_hr = np.minimum(psy.rel_hum_from_hum_ratio(temp_hr, w_hr, pressure), 1.0) * 100.0
+    return pd.DataFrame({
+        "Timestamp": t0 + pd.to_timedelta(np.arange(n_hours), unit="h"),
+        "Outdoor Temperature": hourly(t_out),
+        "Outdoor Humidity Ratio (g/kg)": hourly(w_out) * 1000.0,
+        "Indoor Temperature": temp_hr,
+        "Indoor RH (%)": rh_hr,
+        "Humidity Ratio (g/kg)": w_hr * 1000.0,
+        "Sensible Load (W)": hourly(sensible),
+        "Latent Load (W)": hourly(latent),
+        "Sensible Demand (W)": hourly(sensible_demand),
+        "Latent Demand (W)": hourly(latent_demand),
+    })
+
+
+if __name__ == "__main__":
+    import time
+    from functions import get_default_inputs
+
+    inputs = get_default_inputs()
+    dates = get_dataset().dates()
+    inputs["simulation_days"] = len(dates)
+    for step in (1, 1 / 60):
+        inputs["time_step"] = step
+        t = time.perf_counter()
+        result = simulate(inputs, dates[0])
+        print(f"time_step={step:.4f} h: {len(result)} hours in {time.perf_counter() - t:.3f} s")
+    print(result.describe().round(2).to_string())
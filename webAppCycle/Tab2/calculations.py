@@ -0,0 +1,19 @@
+# calculations.py
+from memo import memoize
+from .cycle import CycleDesign, hourly_cop, solve_cycle
+
+DESIGN_KEYS = ["refrigerant", "rated_capacity", "evap_approach", "cond_approach",
+               "superheat", "subcooling", "isentropic_efficiency"]
+
+
+def design_from_inputs(inputs) -> CycleDesign:
+    return CycleDesign(**{k: inputs[k] for k in DESIGN_KEYS if k in inputs})
+
+
+@memoize(maxsize=64)
+def calculate_outputs(inputs):
+    design = design_from_inputs(inputs)
+    cycle = solve_cycle(inputs["design_outdoor_temp"], inputs["indoor_temp"], design)
+    outputs = {key: float(value) for key, value in cycle.items()}
+    outputs["hourly"] = hourly_cop(t_indoor=inputs["indoor_temp"], design=design)
+    return outputs
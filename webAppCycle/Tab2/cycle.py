@@ -0,0 +1,199 @@
+# cycle.py
+"""
+Steady-state vapor-compression cycle over arrays of operating conditions.
+
+    1 evaporator exit (superheated)  ->  2 compressor discharge
+    3 condenser exit (subcooled)     ->  4 after the expansion valve (h4 = h3)
+
+Refrigerant properties come from the CSV tables in `refrigerants/`
+(generated once with CoolProp, see `generate_tables.py`): saturation
+properties as cubic splines in temperature, and isentropic discharge
+enthalpy as a bicubic spline in (condensing temperature, entropy). Every
+property lookup is a vectorized spline evaluation, so a whole weather
+series is solved in one call.
+
+Evaporating and condensing temperatures follow the air temperatures through
+fixed approach temperature differences. The compressor has a fixed swept
+volume, an isentropic efficiency and a clearance-based volumetric
+efficiency, so capacity and COP both fall as the outdoor temperature rises.
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from lazy import lazy
+
+interpolate = lazy("scipy.interpolate")
+
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "refrigerants")
+SATURATION_COLUMNS = ["P_kPa", "P_dew_kPa", "h_f", "h_g", "s_f", "s_g", "rho_g", "cp_f", "cp_g"]
+
+# Rating point used to size the compressor displacement (AHRI 210/240 "A")
+RATING_OUTDOOR = 35.0
+RATING_INDOOR = 26.7
+
+
+def refrigerants():
+    """Names of the refrigerants with tables on disk."""
+    return sorted(f[:-len("_saturation.csv")] for f in os.listdir(TABLE_DIR) if f.endswith("_saturation.csv"))
+
+
+@dataclass(frozen=True)
+class Refrigerant:
+    name: str
+    t_range: tuple
+    saturation: dict       # column -> CubicSpline in T (°C)
+    discharge: "interpolate.RectBivariateSpline"
+    cond_range: tuple
+    s_range: tuple
+
+    def sat(self, column, t):
+        return self.saturation[column](np.clip(t, *self.t_range))
+
+    def discharge_enthalpy(self, t_cond, s):
+        """Enthalpy (kJ/kg) after isentropic compression to the condensing pressure."""
+        return self.discharge.ev(np.clip(t_cond, *self.cond_range), np.clip(s, *self.s_range))
+
+
+@lru_cache(maxsize=None)
+def load_refrigerant(name="R410A") -> Refrigerant:
+    sat = pd.read_csv(os.path.join(TABLE_DIR, f"{name}_saturation.csv"))
+    dis = pd.read_csv(os.path.join(TABLE_DIR, f"{name}_discharge.csv"))
+    t = sat["T_C"].to_numpy()
+    splines = {c: interpolate.CubicSpline(t, sat[c].to_numpy()) for c in SATURATION_COLUMNS}
+
+    t_cond = np.unique(dis["T_cond_C"].to_numpy())
+    s = np.unique(dis["s"].to_numpy())
+    h = dis.pivot(index="T_cond_C", columns="s", values="h").loc[t_cond, s].to_numpy()
+    return Refrigerant(name, (t[0], t[-1]), splines, interpolate.RectBivariateSpline(t_cond, s, h),
+                       (t_cond[0], t_cond[-1]), (s[0], s[-1]))
+
+
+@dataclass(frozen=True)
+class CycleDesign:
+    refrigerant: str = "R410A"
+    evap_approach: float = 12.0       # K below indoor (return) air
+    cond_approach: float = 12.0       # K above outdoor air
+    superheat: float = 5.0            # K
+    subcooling: float = 3.0           # K
+    isentropic_efficiency: float = 0.70
+    clearance: float = 0.04           # volumetric efficiency = 1 - c((Pc/Pe)^(1/n) - 1)
+    polytropic_index: float = 1.10
+    displacement: float = None        # m³/s; sized from rated_capacity if None
+    rated_capacity: float = 3.5       # kW at the rating point
+
+
+def _states(design: CycleDesign, t_outdoor, t_indoor):
+    ref = load_refrigerant(design.refrigerant)
+    t_evap = np.asarray(t_indoor, dtype=float) - design.evap_approach
+    t_cond = np.asarray(t_outdoor, dtype=float) + design.cond_approach
+    t_evap, t_cond = np.broadcast_arrays(t_evap, t_cond)
+
+    # 1: superheated vapour leaving the evaporator
+    cp_g = ref.sat("cp_g", t_evap)
+    t1 = t_evap + design.superheat
+    h1 = ref.sat("h_g", t_evap) + cp_g * design.superheat
+    s1 = ref.sat("s_g", t_evap) + cp_g * np.log((t1 + 273.15) / (t_evap + 273.15))
+    rho1 = ref.sat("rho_g", t_evap) * (t_evap + 273.15) / (t1 + 273.15)
+
+    # 2: compressor discharge
+    h2s = ref.discharge_enthalpy(t_cond, s1)
+    h2 = h1 + (h2s - h1) / design.isentropic_efficiency
+
+    # 3/4: subcooled liquid, isenthalpic expansion
+    h3 = ref.sat("h_f", t_cond) - ref.sat("cp_f", t_cond) * design.subcooling
+    p_evap = ref.sat("P_dew_kPa", t_evap)
+    p_cond = ref.sat("P_kPa", t_cond)
+    return t_evap, t_cond, p_evap, p_cond, h1, h2, h3, rho1
+
+
+def volumetric_efficiency(design: CycleDesign, pressure_ratio):
+    return np.clip(1 - design.clearance * (pressure_ratio ** (1 / design.polytropic_index) - 1), 0.0, 1.0)
+
+
+@lru_cache(maxsize=32)
+def rated_displacement(design: CycleDesign) -> float:
+    """Swept volume (m³/s) giving `rated_capacity` at the rating point."""
+    _, _, p_evap, p_cond, h1, _, h3, rho1 = _states(design, RATING_OUTDOOR, RATING_INDOOR)
+    per_m3 = rho1 * volumetric_efficiency(design, p_cond / p_evap) * (h1 - h3)  # kJ/m³
+    return float(design.rated_capacity / per_m3)
+
+
+def solve_cycle(t_outdoor, t_indoor, design: CycleDesign = CycleDesign()) -> dict:
+    """Cycle states, capacity (kW), compressor power (kW) and COP for arrays of air temperatures."""
+    t_evap, t_cond, p_evap, p_cond, h1, h2, h3, rho1 = _states(design, t_outdoor, t_indoor)
+    ratio = p_cond / p_evap
+    displacement = design.displacement or rated_displacement(design)
+    mass_flow = rho1 * displacement * volumetric_efficiency(design, ratio)  # kg/s
+
+    refrigeration_effect = h1 - h3
+    work = h2 - h1
+    return {
+        "T_evap": t_evap,
+        "T_cond": t_cond,
+        "P_evap": p_evap,
+        "P_cond": p_cond,
+        "pressure_ratio": ratio,
+        "h1": h1, "h2": h2, "h3": h3, "h4": h3,
+        "mass_flow": mass_flow,
+        "capacity": mass_flow * refrigeration_effect,
+        "power": mass_flow * work,
+        "cop": refrigeration_effect / work,
+    }
+
+
+def hourly_cop(start=None, end=None, t_indoor=24.0, design: CycleDesign = CycleDesign(), station=None) -> pd.DataFrame:
+    """COP and capacity for every hour of the weather dataset in [start, end]."""
+    from weather_dataset import DEFAULT_STATION, get_dataset
+
+    data = get_dataset().to_numpy(["Timestamp", "Temperature"], start, end, station=station or DEFAULT_STATION)
+    cycle = solve_cycle(data["Temperature"], t_indoor, design)
+    return pd.DataFrame({
+        "Timestamp": data["Timestamp"],
+        "Outdoor Temperature": data["Temperature"],
+        "COP": cycle["cop"],
+        "Capacity (kW)": cycle["capacity"],
+        "Power (kW)": cycle["power"],
+        "Condensing Pressure (kPa)": cycle["P_cond"],
+    })
+
+
+def validate_against_coolprop(design: CycleDesign = CycleDesign(), n=200, seed=0) -> float:
+    """Largest relative COP error against direct CoolProp lookups (needs CoolProp)."""
+    from CoolProp.CoolProp import PropsSI
+
+    rng = np.random.default_rng(seed)
+    t_out = rng.uniform(15, 45, n)
+    t_in = rng.uniform(20, 30, n)
+    cop = solve_cycle(t_out, t_in, design)["cop"]
+    fluid = design.refrigerant
+    worst = 0.0
+    for i in range(n):
+        te = t_in[i] - design.evap_approach + 273.15
+        tc = t_out[i] + design.cond_approach + 273.15
+        pe = PropsSI("P", "T", te, "Q", 1, fluid)
+        pc = PropsSI("P", "T", tc, "Q", 0, fluid)
+        h1 = PropsSI("H", "T", te + design.superheat, "P", pe, fluid)
+        s1 = PropsSI("S", "T", te + design.superheat, "P", pe, fluid)
+        h2 = h1 + (PropsSI("H", "P", PropsSI("P", "T", tc, "Q", 1, fluid), "S", s1, fluid) - h1) / design.isentropic_efficiency
+        h3 = PropsSI("H", "T", tc - design.subcooling, "P", pc, fluid)
+        worst = max(worst, abs(cop[i] - (h1 - h3) / (h2 - h1)) / ((h1 - h3) / (h2 - h1)))
+    return worst
+
+
+if __name__ == "__main__":
+    import time
+
+    t_out = np.random.default_rng(1).uniform(15, 45, 1_000_000)
+    t = time.perf_counter()
+    result = solve_cycle(t_out, 24.0)
+    print(f"{len(t_out)} states in {time.perf_counter() - t:.2f} s")
+    for name in refrigerants():
+        try:
+            print(f"{name}: max COP error vs CoolProp {validate_against_coolprop(CycleDesign(refrigerant=name)):.2%}")
+        except ImportError:
+            break
@@ -0,0 +1,32 @@
+import streamlit as st
+import pandas as pd
+from downsample import downsample_frame
+
+STATE_LABELS = {
+    "cop": "COP",
+    "capacity": "Cooling capacity (kW)",
+    "power": "Compressor power (kW)",
+    "T_evap": "Evaporating temperature (°C)",
+    "T_cond": "Condensing temperature (°C)",
+    "P_evap": "Evaporating pressure (kPa)",
+    "P_cond": "Condensing pressure (kPa)",
+    "pressure_ratio": "Pressure ratio",
+    "mass_flow": "Refrigerant mass flow (kg/s)",
+}
+
+def render_plots(results: dict):
+    """Design-point summary, state enthalpies and hourly COP over the weather data."""
+    design = pd.DataFrame({"Value": [results[k] for k in STATE_LABELS]}, index=list(STATE_LABELS.values()))
+    cols = st.columns(2)
+    cols[0].markdown("**Design point**")
+    cols[0].dataframe(design.round(3))
+    cols[1].markdown("**State points, enthalpy (kJ/kg)**")
+    cols[1].bar_chart(pd.DataFrame({"h": [results[f"h{i}"] for i in range(1, 5)]},
+                                   index=["1 evaporator exit", "2 discharge", "3 condenser exit", "4 expansion"]))
+
+    hourly = results["hourly"].set_index("Timestamp")
+    if not hourly.empty:
+        st.markdown(f"**Hourly performance** — mean COP {hourly['COP'].mean():.2f}, "
+                    f"min {hourly['COP'].min():.2f} at {hourly['COP'].idxmin():%Y-%m-%d %H:%M}")
+        st.line_chart(downsample_frame(hourly[["COP"]]))
+        st.line_chart(downsample_frame(hourly[["Capacity (kW)", "Power (kW)"]]))
@@ -0,0 +1,69 @@
+# generate_tables.py
+"""
+Regenerate the refrigerant property tables shipped next to this script.
+
+Needs CoolProp (`pip install coolprop`), which the app itself does not: the
+cycle solver only reads the CSV files written here.
+
+    python generate_tables.py [R410A R32 ...]
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REFRIGERANTS = ["R410A", "R32", "R134a"]
+SAT_RANGE = (-30.0, 65.0, 0.5)     # °C
+COND_RANGE = (10.0, 65.0, 1.0)     # °C, condensing temperatures for the discharge table
+EVAP_RANGE = (-25.0, 25.0)         # °C, evaporating temperatures the discharge table must cover
+
+
+def saturation_table(fluid):
+    from CoolProp.CoolProp import PropsSI
+
+    rows = []
+    for t_c in np.arange(SAT_RANGE[0], SAT_RANGE[1] + 1e-9, SAT_RANGE[2]):
+        t = t_c + 273.15
+        rows.append({
+            "T_C": round(float(t_c), 2),
+            "P_kPa": PropsSI("P", "T", t, "Q", 0, fluid) / 1000,
+            "P_dew_kPa": PropsSI("P", "T", t, "Q", 1, fluid) / 1000,
+            "h_f": PropsSI("H", "T", t, "Q", 0, fluid) / 1000,
+            "h_g": PropsSI("H", "T", t, "Q", 1, fluid) / 1000,
+            "s_f": PropsSI("S", "T", t, "Q", 0, fluid) / 1000,
+            "s_g": PropsSI("S", "T", t, "Q", 1, fluid) / 1000,
+            "rho_g": PropsSI("D", "T", t, "Q", 1, fluid),
+            "cp_f": PropsSI("C", "T", t, "Q", 0, fluid) / 1000,
+            "cp_g": PropsSI("C", "T", t, "Q", 1, fluid) / 1000,
+        })
+    return pd.DataFrame(rows)
+
+
+def discharge_table(fluid):
+    """h (kJ/kg) on a grid of condensing temperature x entropy, for isentropic compression."""
+    from CoolProp.CoolProp import PropsSI
+
+    s_low = PropsSI("S", "T", COND_RANGE[1] + 273.15, "Q", 1, fluid) / 1000 - 0.05
+    s_high = PropsSI("S", "T", EVAP_RANGE[0] + 273.15, "Q", 1, fluid) / 1000 + 0.15
+    entropies = np.round(np.arange(np.floor(s_low * 100) / 100, s_high + 1e-9, 0.01), 3)
+    rows = []
+    for t_c in np.arange(COND_RANGE[0], COND_RANGE[1] + 1e-9, COND_RANGE[2]):
+        p = PropsSI("P", "T", t_c + 273.15, "Q", 1, fluid)
+        for s in entropies:
+            rows.append({"T_cond_C": round(float(t_c), 2), "s": float(s),
+                         "h": PropsSI("H", "P", p, "S", s * 1000, fluid) / 1000})
+    return pd.DataFrame(rows)
+
+
+def main(fluids):
+    for fluid in fluids:
+        saturation_table(fluid).to_csv(os.path.join(HERE, f"{fluid}_saturation.csv"), index=False, float_format="%.6g")
+        discharge_table(fluid).to_csv(os.path.join(HERE, f"{fluid}_discharge.csv"), index=False, float_format="%.6g")
+        print(f"wrote {fluid}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or REFRIGERANTS)
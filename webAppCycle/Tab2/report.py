@@ -0,0 +1,27 @@
+import streamlit as st
+from .cycle import CycleDesign, refrigerants
+
+def display_report():
+    st.subheader("Vapor-Compression Cycle")
+    st.markdown("**Steady-state refrigeration cycle of the AC unit, evaluated at a design point "
+                "and for every hour of the weather data.**")
+
+    defaults = CycleDesign()
+    names = refrigerants()
+    cols = st.columns(3)
+    params = {
+        "refrigerant": cols[0].selectbox("**Refrigerant**", names, index=names.index(defaults.refrigerant)),
+        "indoor_temp": cols[1].number_input("**Indoor air temperature (°C)**", value=24.0, step=0.5),
+        "design_outdoor_temp": cols[2].number_input("**Design outdoor temperature (°C)**", value=35.0, step=0.5),
+    }
+
+    with st.expander("⚙️ Cycle Parameters"):
+        cols = st.columns(3)
+        params["rated_capacity"] = cols[0].number_input("Rated capacity (kW)", value=defaults.rated_capacity, step=0.5)
+        params["evap_approach"] = cols[1].number_input("Evaporator approach (K)", value=defaults.evap_approach, step=1.0)
+        params["cond_approach"] = cols[2].number_input("Condenser approach (K)", value=defaults.cond_approach, step=1.0)
+        params["superheat"] = cols[0].number_input("Superheat (K)", value=defaults.superheat, step=1.0)
+        params["subcooling"] = cols[1].number_input("Subcooling (K)", value=defaults.subcooling, step=1.0)
+        params["isentropic_efficiency"] = cols[2].number_input("Isentropic efficiency", value=defaults.isentropic_efficiency,
+                                                               min_value=0.3, max_value=1.0, step=0.05)
+    return params
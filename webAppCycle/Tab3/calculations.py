@@ -0,0 +1,16 @@
+# calculations.py
+from memo import memoize
+from weather_dataset import data_version
+from Tab1 import energy, transient
+from . import sizing
+from .sizing import rank_units
+
+
+# transient.simulate brings in its own depends (psychrometrics, schedules, solar) and the weather data
+@memoize(maxsize=16, disk=True, depends=(sizing, energy, transient.simulate, sizing.CATALOG_PATH),
+         data_version=data_version)
+def calculate_outputs(inputs):
+    if sum(inputs["weights"]) <= 0:
+        inputs = dict(inputs, weights=None)
+    return rank_units(inputs["inputs"], inputs["start"], max_unmet_hours=inputs["max_unmet_hours"],
+                      weights=inputs["weights"])
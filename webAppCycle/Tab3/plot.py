@@ -0,0 +1,17 @@
+import streamlit as st
+
+COLUMNS = ["model", "brand", "type", "sensible_capacity_kw", "latent_capacity_kw", "cop", "price_eur",
+           "Unmet Hours", "Simulated Unmet Hours", "Energy (kWh)", "Oversizing", "Score"]
+
+def render_plots(results: dict):
+    """Pruning summary, ranked units and the energy / oversizing trade-off."""
+    st.caption(f"Peak demand {results['peak_sensible_kw']:.2f} kW sensible, {results['peak_latent_kw']:.2f} kW latent · "
+               f"{results['catalog_size']} units → {results['after_capacity_pruning']} after capacity pruning → "
+               f"{results['after_unmet_limit']} within the unmet-hour limit → {results['pareto_size']} non-dominated · "
+               f"{results['seconds'] * 1000:.0f} ms")
+    ranking = results["ranking"]
+    if ranking.empty:
+        st.warning("No unit meets the unmet-hour limit. Allow more unmet hours or extend the catalog.")
+        return
+    st.dataframe(ranking[COLUMNS].round(2), hide_index=True)
+    st.scatter_chart(ranking, x="Oversizing", y="Energy (kWh)", color="type", size="price_eur")
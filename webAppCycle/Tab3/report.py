@@ -0,0 +1,32 @@
+import streamlit as st
+from functions import get_default_inputs
+from weather_dataset import get_dataset
+from .sizing import OBJECTIVES, load_catalog
+
+def display_report():
+    st.subheader("AC Unit Sizing")
+    catalog = load_catalog()
+    st.markdown(f"**Rank the {len(catalog)} units of the local catalog against the room's hourly "
+                "cooling demand over the weather data.**")
+    st.caption("ℹ️ The catalog is illustrative: brands, models and prices are made up for "
+               "demonstration and do not describe real products. Replace `Tab3/ac_catalog.csv` "
+               "with real manufacturer data before using the ranking for a purchase.")
+
+    inputs = get_default_inputs()
+    dates = get_dataset().dates()
+    cols = st.columns(3)
+    for i, key in enumerate(["floor_area", "room_height", "window_area", "num_people", "num_computers", "num_lamps"]):
+        inputs[key] = cols[i % 3].number_input(f"**🛠️ {key.replace('_', ' ').capitalize()}**", value=float(inputs[key]))
+    inputs["window_orientation"] = cols[0].selectbox("**🛠️ Window orientation**", ["South", "East", "West", "North"])
+    inputs["wall_area"] = 4 * inputs["floor_area"] ** 0.5 * inputs["room_height"] - inputs["window_area"]
+
+    with st.expander("⚖️ Ranking Options"):
+        cols = st.columns(2)
+        start = cols[0].selectbox("Start date", dates, index=0)
+        inputs["simulation_days"] = cols[1].number_input("Days", min_value=1, max_value=len(dates), value=len(dates))
+        max_unmet = st.number_input("Maximum unmet AC hours", min_value=0, value=12)
+        cols = st.columns(len(OBJECTIVES))
+        weights = [cols[i].number_input(f"Weight: {name}", min_value=0.0, value=w, step=0.25)
+                   for i, (name, w) in enumerate(zip(OBJECTIVES, [1.0, 1.0, 0.5, 0.5]))]
+
+    return {"inputs": inputs, "start": start, "max_unmet_hours": max_unmet, "weights": weights}
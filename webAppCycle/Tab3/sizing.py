@@ -0,0 +1,158 @@
+# sizing.py
+"""
+AC unit selection against a local catalog.
+
+The room's hourly cooling demand is computed once per configuration and
+shared by every candidate. It is the load an unlimited unit delivers in
+Tab 1's transient model, including the morning pull-down after the AC has
+been off. Units that clearly cannot cover the load are pruned first with a
+binary search on the sorted demand. The survivors are evaluated together
+as a (units x hours) broadcast.
+Dominated units (no better on any of unmet hours, energy, oversizing and
+price) are pruned next. The best few are then checked with a full
+capacity-limited simulation.
+"""
+
+import os
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from memo import memoize
+from Tab1 import schedules
+from Tab1.energy import UNMET_TOLERANCE
+from Tab1.transient import simulate
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ac_catalog.csv")
+OBJECTIVES = ["Unmet Hours", "Energy (kWh)", "Oversizing", "price_eur"]
+UNLIMITED_CAPACITY = 1e6  # kW, stands in for an ideal unit when computing demand
+
+
+@lru_cache(maxsize=4)
+def _read_catalog(path, mtime):
+    return pd.read_csv(path)
+
+
+def load_catalog(path=CATALOG_PATH) -> pd.DataFrame:
+    """The unit catalog; re-read only when the file changes."""
+    return _read_catalog(path, os.path.getmtime(path)).copy()
+
+
+@memoize(maxsize=32)
+def _demand_profile(inputs, start: str):
+    inputs = dict(inputs, ac_sensible_capacity=UNLIMITED_CAPACITY,
+                  ac_latent_capacity=UNLIMITED_CAPACITY)
+    hourly = simulate(inputs, start)
+    return hourly["Sensible Load (W)"].to_numpy() / 1000.0, hourly["Latent Load (W)"].to_numpy() / 1000.0
+
+
+def demand_profile(inputs, start):
+    """Hourly (sensible, latent) demand in kW during AC hours, cached per configuration."""
+    return _demand_profile(inputs, pd.Timestamp(start).date().isoformat())
+
+
+def evaluate_units(catalog: pd.DataFrame, sensible, latent) -> pd.DataFrame:
+    """Unmet hours, energy and oversizing of every unit against one demand profile."""
+    cap_s = catalog["sensible_capacity_kw"].to_numpy()[:, None]
+    cap_l = catalog["latent_capacity_kw"].to_numpy()[:, None]
+    delivered = np.minimum(sensible, cap_s) + np.minimum(latent, cap_l)
+    unmet = ((sensible > cap_s) | (latent > cap_l)).sum(axis=1)
+    shortfall = (sensible + latent).sum() - delivered.sum(axis=1)
+
+    peak = max(float(sensible.max()), 1e-9)
+    result = catalog.copy()
+    result["Unmet Hours"] = unmet
+    result["Unmet Load (kWh)"] = shortfall
+    result["Energy (kWh)"] = delivered.sum(axis=1) / catalog["cop"].to_numpy()
+    result["Oversizing"] = catalog["sensible_capacity_kw"].to_numpy() / peak - 1.0
+    return result
+
+
+def pareto_mask(values: np.ndarray) -> np.ndarray:
+    """True for rows not dominated by any other row (all objectives minimized)."""
+    no_worse = (values[:, None, :] <= values[None, :, :]).all(axis=2)
+    better = (values[:, None, :] < values[None, :, :]).any(axis=2)
+    return ~(no_worse & better).any(axis=0)
+
+
+def min_max_scale(values) -> np.ndarray:
+    """Each column scaled so its best (lowest) value is 0 and its worst is 1; constant columns are 0."""
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return values
+    span = np.ptp(values, axis=0)
+    return (values - values.min(axis=0)) / np.where(span > 0, span, 1.0)
+
+
+def rank_units(inputs, start, catalog=None, max_unmet_hours=None, weights=None, verify=5) -> dict:
+    """Rank catalog units for one room configuration.
+
+    `max_unmet_hours` drops units that miss the load more often than that
+    (default 5 % of AC hours). `weights` sets the score over OBJECTIVES
+    (normalized to 0-1). The top `verify` units are re-simulated with
+    their actual capacity.
+    """
+    t = time.perf_counter()
+    catalog = load_catalog() if catalog is None else catalog
+    sensible, latent = demand_profile(inputs, start)
+    ac_hours = int((sensible > 0).sum())
+    if max_unmet_hours is None:
+        max_unmet_hours = 0.05 * ac_hours
+
+    # Early pruning: hours above a unit's sensible capacity, by binary search
+    ordered = np.sort(sensible)
+    sensible_unmet = len(ordered) - np.searchsorted(ordered, catalog["sensible_capacity_kw"].to_numpy(), side="right")
+    candidates = catalog[sensible_unmet <= max_unmet_hours].reset_index(drop=True)
+
+    metrics = evaluate_units(candidates, sensible, latent)
+    metrics = metrics[metrics["Unmet Hours"] <= max_unmet_hours].reset_index(drop=True)
+    objectives = metrics[OBJECTIVES].to_numpy(dtype=float)
+    front = pareto_mask(objectives) if len(metrics) else np.zeros(0, dtype=bool)
+    ranked = metrics[front].copy()
+
+    weights = np.asarray(weights if weights is not None else [1.0, 1.0, 0.5, 0.5], dtype=float)
+    values = ranked[OBJECTIVES].to_numpy(dtype=float)
+    ranked["Score"] = min_max_scale(values) @ weights / weights.sum()
+    ranked = ranked.sort_values("Score").reset_index(drop=True)
+
+    # Final check of the leaders with the capacity-limited transient model
+    verified = []
+    for _, unit in ranked.head(verify).iterrows():
+        trial = dict(inputs, ac_sensible_capacity=unit["sensible_capacity_kw"],
+                     ac_latent_capacity=unit["latent_capacity_kw"], ac_efficiency=unit["cop"])
+        hourly = simulate(trial, start)
+        ac_on = schedules.expand(trial["ac_runtime_schedule"], hourly["Timestamp"].dt.hour.to_numpy()) > 0
+        verified.append(int((ac_on & (hourly["Indoor Temperature"] > trial["indoor_set_temp"] + UNMET_TOLERANCE)).sum()))
+    ranked["Simulated Unmet Hours"] = pd.Series(verified, dtype="float64").reindex(ranked.index)
+
+    return {
+        "ranking": ranked,
+        "catalog_size": len(catalog),
+        "after_capacity_pruning": len(candidates),
+        "after_unmet_limit": len(metrics),
+        "pareto_size": len(ranked),
+        "ac_hours": ac_hours,
+        "peak_sensible_kw": float(sensible.max()) if len(sensible) else 0.0,
+        "peak_latent_kw": float(latent.max()) if len(latent) else 0.0,
+        "seconds": time.perf_counter() - t,
+    }
+
+
+if __name__ == "__main__":
+    from functions import get_default_inputs
+    from weather_dataset import get_dataset
+
+    inputs = get_default_inputs()
+    dates = get_dataset().dates()
+    inputs["simulation_days"] = len(dates)
+    result = rank_units(inputs, dates[0])
+    print({k: v for k, v in result.items() if k != "ranking"})
+    # Self-check: on every metric that varies, the best unit scores 0 and the worst 1
+    scaled = min_max_scale(result["ranking"][OBJECTIVES].to_numpy(dtype=float))
+    varies = np.ptp(scaled, axis=0) > 0
+    assert np.allclose(scaled.min(axis=0), 0.0) and np.allclose(scaled.max(axis=0)[varies], 1.0), scaled
+    print("min-max scaling: best 0, worst 1 on", [o for o, v in zip(OBJECTIVES, varies) if v])
+    print(result["ranking"].head(10)[["model", "sensible_capacity_kw", "cop", "price_eur"] + OBJECTIVES[:3]
+                                     + ["Score", "Simulated Unmet Hours"]].round(2).to_string())
@@ -1,29 +1,40 @@
 # app.py
 import streamlit as st
-import importlib
-import json
-import os
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from weather_dataset import get_dataset
+from persistence import get_store
+from memo import cache_stats
+from disk_cache import get_cache
+from lazy import load_times
+from prerender import get_prerenderer, start_warmup
+from module_loader import DEV_MODE, load_tab, tab_timings
 
 # Page layout
 st.set_page_config(layout="wide", page_title="HVAC Simulation App")
 col1, col2 = st.columns([1, 4])  # 20% / 80% ratio
 
+# Open the memory-mapped weather cache once per server (rebuilt if stale)
+# and start pre-rendering every date's charts in the background
+start_warmup(get_dataset().dates())
+
 # Left column: tab selector
 with col1:
     st.title("Tabs")
     tabs = [f"Tab {i}" for i in range(1, 6)]
     selected_tab = st.radio("Select a tab:", tabs, index=0)
 
+    warmup = get_prerenderer().status()
+    if warmup["total"]:
+        st.caption(f"Chart cache: {warmup['done']}/{warmup['total']} dates · "
+                   f"{warmup['bytes'] / 1e6:.1f} MB")
+
+    dev_mode = st.checkbox("Dev mode (reload edited tab modules)", value=DEV_MODE)
+
 # Right column: dynamic content based on tab selection
 with col2:
     tab_index = selected_tab.split()[1]
     try:
-        report_mod = importlib.import_module(f"Tab{tab_index}.report")
-        importlib.reload(report_mod)
-        calc_mod = importlib.import_module(f"Tab{tab_index}.calculations")
-        importlib.reload(calc_mod)
-        plot_mod = importlib.import_module(f"Tab{tab_index}.plot")
-        importlib.reload(plot_mod)
+        report_mod, calc_mod, plot_mod = load_tab(tab_index, dev_mode=dev_mode)
     except ModuleNotFoundError:
         st.error(f"Modules for {selected_tab} not found.")
     else:
@@ -31,10 +42,10 @@ with col2:
         params = report_mod.display_report()
         st.session_state['last_params'] = params
 
-        # Save user input for future reuse
-        os.makedirs("user_data", exist_ok=True)
-        with open(f"user_data/params_tab{tab_index}.json", "w") as f:
-            json.dump(params, f, indent=2)
+        # Save user input for future reuse (only when changed, off this thread)
+        ctx = get_script_run_ctx()
+        session_id = ctx.session_id if ctx else "local"
+        get_store().save(session_id, tab_index, params)
 
         results = calc_mod.calculate_outputs(params)
 
@@ -48,3 +59,37 @@ with col2:
         else:
             st.info("No plotting function found for this tab.")
 
+        with st.expander("🕘 Run History"):
+            runs = get_store().history(session_id, tab_index, limit=20)
+            if len(runs) < 2:
+                st.caption("Change an input to build up a history to compare against.")
+            else:
+                labels = [f"{r.created:%H:%M:%S} · {r.hash[:8]}" for r in runs.itertuples()]
+                a = st.selectbox("Run A", range(len(runs)), index=1, format_func=labels.__getitem__)
+                b = st.selectbox("Run B", range(len(runs)), index=0, format_func=labels.__getitem__)
+                st.dataframe(get_store().compare(runs["hash"][a], runs["hash"][b]), hide_index=True)
+
+
+# Module load timings for the selected tab
+with col1:
+    timing = tab_timings().get(f"Tab{tab_index}")
+    if timing:
+        text = f"Tab {tab_index} import: {timing['import'] * 1000:.0f} ms"
+        if dev_mode:
+            text += f" · change check {timing['checked'] * 1000:.1f} ms · {timing['reloads']} reloads"
+            if timing["reloads"]:
+                text += f" (last {timing['reload'] * 1000:.0f} ms)"
+        st.caption(text)
+    if dev_mode:
+        stats = cache_stats().values()
+        st.caption(f"Result cache: {sum(s['hits'] + s['disk_hits'] for s in stats)} hits · "
+                   f"{sum(s['misses'] for s in stats)} misses")
+        disk = get_cache().stats()
+        counters = disk["namespaces"].values()
+        st.caption(f"Disk cache: {disk['entries']} entries · {disk['bytes'] / 2**20:.1f} of "
+                   f"{disk['max_bytes'] / 2**20:.0f} MB · {sum(c['hits'] for c in counters)} hits · "
+                   f"{sum(c['misses'] for c in counters)} misses (all processes)")
+        loaded = load_times()
+        if loaded:
+            st.caption("Deferred imports: " + " · ".join(f"{name} {seconds * 1000:.0f} ms"
+                                                          for name, seconds in loaded.items()))
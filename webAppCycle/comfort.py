@@ -0,0 +1,168 @@
+# comfort.py
+"""
+Comfort-zone classification of the weather archive.
+
+A comfort zone is a polygon on the psychrometric plane: dry-bulb temperature
+(°C) against humidity ratio (g/kg). Every hour of the dataset is tested
+against a zone in one vectorized point-in-polygon pass, and runs of
+consecutive in-zone hours are turned into window-opening periods with
+run-length encoding. Whole-archive classifications and monthly summaries
+are cached per (zone, station).
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import psychrometrics as psy
+from weather_dataset import DEFAULT_STATION, get_dataset
+
+HOUR = np.timedelta64(1, "h")
+
+
+@dataclass(frozen=True)
+class ComfortZone:
+    name: str
+    points: tuple  # ((temperature °C, humidity ratio g/kg), ...), polygon vertices in order
+
+    @classmethod
+    def from_box(cls, name, t_min, t_max, rh_min_pct, rh_max_pct, pressure=psy.STANDARD_PRESSURE, samples=8):
+        """Zone bounded by two temperatures and two relative-humidity curves."""
+        t_up = np.linspace(t_min, t_max, samples)
+        t_down = t_up[::-1]
+        w_low = 1000 * psy.hum_ratio_from_rel_hum(t_up, rh_min_pct / 100.0, pressure)
+        w_high = 1000 * psy.hum_ratio_from_rel_hum(t_down, rh_max_pct / 100.0, pressure)
+        points = list(zip(t_up.tolist(), w_low.tolist())) + list(zip(t_down.tolist(), w_high.tolist()))
+        return cls(name, tuple((round(t, 4), round(w, 4)) for t, w in points))
+
+    def contains(self, temperature, hum_ratio_gkg) -> np.ndarray:
+        return points_in_polygon(temperature, hum_ratio_gkg, self.points)
+
+
+SUMMER_BOX = ComfortZone.from_box("Summer 23–25 °C, 30–60 % RH", 23.0, 25.0, 30, 60)
+# Approximate ASHRAE 55 summer zone (0.5 clo) with the 12 g/kg humidity limit
+ASHRAE55_SUMMER = ComfortZone("ASHRAE 55 summer (0.5 clo)", ((25.0, 0.0), (28.0, 0.0), (26.5, 12.0), (23.5, 12.0)))
+ZONES = {zone.name: zone for zone in (SUMMER_BOX, ASHRAE55_SUMMER)}
+
+
+def points_in_polygon(x, y, polygon) -> np.ndarray:
+    """Even-odd rule test of every (x, y) against a polygon, one pass per edge."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    vertices = np.asarray(polygon, dtype=float)
+    inside = np.zeros(np.broadcast(x, y).shape, dtype=bool)
+    x0, y0 = vertices[-1]
+    for x1, y1 in vertices:
+        if y0 != y1:
+            crosses = (y1 > y) != (y0 > y)
+            x_cross = x1 + (y - y1) * (x0 - x1) / (y0 - y1)
+            inside ^= crosses & (x < x_cross)
+        x0, y0 = x1, y1
+    return inside
+
+
+def run_lengths(mask, timestamps=None):
+    """(start index, length) of each run of True values.
+
+    With `timestamps`, a missing hour also ends a run, so a window never
+    spans a gap in the data.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    if not len(mask):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    edges = np.diff(np.r_[0, mask.view(np.int8), 0])
+    breaks = np.zeros(len(mask) + 1, dtype=bool)
+    if timestamps is not None:
+        gaps = np.diff(np.asarray(timestamps, dtype="datetime64[ns]")) != HOUR
+        breaks[1:-1] = gaps & mask[1:] & mask[:-1]
+    starts = np.flatnonzero((edges == 1) | breaks)
+    stops = np.flatnonzero((edges == -1) | breaks)
+    return starts, stops - starts
+
+
+def format_hour_ranges(hours, mask) -> str:
+    """"9–12, 15" style list of the hours where `mask` is set."""
+    hours = np.asarray(hours)
+    starts, lengths = run_lengths(mask)
+    if not len(starts):
+        return "None"
+    return ", ".join(f"{hours[s]}–{hours[s + n - 1]}" if n > 1 else f"{hours[s]}"
+                     for s, n in zip(starts.tolist(), lengths.tolist()))
+
+
+@lru_cache(maxsize=32)
+def _classify_archive(zone: ComfortZone, station: str):
+    data = get_dataset().to_numpy(["Timestamp", "Temperature", "Humidity Ratio (g/kg)"], station=station)
+    mask = zone.contains(data["Temperature"], data["Humidity Ratio (g/kg)"])
+    for arr in (data["Timestamp"], mask):
+        arr.setflags(write=False)
+    return data["Timestamp"], mask
+
+
+def classify(zones=None, start=None, end=None, station=DEFAULT_STATION) -> pd.DataFrame:
+    """One boolean column per zone for every hour of the dataset in [start, end]."""
+    zones = list(ZONES.values()) if zones is None else list(zones)
+    columns = {}
+    timestamps = None
+    for zone in zones:
+        timestamps, mask = _classify_archive(zone, station)
+        columns[zone.name] = mask
+    if timestamps is None:
+        return pd.DataFrame()
+    df = pd.DataFrame(columns, index=pd.DatetimeIndex(timestamps, name="Timestamp"))
+    if start is not None or end is not None:
+        end = pd.Timestamp(end) + pd.Timedelta(days=1) - pd.Timedelta(1, "ns") if end is not None else None
+        df = df.loc[start:end]
+    return df
+
+
+def opening_windows(zone=SUMMER_BOX, start=None, end=None, station=DEFAULT_STATION, min_hours=1) -> pd.DataFrame:
+    """Periods of consecutive in-zone hours, i.e. when the windows can be opened."""
+    hours = classify([zone], start, end, station)
+    if hours.empty:
+        return pd.DataFrame(columns=["Start", "End", "Hours"])
+    timestamps = hours.index.to_numpy()
+    starts, lengths = run_lengths(hours[zone.name].to_numpy(), timestamps)
+    keep = lengths >= min_hours
+    starts, lengths = starts[keep], lengths[keep]
+    return pd.DataFrame({
+        "Start": timestamps[starts],
+        "End": timestamps[starts + lengths - 1] + HOUR,
+        "Hours": lengths,
+    })
+
+
+@lru_cache(maxsize=32)
+def _monthly_summary(zone: ComfortZone, station: str) -> pd.DataFrame:
+    hours = classify([zone], station=station)[zone.name]
+    windows = opening_windows(zone, station=station)
+    month = hours.index.to_period("M")
+    by_month = hours.groupby(month)
+    summary = pd.DataFrame({"Hours": by_month.size(), "Comfort Hours": by_month.sum()})
+    summary["Comfort Share (%)"] = 100.0 * summary["Comfort Hours"] / summary["Hours"]
+    window_months = windows.groupby(pd.DatetimeIndex(windows["Start"]).to_period("M"))["Hours"]
+    summary["Windows"] = window_months.size().reindex(summary.index, fill_value=0)
+    summary["Longest Window (h)"] = window_months.max().reindex(summary.index, fill_value=0)
+    summary["Mean Window (h)"] = window_months.mean().reindex(summary.index).fillna(0.0)
+    summary.index = summary.index.astype(str)
+    summary.index.name = "Month"
+    return summary
+
+
+def monthly_summary(zone=SUMMER_BOX, station=DEFAULT_STATION) -> pd.DataFrame:
+    """Comfort hours and window-opening statistics per month, cached."""
+    return _monthly_summary(zone, station).copy()
+
+
+if __name__ == "__main__":
+    import time
+
+    for zone in ZONES.values():
+        t = time.perf_counter()
+        summary = monthly_summary(zone)
+        windows = opening_windows(zone)
+        print(f"{zone.name}: {time.perf_counter() - t:.3f} s")
+        print(summary.round(1).to_string())
+        print(windows.head().to_string(), "\n")
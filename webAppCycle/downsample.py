@@ -0,0 +1,131 @@
+# downsample.py
+"""
+Bounded chart payloads for long time series.
+
+Two ways to thin a series before it goes to the browser; `downsample_frame`
+picks one per chart:
+ - `lttb_indices`: Largest-Triangle-Three-Buckets. Keeps the points that
+   carry the visual shape of one series. Used for single-series charts.
+ - `minmax_indices`: the first, min and max row of every bucket. Keeps
+   every peak, and works across several columns at once.
+
+For the weather archive, aggregate tiles (min/mean/max per bucket) are built
+once per resolution level at ingest (see `weather_dataset.derive_tables`).
+`pick_level` chooses the finest level whose buckets in the visible range fit
+the point budget. The payload therefore stays bounded whether the archive
+holds a month or a decade.
+"""
+
+import numpy as np
+import pandas as pd
+
+MAX_POINTS = 1500
+TILE_HOURS = (1, 4, 16, 64, 256, 1024, 4096)  # bucket width of each resolution level
+_EPOCH = np.datetime64("1970-01-01T00:00:00", "ns")
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return (x - _EPOCH) / np.timedelta64(1, "s")
+    return x.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out) -> np.ndarray:
+    """Row indices of the LTTB sample of (x, y), first and last rows included."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), np.nan_to_num(_as_float(y), nan=np.nanmean(y) if n else 0.0)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out - 2 inner buckets
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third vertex
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nxt_lo:nxt_hi].mean(), y[nxt_lo:nxt_hi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(values, n_buckets) -> np.ndarray:
+    """Sorted row indices of the first, min and max of every bucket, over all columns."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    n = len(values)
+    if n <= 3 * n_buckets:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    width = int(np.diff(edges).max())
+    # Pad every bucket to the same width so argmin/argmax run as one 2-D reduction
+    rows = np.minimum(edges[:-1, None] + np.arange(width), edges[1:, None] - 1)
+    keep = [edges[:-1]]
+    for column in values.T:
+        block = column[rows]
+        filled = np.isnan(block).all(axis=1)
+        low = np.where(np.isnan(block), np.inf, block).argmin(axis=1)
+        high = np.where(np.isnan(block), -np.inf, block).argmax(axis=1)
+        keep += [rows[~filled, low[~filled]], rows[~filled, high[~filled]]]
+    keep.append([n - 1])
+    return np.unique(np.concatenate(keep))
+
+
+def downsample_frame(df: pd.DataFrame, max_points=MAX_POINTS) -> pd.DataFrame:
+    """`df` cut to about `max_points` rows: LTTB for one column, else every column's peaks kept."""
+    if len(df) <= max_points:
+        return df
+    numeric = df.select_dtypes("number")
+    if numeric.shape[1] == 1:
+        x = df.index.asi8 if isinstance(df.index, pd.DatetimeIndex) else np.arange(len(df))  # asi8 also fits tz-aware
+        return df.iloc[lttb_indices(x, numeric.iloc[:, 0].to_numpy(), max_points)]
+    idx = minmax_indices(df.select_dtypes("number").to_numpy(), max(max_points // (1 + 2 * df.shape[1]), 1))
+    return df.iloc[idx]
+
+
+# --- Resolution tiles ---
+def build_tiles(timestamps, columns: dict, widths=TILE_HOURS) -> dict:
+    """{width: {"Period", "Count", "<col> min/mean/max"}} over sorted timestamps.
+
+    Buckets are aligned to the epoch, so tiles do not shift when the archive
+    grows. NaNs are skipped; an all-NaN bucket gives NaN.
+    """
+    ts = np.asarray(timestamps, dtype="datetime64[ns]")
+    hours = (ts - _EPOCH) // np.timedelta64(1, "h")
+    tiles = {}
+    for width in widths:
+        bucket = hours // width
+        if len(bucket) == 0:
+            tiles[width] = {"Period": ts[:0], "Count": np.empty(0, dtype=np.int64)}
+            continue
+        bounds = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        table = {
+            "Period": _EPOCH + (bucket[bounds] * width).astype("timedelta64[h]"),
+            "Count": np.diff(np.r_[bounds, len(ts)]),
+        }
+        for name, values in columns.items():
+            values = np.asarray(values, dtype=np.float64)
+            finite = np.isfinite(values)
+            count = np.add.reduceat(finite.astype(np.int64), bounds)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                table[f"{name} min"] = np.fmin.reduceat(values, bounds)
+                table[f"{name} mean"] = np.add.reduceat(np.where(finite, values, 0.0), bounds) / count
+                table[f"{name} max"] = np.fmax.reduceat(values, bounds)
+        tiles[width] = table
+    return tiles
+
+
+def pick_level(periods_by_width: dict, start, end, max_points=MAX_POINTS):
+    """(width, row slice) of the finest tile level with at most `max_points` buckets in [start, end]."""
+    start = np.datetime64(pd.Timestamp(start), "ns")
+    end = np.datetime64(pd.Timestamp(end), "ns")
+    for width in sorted(periods_by_width):
+        periods = periods_by_width[width]
+        lo = int(np.searchsorted(periods, start - np.timedelta64(width, "h"), side="right"))
+        hi = int(np.searchsorted(periods, end, side="right"))
+        if hi - lo <= max_points or width == max(periods_by_width):
+            return width, slice(lo, hi)
@@ -18,6 +18,7 @@ def get_default_inputs():
         "window_u_value": 1.5,
         "window_shgc": 0.6,
         "shading_coefficient": 0.9,
+        "thermal_capacity_per_area": 165,
 
         # Internal Gains
         "num_people": 5,
@@ -48,6 +49,8 @@ def get_default_inputs():
         "ac_latent_capacity": 1.5,
         "ac_efficiency": 3.0,
         "ac_runtime_schedule": "9-17",
+        "coil_adp": 10,
+        "coil_bypass_factor": 0.15,
 
         # Psychrometric & Fluid Properties
         "latent_heat_vaporization": 2450,
@@ -0,0 +1,195 @@
+# memo.py
+"""
+Result cache for the tab calculation modules.
+
+`@memoize` keys each call by a hash of its arguments in canonical form:
+dicts are sorted, floats are rounded to 12 significant digits (ints are
+kept exact, and whole floats become ints), numeric strings (as typed into
+`st.text_input`) are parsed, and arrays and DataFrames are hashed by
+content (`disk_cache.by_content`). So `{"floor_area": "20"}` and
+`{"floor_area": 20.0}` hit the same entry.
+
+Each decorated function keeps a bounded LRU in process memory, shared by
+every session. With `disk=True`, results also go to the shared on-disk
+cache (`disk_cache.py`), keyed together with a hash of the function's source
+file, so they survive server restarts and are shared by worker processes.
+Use this for the expensive transient runs. Callers get a copy, so mutating
+a result never changes the cache.
+"""
+
+import copy
+import dataclasses
+import datetime
+import functools
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import disk_cache
+
+CACHES = {}  # qualified function name -> MemoCache
+EXACT_INT_LIMIT = 2 ** 53  # larger whole floats are not exact, so they stay floats
+
+
+def _number(x):
+    if isinstance(x, (int, np.integer)):
+        return int(x)
+    x = float(x)
+    if not math.isfinite(x):
+        return repr(x)
+    x = float(f"{x:.12g}") + 0.0  # + 0.0 folds -0.0 into 0.0
+    return int(x) if x.is_integer() and abs(x) < EXACT_INT_LIMIT else x
+
+
+def _parse_number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def canonical(value):
+    """JSON-serializable form of `value` in which equal inputs compare equal."""
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, np.bool_):
+        return _number(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return _number(_parse_number(text))
+        except ValueError:
+            return text
+    if isinstance(value, dict):
+        return {str(k): canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((canonical(v) for v in value), key=repr)
+    if isinstance(value, (pd.Timestamp, datetime.date, datetime.datetime)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, np.datetime64):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, (np.ndarray, pd.DataFrame, pd.Series)):
+        # Hashed by content the same way as the disk cache keys; object array elements are canonicalized too
+        return canonical(disk_cache.by_content(value))
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {"type": type(value).__name__, "fields": canonical(dataclasses.asdict(value))}
+    return repr(value)
+
+
+def input_hash(*args, **kwargs) -> str:
+    payload = json.dumps(canonical([list(args), kwargs]), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MemoCache:
+    """Bounded in-memory LRU with an optional on-disk cache behind it."""
+
+    def __init__(self, name, maxsize=128, disk=False, sources=(), data_version=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.disk = disk
+        self.sources = sources
+        self.data_version = data_version
+        self._version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.disk_hits = self.misses = 0
+
+    @property
+    def version(self) -> str:
+        """Hash of the source files, plus the data version; worked out on first disk access.
+
+        A memoized function among the sources contributes its own version,
+        so a change anywhere below it (its depends, its data) reaches here too.
+        """
+        if self._version is None:
+            nested = [s.cache.version for s in self.sources if isinstance(getattr(s, "cache", None), MemoCache)]
+            files = [s for s in self.sources if not isinstance(getattr(s, "cache", None), MemoCache)]
+            parts = [disk_cache.source_version(*files), *nested]
+            if self.data_version is not None:
+                parts.append(self.data_version())
+            self._version = "-".join(parts)
+        return self._version
+
+    def _disk_key(self, key):
+        return disk_cache.content_key(self.name, self.version, key)
+
+    def get(self, key):
+        """(True, value) on a hit, (False, None) on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+        if self.disk:
+            hit, value = disk_cache.get_cache().get(self._disk_key(key), self.name)
+            if hit:
+                self._remember(key, value)
+                with self._lock:
+                    self.disk_hits += 1
+                return True, value
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self.disk:
+            disk_cache.get_cache().put(self._disk_key(key), value, self.name)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._entries.clear()
+        if disk and self.disk:
+            disk_cache.get_cache().clear(self.name)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "maxsize": self.maxsize, "hits": self.hits,
+                    "disk_hits": self.disk_hits, "misses": self.misses}
+
+
+def memoize(maxsize=128, disk=False, depends=(), data_version=None):
+    """Cache a function's results by the canonical hash of its arguments.
+
+    On disk, entries are also keyed by the source of the function's module
+    and of `depends` (modules, file paths or other memoized functions, whose
+    whole version is included), and by `data_version()` if given.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        # A reloaded module (dev mode) gets a fresh cache, since its code changed
+        cache = CACHES[name] = MemoCache(name, maxsize, disk, (func, *depends), data_version)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = input_hash(*args, **kwargs)
+            hit, value = cache.get(key)
+            if not hit:
+                value = func(*args, **kwargs)
+                cache.put(key, value)
+            return copy.deepcopy(value)
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+def cache_stats() -> dict:
+    return {name: cache.stats() for name, cache in CACHES.items()}
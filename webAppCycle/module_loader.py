@@ -0,0 +1,140 @@
+# module_loader.py
+"""
+Tab module loading for app.py.
+
+Tab modules are imported once per server process and served from
+`sys.modules` on every rerun. In dev mode each rerun also checks the source
+files of the tab's package: a file whose mtime/size changed is hashed, and
+only a real content change triggers a reload. The changed modules and every
+package module that imports from them are reloaded in dependency order, so
+each module picks up the already reloaded names. Import and reload times are
+recorded per tab once the import has succeeded.
+"""
+
+import hashlib
+import importlib
+import os
+import sys
+import threading
+import time
+import types
+
+ENTRY_MODULES = ("report", "calculations", "plot")
+DEV_MODE = os.environ.get("HVAC_DEV_MODE", "").lower() in ("1", "true", "yes")
+
+
+def _stat(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class TabLoader:
+    """Caches tab modules and reloads them only when their source changes."""
+
+    def __init__(self):
+        self._sources = {}   # module name -> (mtime_ns, size, sha256)
+        self._lock = threading.Lock()
+        self.timings = {}    # tab package -> {"import": s, "reload": s, "reloads": n, "checked": s}
+
+    def _remember(self, module):
+        path = getattr(module, "__file__", None)
+        if path and path.endswith(".py") and os.path.exists(path):
+            self._sources[module.__name__] = (*_stat(path), _hash(path))
+
+    def _changed(self, name):
+        module = sys.modules.get(name)
+        path = getattr(module, "__file__", None)
+        if name not in self._sources or not path or not os.path.exists(path):
+            return False
+        mtime, size, digest = self._sources[name]
+        if _stat(path) == (mtime, size):
+            return False
+        new_digest = _hash(path)
+        self._sources[name] = (*_stat(path), new_digest)
+        return new_digest != digest
+
+    def _package_modules(self, package):
+        prefix = package + "."
+        return [name for name in list(sys.modules) if name == package or name.startswith(prefix)]
+
+    @staticmethod
+    def _imports(name, modules):
+        """Package modules that `name` imports, or imports names from."""
+        deps = set()
+        for value in vars(sys.modules[name]).values():
+            source = value.__name__ if isinstance(value, types.ModuleType) else getattr(value, "__module__", None)
+            if source in modules and source != name:
+                deps.add(source)
+        return deps
+
+    def _reload_order(self, package, changed):
+        """`changed` plus their dependents in the package, each after the modules it imports."""
+        modules = set(self._package_modules(package))
+        deps = {name: self._imports(name, modules) for name in modules}
+        stale = set(changed)
+        grown = True
+        while grown:
+            dependents = {name for name in modules if deps[name] & stale} - stale
+            stale |= dependents
+            grown = bool(dependents)
+        order = []
+
+        def visit(name, seen=()):
+            if name in order or name in seen:
+                return
+            for dep in sorted(deps[name] & stale):
+                visit(dep, (*seen, name))
+            order.append(name)
+
+        for name in sorted(stale):
+            visit(name)
+        return order
+
+    def load(self, tab_index, dev_mode=DEV_MODE):
+        """(report, calculations, plot) modules of `Tab{tab_index}`.
+
+        Raises ModuleNotFoundError if the tab has no such modules.
+        """
+        package = f"Tab{tab_index}"
+        names = [f"{package}.{m}" for m in ENTRY_MODULES]
+        with self._lock:
+            # A tab imported by another tab first still needs its sources recorded
+            if package not in self.timings or not all(name in sys.modules for name in names):
+                t = time.perf_counter()
+                modules = [importlib.import_module(name) for name in names]
+                # Only a successful import gets a timings entry
+                self.timings[package] = {"import": time.perf_counter() - t, "reload": 0.0,
+                                         "reloads": 0, "checked": 0.0}
+                for name in self._package_modules(package):
+                    self._remember(sys.modules[name])
+                return tuple(modules)
+
+            stats = self.timings[package]
+            if dev_mode:
+                t = time.perf_counter()
+                changed = [name for name in self._package_modules(package) if self._changed(name)]
+                stats["checked"] = time.perf_counter() - t
+                if changed:
+                    t = time.perf_counter()
+                    for name in self._reload_order(package, changed):
+                        importlib.reload(sys.modules[name])
+                        self._remember(sys.modules[name])
+                    stats["reload"] = time.perf_counter() - t
+                    stats["reloads"] += 1
+            return tuple(sys.modules[name] for name in names)
+
+
+_loader = TabLoader()
+
+
+def load_tab(tab_index, dev_mode=DEV_MODE):
+    return _loader.load(tab_index, dev_mode)
+
+
+def tab_timings():
+    return _loader.timings
@@ -0,0 +1,212 @@
+# persistence.py
+"""
+Saving tab parameters per session, with a run history.
+
+`save()` is called on every rerun but returns immediately. It drops params
+identical to the last ones saved for the same (session, tab), and hands
+the rest to one background writer. The writer waits a short debounce
+interval, so a burst of widget changes writes only the final state. Each
+write:
+ - replaces `user_data/sessions/<session>/params_tab<N>.json` atomically
+   (temp file + os.replace), so sessions never overwrite each other and
+   readers never see a half-written file;
+ - appends a row to the SQLite history. Identical parameter sets are
+   stored once, keyed by their hash.
+A write that fails (disk full, database locked) is put back in the queue
+and retried on the writer's next pass; `failures` and `last_error` record it.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+USER_DATA = os.path.join(BASE_DIR, "user_data")
+DEBOUNCE_SECONDS = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS params (
+    hash TEXT PRIMARY KEY,
+    json TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    session TEXT NOT NULL,
+    tab INTEGER NOT NULL,
+    hash TEXT NOT NULL REFERENCES params(hash),
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_session_tab ON runs(session, tab, created);
+CREATE INDEX IF NOT EXISTS runs_hash ON runs(hash);
+"""
+
+
+def canonical_json(params) -> str:
+    return json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def params_hash(params) -> str:
+    return hashlib.sha256(canonical_json(params).encode()).hexdigest()
+
+
+def atomic_write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2, default=str)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class ParamStore:
+    def __init__(self, root=USER_DATA, debounce=DEBOUNCE_SECONDS):
+        self.root = root
+        self.db_path = os.path.join(root, "history.sqlite")
+        self.debounce = debounce
+        self._last = {}       # (session, tab) -> hash already queued or written
+        self._pending = {}    # (session, tab) -> (hash, params, created)
+        self._cond = threading.Condition()
+        self._thread = None
+        self.writes = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_error = None
+        os.makedirs(root, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """One transaction: committed (or rolled back) and the connection closed on exit."""
+        with contextlib.closing(sqlite3.connect(self.db_path, timeout=10)) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            with db:
+                yield db
+
+    def session_file(self, session, tab):
+        safe = re.sub(r"[^0-9A-Za-z_-]+", "_", str(session))
+        return os.path.join(self.root, "sessions", safe, f"params_tab{tab}.json")
+
+    # --- Writing ---
+    def save(self, session, tab, params) -> bool:
+        """Queue `params` for writing; False if unchanged since the last save."""
+        digest = params_hash(params)
+        key = (str(session), int(tab))
+        with self._cond:
+            if self._last.get(key) == digest:
+                self.skipped += 1
+                return False
+            self._last[key] = digest
+            self._pending[key] = (digest, json.loads(canonical_json(params)), time.time())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="param-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait(timeout=30)
+                    # Decided under the lock, so a save() either sees this thread or starts a new one
+                    if not self._pending:
+                        self._thread = None
+                        return
+            time.sleep(self.debounce)
+            with self._cond:
+                batch, self._pending = self._pending, {}
+            self._write_or_requeue(batch)
+
+    def _write_or_requeue(self, batch) -> bool:
+        """Write `batch`; on failure put it back in the queue to retry on the next pass."""
+        try:
+            self._write(batch)
+        except (OSError, sqlite3.Error, TypeError, ValueError) as exc:
+            with self._cond:
+                self.failures += 1
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                for key, entry in batch.items():
+                    # A newer save of the same (session, tab) wins over the failed one
+                    self._pending.setdefault(key, entry)
+                    # Not on disk, so the same params saved again must not be skipped
+                    if self._last.get(key) == entry[0]:
+                        del self._last[key]
+            return False
+        with self._cond:
+            for key, (digest, _, _) in batch.items():
+                self._last.setdefault(key, digest)  # a retried write is known again once it succeeds
+        return True
+
+    def _write(self, batch):
+        for (session, tab), (_, params, _) in batch.items():
+            atomic_write_json(self.session_file(session, tab), params)
+        with self._connect() as db:
+            db.executemany("INSERT OR IGNORE INTO params(hash, json) VALUES (?, ?)",
+                           [(digest, canonical_json(params)) for digest, params, _ in batch.values()])
+            db.executemany("INSERT INTO runs(session, tab, hash, created) VALUES (?, ?, ?, ?)",
+                           [(session, tab, digest, created) for (session, tab), (digest, _, created) in batch.items()])
+        self.writes += len(batch)
+
+    def flush(self) -> bool:
+        """Write anything still queued now, without waiting for the debounce; False if that failed."""
+        with self._cond:
+            batch, self._pending = self._pending, {}
+        return self._write_or_requeue(batch) if batch else True
+
+    # --- Reading ---
+    def history(self, session=None, tab=None, limit=50) -> pd.DataFrame:
+        query = "SELECT id, session, tab, hash, created FROM runs"
+        clauses, args = [], []
+        if session is not None:
+            clauses.append("session = ?")
+            args.append(str(session))
+        if tab is not None:
+            clauses.append("tab = ?")
+            args.append(int(tab))
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY created DESC LIMIT ?"
+        args.append(int(limit))
+        with self._connect() as db:
+            df = pd.read_sql_query(query, db, params=args)
+        df["created"] = pd.to_datetime(df["created"], unit="s")
+        return df
+
+    def load(self, digest) -> dict:
+        with self._connect() as db:
+            row = db.execute("SELECT json FROM params WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        return json.loads(row[0])
+
+    def compare(self, digest_a, digest_b) -> pd.DataFrame:
+        """Parameters that differ between two saved runs."""
+        a, b = self.load(digest_a), self.load(digest_b)
+        keys = sorted(set(a) | set(b))
+        rows = [(k, a.get(k), b.get(k)) for k in keys if a.get(k) != b.get(k)]
+        return pd.DataFrame(rows, columns=["Parameter", f"A ({digest_a[:8]})", f"B ({digest_b[:8]})"])
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> ParamStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ParamStore()
+        return _store
@@ -2,20 +2,22 @@
 
 import streamlit as st
 import pandas as pd
-import altair as alt
-from vienna_weather_july2024_data import load_weather_data
+from lazy import lazy
+from weather_dataset import TILE_COLUMNS, get_dataset
+from downsample import MAX_POINTS
+from prerender import WEATHER, get_prerenderer
 
-def plot_weather(selected_date: str):
-    """Plot temperature and humidity for the selected July 2024 date."""
-    weather_data = load_weather_data()
+alt = lazy("altair")
 
-    if selected_date not in weather_data:
-        st.warning(f"No weather data found for {selected_date}")
-        return
 
-    df = weather_data[selected_date]
-    df_melted = df.melt(id_vars="Hour", value_vars=["Temperature", "Relative Humidity (%)"],
-                        var_name="Metric", value_name="Value")
+def weather_chart_spec(selected_date: str):
+    """Vega-Lite spec of the hourly chart for one date, or None if the date is unknown."""
+    dataset = get_dataset()
+
+    if selected_date not in dataset:
+        return None
+
+    df_melted = dataset.long_day(selected_date)
 
     chart = alt.Chart(df_melted).mark_line(
         strokeWidth=3  # Thicker lines
@@ -52,4 +54,67 @@ def plot_weather(selected_date: str):
         tickWidth=2
     ).interactive()
 
-    st.altair_chart(chart, use_container_width=True)
+    return chart.to_dict()
+
+
+def plot_weather(selected_date: str):
+    """Plot temperature and humidity for the selected July 2024 date."""
+    spec = get_prerenderer().get(WEATHER, selected_date, weather_chart_spec)
+    if spec is None:
+        st.warning(f"No weather data found for {selected_date}")
+        return
+
+    st.vega_lite_chart(spec, use_container_width=True)
+
+
+def range_chart_spec(start, end, max_points=MAX_POINTS):
+    """Vega-Lite spec of temperature and RH over [start, end] from the resolution tiles.
+
+    Above hourly resolution each metric is drawn as its min-max band with
+    the bucket mean on top; the number of marks never exceeds `max_points`
+    buckets per metric.
+    """
+    width, tiles = get_dataset().range_tiles(start, end, max_points=max_points)
+    if tiles.empty:
+        return None
+    frames = []
+    for metric in TILE_COLUMNS:
+        frames.append(pd.DataFrame({
+            "Timestamp": tiles.index,
+            "Metric": metric,
+            "Min": tiles[f"{metric} min"].to_numpy(),
+            "Mean": tiles[f"{metric} mean"].to_numpy(),
+            "Max": tiles[f"{metric} max"].to_numpy(),
+        }))
+    df = pd.concat(frames, ignore_index=True)
+    if width == 1:
+        df = df.drop(columns=["Min", "Max"])  # one reading per bucket, no band to draw
+
+    base = alt.Chart(df).encode(
+        x=alt.X("Timestamp:T", title=None),
+        color=alt.Color("Metric:N", title="Measurement"),
+    )
+    chart = base.mark_line(strokeWidth=2).encode(
+        y=alt.Y("Mean:Q", title="Value"),
+        tooltip=["Timestamp:T", "Metric", alt.Tooltip("Mean:Q", format=".1f")],
+    )
+    if width > 1:
+        chart = base.mark_area(opacity=0.25).encode(y="Min:Q", y2="Max:Q") + chart
+    resolution = "hourly" if width == 1 else f"{width} h buckets, min–max band"
+    return chart.properties(
+        title=f"Temperature and Humidity ({resolution})", height=320
+    ).interactive(bind_y=False).to_dict()
+
+
+def plot_weather_range():
+    """Date-range chart over the whole archive, downsampled to the visible range."""
+    dates = pd.to_datetime(get_dataset().dates()).date
+    if len(dates) == 0:
+        return
+    start, end = st.slider("Range:", min_value=dates[0], max_value=dates[-1],
+                           value=(dates[0], dates[-1]), format="YYYY-MM-DD")
+    spec = range_chart_spec(start, end)
+    if spec is None:
+        st.warning("No weather data in the selected range")
+        return
+    st.vega_lite_chart(spec, use_container_width=True)
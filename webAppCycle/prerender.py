@@ -0,0 +1,218 @@
+# prerender.py
+"""
+Background pre-rendering of the per-date weather charts.
+
+After server start a worker pool renders the psychrometric chart PNG and
+the Altair weather spec for every date in the dataset and stores them in a
+bounded, byte-accounted LRU cache shared by all sessions. Foreground renders
+check the cache first, wait on an in-flight job for the same date instead of
+duplicating it, and only render inline on a miss.
+
+Rendered charts are also written to the on-disk result cache, keyed by the
+chart code and the weather data version, so after a restart the warm-up
+reads them back instead of drawing them again.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import disk_cache
+
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+CONDITIONS = "conditions"
+WEATHER = "weather"
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CHART_SOURCES = ["Tab1/plot_conditions.py", "plot_weather_data.py", "psychrometrics.py", "comfort.py",
+                 "weather_dataset.py"]
+
+
+def _entry_size(value) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return len(json.dumps(value, default=str))
+
+
+class ChartCache:
+    """LRU cache of rendered charts bounded by total size in bytes."""
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return True, self._items[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        size = _entry_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self._bytes -= self._sizes[key]
+            self._items[key] = value
+            self._items.move_to_end(key)
+            self._sizes[key] = size
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old, _ = self._items.popitem(last=False)
+                self._bytes -= self._sizes.pop(old)
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+
+@lru_cache(maxsize=1)
+def charts_version() -> str:
+    from weather_dataset import data_version
+
+    return disk_cache.source_version(*(os.path.join(APP_DIR, p) for p in CHART_SOURCES)) + "-" + data_version()
+
+
+def _disk_key(kind, selected_date):
+    return disk_cache.content_key("charts", charts_version(), kind, selected_date)
+
+
+def load_chart(kind, selected_date):
+    """(True, chart) if the chart is in the on-disk cache."""
+    return disk_cache.get_cache().get(_disk_key(kind, selected_date), f"charts.{kind}")
+
+
+def save_chart(kind, selected_date, value):
+    disk_cache.get_cache().put(_disk_key(kind, selected_date), value, f"charts.{kind}")
+
+
+def _render_date(selected_date):
+    from Tab1.plot_conditions import conditions_png
+    from plot_weather_data import weather_chart_spec
+
+    charts = {}
+    for kind, render in ((CONDITIONS, conditions_png), (WEATHER, weather_chart_spec)):
+        hit, charts[kind] = load_chart(kind, selected_date)
+        if not hit:
+            charts[kind] = render(selected_date)
+            save_chart(kind, selected_date, charts[kind])
+    return charts
+
+
+class Prerenderer:
+    """Warms the chart cache for a list of dates on a worker pool.
+
+    Threads rather than processes: Streamlit replaces `__main__` with the
+    page script, so spawned workers would re-execute the app. Each render
+    uses its own matplotlib Figure, as concurrent sessions already do.
+    """
+
+    def __init__(self, cache=None, max_workers=2):
+        self.cache = cache or ChartCache()
+        self.max_workers = max_workers
+        self._executor = None
+        self._pending = {}
+        self._lock = threading.RLock()
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.started_at = None
+        self.finished_at = None
+
+    def start(self, dates):
+        with self._lock:
+            if self._executor is not None:
+                return
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="prerender")
+            atexit.register(self._executor.shutdown, wait=False, cancel_futures=True)
+            self.started_at = time.time()
+            todo = [d for d in dates if not self.cache.get((CONDITIONS, d))[0]]
+            self.total = len(todo)
+            for d in todo:
+                future = self._executor.submit(_render_date, d)
+                self._pending[d] = future
+                future.add_done_callback(lambda f, d=d: self._store(d, f))
+
+    def _store(self, selected_date, future):
+        if future.cancelled():
+            charts = {}
+        else:
+            try:
+                charts = future.result()
+            except Exception:
+                charts = None
+        if charts is None:
+            with self._lock:
+                self.failed += 1
+        else:
+            for kind, value in charts.items():
+                self.cache.put((kind, selected_date), value)
+        with self._lock:
+            self._pending.pop(selected_date, None)
+            self.done += 1
+            if self.done >= self.total:
+                self.finished_at = time.time()
+                self._executor.shutdown(wait=False)
+
+    def get(self, kind, selected_date, render):
+        """Cached chart, else the in-flight warm-up result, else `render(date)`."""
+        hit, value = self.cache.get((kind, selected_date))
+        if hit:
+            return value
+        # Wait for a job a worker already picked up; a queued one is
+        # cancelled and rendered here rather than waiting behind the queue
+        future = self._pending.get(selected_date)
+        if future is not None and not future.cancel():
+            try:
+                return future.result(timeout=30)[kind]
+            except Exception:
+                pass
+        hit, value = load_chart(kind, selected_date)
+        if not hit:
+            value = render(selected_date)
+            save_chart(kind, selected_date, value)
+        self.cache.put((kind, selected_date), value)
+        return value
+
+    def status(self) -> dict:
+        return {
+            "done": self.done,
+            "total": self.total,
+            "failed": self.failed,
+            "running": self.total > 0 and self.done < self.total,
+            "entries": len(self.cache),
+            "bytes": self.cache.nbytes,
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+            "seconds": (self.finished_at or time.time()) - self.started_at if self.started_at else 0.0,
+        }
+
+
+_prerenderer = Prerenderer()
+
+
+def get_prerenderer() -> Prerenderer:
+    return _prerenderer
+
+
+def start_warmup(dates):
+    """Start the warm-up once per server process; later calls are no-ops."""
+    _prerenderer.start(dates)
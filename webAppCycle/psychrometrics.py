@@ -0,0 +1,306 @@
+# psychrometrics.py
+"""
+Vectorized moist-air psychrometrics (SI units).
+
+Array counterparts of the psychrolib functions used across the app, built on
+the same ASHRAE Handbook formulas (Hyland-Wexler saturation pressure, the same
+dew-point and wet-bulb residuals) so results agree with psychrolib to within
+its own tolerance. Iterative quantities are solved for whole arrays at once,
+with faster-converging schemes where that does not change the root found.
+Every function broadcasts over NumPy arrays of any shape.
+
+Conventions follow psychrolib: temperatures in °C, relative humidity as a
+fraction (0-1), pressure in Pa, humidity ratio in kg/kg, enthalpy in J/kg.
+"""
+
+import numpy as np
+
+STANDARD_PRESSURE = 101325.0  # Pa
+TRIPLE_POINT_WATER_C = 0.01
+FREEZING_POINT_WATER_C = 0.0
+ZERO_CELSIUS_K = 273.15
+MIN_HUM_RATIO = 1e-7
+TOLERANCE = 0.001  # °C, same as psychrolib in SI
+MAX_ITER = 100
+
+
+def _as_float(x):
+    return np.asarray(x, dtype=np.float64)
+
+
+def _shaped(values, shape):
+    """`values` in the broadcast input shape; a Python float for scalar inputs."""
+    return float(values[0]) if shape == () else values.reshape(shape)
+
+
+def _ln_pws_water(T):
+    return (-5.8002206e3 / T + 1.3914993 + T * (-4.8640239e-2 + T * (4.1764768e-5 + T * -1.4452093e-8))
+            + 6.5459673 * np.log(T))
+
+
+def _ln_pws_ice(T):
+    return (-5.6745359e3 / T + 6.3925247 + T * (-9.677843e-3 + T * (6.2215701e-7 + T * (2.0747825e-9 + T * -9.484024e-13)))
+            + 4.1635019 * np.log(T))
+
+
+def _d_ln_pws_water(T):
+    return 5.8002206e3 / T**2 - 4.8640239e-2 + T * (2 * 4.1764768e-5 - 3 * 1.4452093e-8 * T) + 6.5459673 / T
+
+
+def _d_ln_pws_ice(T):
+    return (5.6745359e3 / T**2 - 9.677843e-3 + T * (2 * 6.2215701e-7 + T * (3 * 2.0747825e-9 - 4 * 9.484024e-13 * T))
+            + 4.1635019 / T)
+
+
+def _by_phase(t_db, water, ice):
+    """Evaluate `water` everywhere and `ice` only where T is at or below the triple point."""
+    t_db = _as_float(t_db)
+    T = t_db + ZERO_CELSIUS_K
+    out = water(T)
+    frozen = t_db <= TRIPLE_POINT_WATER_C
+    if np.any(frozen):
+        if out.ndim == 0:
+            return ice(T)
+        out[frozen] = ice(T[frozen])
+    return out
+
+
+def ln_sat_vapor_pressure(t_db):
+    return _by_phase(t_db, _ln_pws_water, _ln_pws_ice)
+
+
+def sat_vapor_pressure(t_db):
+    """Saturation vapour pressure (Pa) over water, or ice below the triple point."""
+    return np.exp(ln_sat_vapor_pressure(t_db))
+
+
+def vapor_pressure(t_db, rel_hum):
+    return _as_float(rel_hum) * sat_vapor_pressure(t_db)
+
+
+def hum_ratio_from_vapor_pressure(vap_pres, pressure=STANDARD_PRESSURE):
+    vap_pres = _as_float(vap_pres)
+    return np.maximum(0.621945 * vap_pres / (pressure - vap_pres), MIN_HUM_RATIO)
+
+
+def hum_ratio_from_rel_hum(t_db, rel_hum, pressure=STANDARD_PRESSURE):
+    """Humidity ratio (kg/kg) from dry-bulb and relative humidity."""
+    return hum_ratio_from_vapor_pressure(vapor_pressure(t_db, rel_hum), pressure)
+
+
+def sat_hum_ratio(t_db, pressure=STANDARD_PRESSURE):
+    return hum_ratio_from_vapor_pressure(sat_vapor_pressure(t_db), pressure)
+
+
+def vapor_pressure_from_hum_ratio(hum_ratio, pressure=STANDARD_PRESSURE):
+    w = np.maximum(_as_float(hum_ratio), MIN_HUM_RATIO)
+    return pressure * w / (0.621945 + w)
+
+
+def rel_hum_from_hum_ratio(t_db, hum_ratio, pressure=STANDARD_PRESSURE):
+    return vapor_pressure_from_hum_ratio(hum_ratio, pressure) / sat_vapor_pressure(t_db)
+
+
+def rel_hum_from_dew_point(t_db, t_dew):
+    """Relative humidity (fraction) from dry-bulb and dew-point temperature."""
+    return sat_vapor_pressure(t_dew) / sat_vapor_pressure(t_db)
+
+
+def moist_air_enthalpy(t_db, hum_ratio):
+    """Moist-air enthalpy (J/kg dry air)."""
+    t_db = _as_float(t_db)
+    return (1.006 * t_db + _as_float(hum_ratio) * (2501.0 + 1.86 * t_db)) * 1000.0
+
+
+def moist_air_volume(t_db, hum_ratio, pressure=STANDARD_PRESSURE):
+    """Specific volume (m³/kg dry air)."""
+    w = np.maximum(_as_float(hum_ratio), MIN_HUM_RATIO)
+    return 287.042 * (_as_float(t_db) + ZERO_CELSIUS_K) * (1 + 1.607858 * w) / pressure
+
+
+def dew_point_from_vapor_pressure(t_db, vap_pres):
+    """Dew point (°C) by Newton iteration on ln(p_ws), run on all elements at once.
+
+    Starts from the inverted Magnus formula rather than the dry bulb, so two
+    or three steps reach psychrolib's tolerance.
+    """
+    t_db, vap_pres = np.broadcast_arrays(_as_float(t_db), _as_float(vap_pres))
+    shape = t_db.shape
+    # 1-d working copies: masked assignment needs a writable array, even for scalar input
+    t_db, vap_pres = np.atleast_1d(t_db).ravel(), np.atleast_1d(vap_pres).ravel()
+    ln_vp = np.log(vap_pres)
+    gamma = ln_vp - np.log(610.94)
+    t_dew = np.clip(243.04 * gamma / (17.625 - gamma), -100.0, 200.0)
+    active = np.ones(t_dew.shape, dtype=bool)
+    for _ in range(MAX_ITER):
+        t = t_dew[active]
+        step = (ln_sat_vapor_pressure(t) - ln_vp[active]) / _by_phase(t, _d_ln_pws_water, _d_ln_pws_ice)
+        t_new = np.clip(t - step, -100.0, 200.0)
+        t_dew[active] = t_new
+        active[active] = np.abs(t_new - t) > TOLERANCE / 10
+        if not active.any():
+            break
+    return _shaped(np.minimum(t_dew, t_db), shape)
+
+
+def dew_point(t_db, rel_hum):
+    """Dew point (°C) from dry-bulb and relative humidity."""
+    return dew_point_from_vapor_pressure(t_db, vapor_pressure(t_db, rel_hum))
+
+
+def _hum_ratio_at_wet_bulb(t_db, t_wb, pressure):
+    ws = sat_hum_ratio(t_wb, pressure)
+    w = ((2501.0 - 2.326 * t_wb) * ws - 1.006 * (t_db - t_wb)) / (2501.0 + 1.86 * t_db - 4.186 * t_wb)
+    frozen = t_wb < FREEZING_POINT_WATER_C
+    if np.any(frozen):
+        tf, tdf, wsf = t_wb[frozen], t_db[frozen], ws[frozen]
+        w[frozen] = ((2830.0 - 0.24 * tf) * wsf - 1.006 * (tdf - tf)) / (2830.0 + 1.86 * tdf - 2.1 * tf)
+    return np.maximum(w, MIN_HUM_RATIO, out=w)
+
+
+def _wet_bulb_bisection(t_db, w, pressure, lower, upper):
+    # psychrolib's own scheme while a bracket straddles 0 °C: the residual
+    # jumps there, so those steps must match psychrolib's to agree with it.
+    # An element drops out once its bracket converges or lies on one side of
+    # 0 °C, where the residual is smooth; Newton finishes the latter.
+    lower, upper = lower.copy(), upper.copy()
+    idx = np.flatnonzero(upper - lower > TOLERANCE)
+    for _ in range(MAX_ITER):
+        if idx.size == 0:
+            break
+        lo, hi = lower[idx], upper[idx]
+        mid = 0.5 * (lo + hi)
+        too_wet = _hum_ratio_at_wet_bulb(t_db[idx], mid, pressure[idx]) > w[idx]
+        hi = np.where(too_wet, mid, hi)
+        lo = np.where(too_wet, lo, mid)
+        lower[idx], upper[idx] = lo, hi
+        keep = (hi - lo > TOLERANCE) & (lo < FREEZING_POINT_WATER_C) & (hi >= FREEZING_POINT_WATER_C)
+        idx = idx[keep]
+    return lower, upper
+
+
+def _hum_ratio_and_slope(t_db, t_wb, pressure):
+    """(W at t_wb, dW/dt_wb) of the wet-bulb residual, without the MIN_HUM_RATIO floor."""
+    pws = sat_vapor_pressure(t_wb)
+    ws = 0.621945 * pws / (pressure - pws)
+    d_ws = ws * pressure / (pressure - pws) * _by_phase(t_wb, _d_ln_pws_water, _d_ln_pws_ice)
+    frozen = t_wb < FREEZING_POINT_WATER_C
+    h = np.where(frozen, 2830.0, 2501.0)
+    c = np.where(frozen, 0.24, 2.326)
+    e = np.where(frozen, 2.1, 4.186)
+    num = (h - c * t_wb) * ws - 1.006 * (t_db - t_wb)
+    den = h + 1.86 * t_db - e * t_wb
+    return num / den, ((1.006 - c * ws + (h - c * t_wb) * d_ws) * den + e * num) / den ** 2
+
+
+def _wet_bulb_newton(t_db, w, pressure, a, b):
+    # Newton steps kept inside the [a, b] bracket (a bisection step whenever
+    # Newton would leave it). Same residual and bracket as the bisection; the
+    # residual is smooth here, so two or three passes reach the tolerance.
+    # Inputs are compacted with the active set each pass.
+    result = 0.5 * (a + b)
+    live = b - a > TOLERANCE / 10
+    idx = np.flatnonzero(live)
+    t_db, w, pressure, a, b, x = (v[live] for v in (t_db, w, pressure, a, b, result))
+    for _ in range(MAX_ITER):
+        if idx.size == 0:
+            break
+        f, slope = _hum_ratio_and_slope(t_db, x, pressure)
+        too_wet = f > w
+        b = np.where(too_wet, x, b)
+        a = np.where(too_wet, a, x)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_new = x - (f - w) / slope
+        outside = ~((x_new >= a) & (x_new <= b))
+        x_new = np.where(outside, 0.5 * (a + b), x_new)
+        keep = outside | (np.abs(x_new - x) > TOLERANCE / 4)
+        result[idx[~keep]] = x_new[~keep]
+        idx, t_db, w, pressure, a, b, x = (v[keep] for v in (idx, t_db, w, pressure, a, b, x_new))
+    result[idx] = x  # still unconverged after MAX_ITER: the last estimate
+    return result
+
+
+def wet_bulb_from_hum_ratio(t_db, hum_ratio, pressure=STANDARD_PRESSURE):
+    """Wet-bulb (°C) bracketed between dew point and dry bulb, vectorized."""
+    t_db, w, pressure = np.broadcast_arrays(_as_float(t_db), _as_float(hum_ratio), _as_float(pressure))
+    shape = t_db.shape
+    t_db, pressure = np.atleast_1d(t_db).ravel(), np.atleast_1d(pressure).ravel()
+    w = np.maximum(np.atleast_1d(w).ravel(), MIN_HUM_RATIO)
+
+    lower = dew_point_from_vapor_pressure(t_db, vapor_pressure_from_hum_ratio(w, pressure))
+    upper = t_db.copy()
+    result = np.empty_like(t_db)
+
+    s = np.flatnonzero((lower < FREEZING_POINT_WATER_C) & (upper >= FREEZING_POINT_WATER_C))
+    if s.size:
+        lower[s], upper[s] = _wet_bulb_bisection(t_db[s], w[s], pressure[s], lower[s], upper[s])
+        converged = s[upper[s] - lower[s] <= TOLERANCE]
+        result[converged] = 0.5 * (lower[converged] + upper[converged])
+        rest = np.ones(len(t_db), dtype=bool)
+        rest[converged] = False
+        r = np.flatnonzero(rest)
+    else:
+        r = np.arange(len(t_db))
+    if r.size:
+        result[r] = _wet_bulb_newton(t_db[r], w[r], pressure[r], lower[r], upper[r])
+    return _shaped(result, shape)
+
+
+def wet_bulb(t_db, rel_hum, pressure=STANDARD_PRESSURE):
+    return wet_bulb_from_hum_ratio(t_db, hum_ratio_from_rel_hum(t_db, rel_hum, pressure), pressure)
+
+
+def moist_air_state(t_db, rel_hum, pressure=STANDARD_PRESSURE):
+    """All derived properties for arrays of (T, RH, p) in one pass."""
+    t_db = _as_float(t_db)
+    pv = vapor_pressure(t_db, rel_hum)
+    w = hum_ratio_from_vapor_pressure(pv, pressure)
+    return {
+        "hum_ratio": w,
+        "enthalpy": moist_air_enthalpy(t_db, w),
+        "wet_bulb": wet_bulb_from_hum_ratio(t_db, w, pressure),
+        "dew_point": dew_point_from_vapor_pressure(t_db, pv),
+        "specific_volume": moist_air_volume(t_db, w, pressure),
+        "vapor_pressure": pv,
+    }
+
+
+def validate_against_psychrolib(n=2000, seed=0):
+    """Max absolute difference to psychrolib over random states."""
+    import psychrolib
+
+    psychrolib.SetUnitSystem(psychrolib.SI)
+    rng = np.random.default_rng(seed)
+    t = rng.uniform(-10.0, 45.0, n)
+    rh = rng.uniform(0.05, 1.0, n)
+    p = rng.uniform(90000.0, 105000.0, n)
+    state = moist_air_state(t, rh, p)
+
+    reference = {
+        "hum_ratio": [psychrolib.GetHumRatioFromRelHum(*args) for args in zip(t, rh, p)],
+        "enthalpy": [psychrolib.GetMoistAirEnthalpy(ti, wi) for ti, wi in zip(t, state["hum_ratio"])],
+        "wet_bulb": [psychrolib.GetTWetBulbFromRelHum(*args) for args in zip(t, rh, p)],
+        "dew_point": [psychrolib.GetTDewPointFromRelHum(ti, ri) for ti, ri in zip(t, rh)],
+        "specific_volume": [psychrolib.GetMoistAirVolume(ti, wi, pi) for ti, wi, pi in zip(t, state["hum_ratio"], p)],
+    }
+    errors = {key: float(np.max(np.abs(state[key] - np.asarray(ref)))) for key, ref in reference.items()}
+    # Scalar inputs must give the same numbers as the array path
+    scalar = moist_air_state(float(t[0]), float(rh[0]), float(p[0]))
+    errors["scalar"] = float(max(abs(scalar[key] - state[key][0]) for key in reference))
+    return errors
+
+
+if __name__ == "__main__":
+    import time
+
+    print("Max abs error vs psychrolib:")
+    for key, err in validate_against_psychrolib().items():
+        print(f"  {key:16s} {err:.3e}")
+
+    # One year of hourly data for 300 stations
+    rng = np.random.default_rng(1)
+    t = rng.uniform(-10.0, 40.0, (300, 8760))
+    rh = rng.uniform(0.1, 1.0, (300, 8760))
+    start = time.perf_counter()
+    moist_air_state(t, rh)
+    print(f"{t.size:,} states in {time.perf_counter() - start:.2f} s")
@@ -1,20 +1,23 @@
+# simulation.py
+"""Rebuild the binary weather cache from the source spreadsheets.
 
-from vienna_weather_july2024_data import (load_weather_data)
+The app opens (and if needed rebuilds) the cache on its own at startup;
+run this after adding or editing weather files to pay that cost up front.
+"""
 
-import pickle
+import time
 
-# Example: your data
-weather_data = load_weather_data()  # in your case from simulation.py
+import weather_cache
+from weather_dataset import DERIVED_TABLES, STORED_COLUMNS, WeatherDataset, derive_tables, read_partition
 
-# Save to a file
-with open('weather_data.pkl', 'wb') as f:
-    pickle.dump(weather_data, f)
-
-import pickle
-
-# Load from the file
-with open('weather_data.pkl', 'rb') as f:
-    weather_data = pickle.load(f)
-
-# Now weather_data is ready!
-print(weather_data['2024-07-01'])  # Same as before
+if __name__ == "__main__":
+    dataset = WeatherDataset(use_cache=False)
+    for station in dataset.stations():
+        partitions = dataset._index[station]
+        start = time.perf_counter()
+        cache = weather_cache.build(station, partitions, read_partition, STORED_COLUMNS, derive_tables=derive_tables)
+        # open_or_build rebuilds a cache whose tables differ from DERIVED_TABLES, so keep them in step
+        assert sorted(cache.tables) == sorted(DERIVED_TABLES), sorted(cache.tables)
+        elapsed = time.perf_counter() - start
+        print(f"{station}: {len(partitions)} days, {cache.manifest['rows']} rows, {len(cache.tables)} tables, "
+              f"{cache.nbytes() / 1024:.1f} KiB in {elapsed:.2f} s -> {cache.folder}")
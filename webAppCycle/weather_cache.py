@@ -0,0 +1,203 @@
+# weather_cache.py
+"""
+Binary cache for the weather archive.
+
+One directory per station holding a `manifest.json` and one `.npy` file per
+column with every partition stacked end to end. The manifest records the
+schema version, the SHA-256, size and mtime of each source file and the row
+range of each partition. Only sources whose size or mtime changed are hashed
+again at startup. Loading opens the columns with `mmap_mode="r"`, so nothing is
+deserialized up front and only the pages a query touches are read.
+
+Tables derived from the whole archive at build time (period aggregates,
+long-form chart views) are stored the same way, one `<table>__<column>.npy`
+per column, and listed under "tables" in the manifest.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+
+SCHEMA_VERSION = 3
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "weather")
+MANIFEST = "manifest.json"
+
+
+def _column_file(name: str) -> str:
+    slug = re.sub(r"[^0-9a-z]+", "_", name.lower().replace("%", "pct")).strip("_")
+    return f"{slug}.npy"
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_entry(day, path) -> dict:
+    stat = os.stat(path)
+    return {"date": day.isoformat(), "file": os.path.basename(path), "sha256": file_sha256(path),
+            "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class WeatherCache:
+    """Memory-mapped view of one station's cached columns."""
+
+    def __init__(self, folder: str, manifest: dict):
+        self.folder = folder
+        self.manifest = manifest
+        self.columns = {
+            name: np.load(os.path.join(folder, meta["file"]), mmap_mode="r")
+            for name, meta in manifest["columns"].items()
+        }
+        self.offsets = {p["date"]: (p["start"], p["stop"]) for p in manifest["partitions"]}
+        self.tables = {
+            table: {name: np.load(os.path.join(folder, meta["file"]), mmap_mode="r")
+                    for name, meta in spec["columns"].items()}
+            for table, spec in manifest.get("tables", {}).items()
+        }
+
+    def partition(self, day: str) -> dict:
+        """Column views for one day; no data is copied."""
+        start, stop = self.offsets[day]
+        return {name: col[start:stop] for name, col in self.columns.items()}
+
+    def nbytes(self) -> int:
+        return (sum(col.nbytes for col in self.columns.values())
+                + sum(col.nbytes for table in self.tables.values() for col in table.values()))
+
+
+def _station_dir(station: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, re.sub(r"[^0-9A-Za-z_-]+", "_", station))
+
+
+def read_manifest(folder: str):
+    try:
+        with open(os.path.join(folder, MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_valid(manifest, partitions: dict, columns: list, tables=None) -> bool:
+    """True if the manifest matches the schema, the column set, the derived
+    table set (when `tables` is given) and every source.
+
+    A source whose size and mtime are unchanged is taken as unchanged; only
+    the others are hashed. Sources that were merely touched get their new
+    stat written into `manifest` in place.
+    """
+    if not manifest or manifest.get("schema_version") != SCHEMA_VERSION:
+        return False
+    if list(manifest.get("columns", {})) != list(columns):
+        return False
+    if tables is not None and set(manifest.get("tables", {})) != set(tables):
+        return False
+    cached = {s["date"]: s for s in manifest.get("sources", [])}
+    if set(cached) != {day.isoformat() for day in partitions}:
+        return False
+    for day, path in partitions.items():
+        entry = cached[day.isoformat()]
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if (entry.get("size"), entry.get("mtime_ns")) == (stat.st_size, stat.st_mtime_ns):
+            continue
+        if file_sha256(path) != entry["sha256"]:
+            return False
+        entry["size"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+    return True
+
+
+def write_manifest(folder: str, manifest: dict):
+    tmp = os.path.join(folder, f"{MANIFEST}.tmp-{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(folder, MANIFEST))
+
+
+def build(station: str, partitions: dict, read_partition, columns: list, cache_dir: str = CACHE_DIR,
+          derive_tables=None) -> WeatherCache:
+    """Parse every source partition and write the station's cache directory.
+
+    `derive_tables(columns, bounds)` receives the stacked columns and the
+    (start, stop) rows of each partition, and returns {table: {column: array}}.
+    """
+    folder = _station_dir(station, cache_dir)
+    tmp = f"{folder}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    chunks = {name: [] for name in columns}
+    layout, sources, row = [], [], 0
+    for day, path in partitions.items():
+        data = read_partition(path, day)
+        n = len(data[columns[0]])
+        for name in columns:
+            chunks[name].append(data[name])
+        layout.append({"date": day.isoformat(), "start": row, "stop": row + n})
+        sources.append(source_entry(day, path))
+        row += n
+
+    column_meta, stacked = {}, {}
+    for name in columns:
+        values = stacked[name] = np.concatenate(chunks[name]) if chunks[name] else np.empty(0)
+        np.save(os.path.join(tmp, _column_file(name)), values)
+        column_meta[name] = {"file": _column_file(name), "dtype": str(values.dtype)}
+
+    table_meta = {}
+    derived = derive_tables(stacked, [(p["start"], p["stop"]) for p in layout]) if derive_tables else {}
+    for table, table_columns in derived.items():
+        meta = table_meta[table] = {"columns": {}}
+        for name, values in table_columns.items():
+            values = np.ascontiguousarray(values)
+            file = f"{table}__{_column_file(name)}"
+            np.save(os.path.join(tmp, file), values)
+            meta["columns"][name] = {"file": file, "dtype": str(values.dtype)}
+            meta["rows"] = len(values)
+
+    manifest = {
+        "schema_version": SCHEMA_VERSION,
+        "station": station,
+        "rows": row,
+        "columns": column_meta,
+        "tables": table_meta,
+        "partitions": layout,
+        "sources": sources,
+    }
+    write_manifest(tmp, manifest)
+
+    # Swap the finished directory in; readers never see a partial cache
+    old = f"{folder}.old-{os.getpid()}"
+    if os.path.isdir(folder):
+        os.replace(folder, old)
+    os.replace(tmp, folder)
+    shutil.rmtree(old, ignore_errors=True)
+    return WeatherCache(folder, manifest)
+
+
+def open_or_build(station: str, partitions: dict, read_partition, columns: list, cache_dir: str = CACHE_DIR,
+                  derive_tables=None, tables=None) -> WeatherCache:
+    """Open the station's cache, rebuilding it if missing, outdated or stale.
+
+    `tables` lists the table names `derive_tables` produces; a cache built
+    with a different set (or without them) is rebuilt.
+    """
+    folder = _station_dir(station, cache_dir)
+    manifest = read_manifest(folder)
+    recorded = json.dumps(manifest, sort_keys=True)
+    if is_valid(manifest, partitions, columns, tables):
+        if json.dumps(manifest, sort_keys=True) != recorded:
+            try:
+                write_manifest(folder, manifest)  # remember the new stats of touched sources
+            except OSError:
+                pass
+        return WeatherCache(folder, manifest)
+    return build(station, partitions, read_partition, columns, cache_dir, derive_tables)
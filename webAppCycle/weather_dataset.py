@@ -0,0 +1,442 @@
+# weather_dataset.py
+"""
+Lazy, partitioned access to the hourly weather archive.
+
+Every source file is one partition (one station, one day). The index is built
+from file names only, so listing dates never reads a spreadsheet; partitions
+are parsed on first use and kept in a small LRU cache. Queries select
+partitions by station and date range before anything is loaded, so memory
+scales with the query rather than with the archive.
+
+When the binary cache (`weather_cache.py`) is valid for a station, partitions
+are served as memory-mapped views of it instead of parsing the spreadsheets.
+
+Derived quantities are computed once at ingest: humidity ratio, enthalpy and
+wet-bulb per row, and with the cache also daily/weekly aggregates, the
+long-form (Hour, Metric, Value) view the weather chart plots and the
+min/mean/max tiles of every resolution level for range charts
+(`downsample.py`). Render paths slice these arrays instead of recomputing them.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+import psychrometrics as psy
+import weather_cache
+from downsample import MAX_POINTS, TILE_HOURS, build_tiles, pick_level
+from vienna_weather_july2024_data import compute_relative_humidity
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# One entry per station. `pattern` maps a file name to its date; missing
+# year/month groups fall back to the values given here. Coordinates are in
+# degrees (east positive) and `utc_offset` is the offset of the source
+# timestamps from UTC in hours (Meteostat exports are UTC).
+STATIONS = {
+    "Vienna": {
+        "folder": BASE_DIR,
+        "pattern": re.compile(r"^(?P<day>\d{1,2})july\.xlsx$"),
+        "year": 2024,
+        "month": 7,
+        "latitude": 48.21,
+        "longitude": 16.37,
+        "utc_offset": 0,
+    },
+}
+DEFAULT_STATION = "Vienna"
+
+# Source column -> dataset column
+COLUMN_MAP = {
+    "time": "Timestamp",
+    "temp": "Temperature",
+    "dwpt": "Dew Point",
+    "pres": "Pressure",
+    "coco": "Condition Code",
+}
+DERIVED_COLUMNS = ["Humidity Ratio (g/kg)", "Enthalpy (kJ/kg)", "Wet Bulb"]
+COLUMNS = ["Hour", "Temperature", "Dew Point", "Relative Humidity (%)", "Pressure", "Condition Code"] + DERIVED_COLUMNS
+STORED_COLUMNS = ["Timestamp"] + COLUMNS
+
+# Long-form chart view: every partition's rows for each metric, stacked
+LONG_METRICS = ["Temperature", "Relative Humidity (%)"]
+AGGREGATED_COLUMNS = ["Temperature", "Relative Humidity (%)"] + DERIVED_COLUMNS
+PERIODS = {"daily": "D", "weekly": "W-SUN"}
+DEGREE_HOUR_BASE = 18.0  # °C, base of the cooling degree-hours in the aggregates
+TILE_COLUMNS = ["Temperature", "Relative Humidity (%)"]
+# Every table `derive_tables` stores; a cache holding a different set is rebuilt
+DERIVED_TABLES = [*PERIODS, "long", *(f"tiles_{width}h" for width in TILE_HOURS)]
+
+
+def _parse_date(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def read_partition(path: str, day: date) -> dict:
+    """Parse one source file into a dict of contiguous column arrays.
+
+    The date comes from the index (the file name), matching the legacy
+    behaviour; only the hour is taken from the file's time column.
+    """
+    df = pd.read_excel(path)
+    df = df[[c for c in COLUMN_MAP if c in df.columns]].rename(columns=COLUMN_MAP)
+
+    hours = pd.to_datetime(df["Timestamp"]).dt.hour
+    timestamps = pd.Timestamp(day) + pd.to_timedelta(hours, unit="h")
+    temp = df["Temperature"].to_numpy(dtype=np.float64)
+    dwpt = df["Dew Point"].to_numpy(dtype=np.float64)
+    n = len(df)
+
+    data = {
+        "Timestamp": timestamps.to_numpy(dtype="datetime64[ns]"),
+        "Hour": hours.to_numpy(dtype=np.int64),
+        "Temperature": temp,
+        "Dew Point": dwpt,
+        "Relative Humidity (%)": np.ascontiguousarray(compute_relative_humidity(temp, dwpt)),
+        "Pressure": df["Pressure"].to_numpy(dtype=np.float64) if "Pressure" in df else np.full(n, np.nan),
+        "Condition Code": df["Condition Code"].to_numpy(dtype=np.float64) if "Condition Code" in df else np.full(n, np.nan),
+    }
+    data.update(derived_columns(temp, data["Relative Humidity (%)"], data["Pressure"]))
+    return data
+
+
+def derived_columns(temp, rh_pct, pressure_hpa) -> dict:
+    """Humidity ratio, enthalpy and wet-bulb rows (NaN where an input is missing)."""
+    pressure = np.where(np.isfinite(pressure_hpa), pressure_hpa * 100.0, psy.STANDARD_PRESSURE)
+    valid = np.isfinite(temp) & np.isfinite(rh_pct)
+    w = np.full(len(temp), np.nan)
+    wet_bulb = np.full(len(temp), np.nan)
+    w[valid] = psy.hum_ratio_from_rel_hum(temp[valid], rh_pct[valid] / 100.0, pressure[valid])
+    wet_bulb[valid] = psy.wet_bulb_from_hum_ratio(temp[valid], w[valid], pressure[valid])
+    return {
+        "Humidity Ratio (g/kg)": w * 1000.0,
+        "Enthalpy (kJ/kg)": psy.moist_air_enthalpy(temp, w) / 1000.0,
+        "Wet Bulb": wet_bulb,
+    }
+
+
+def aggregate(columns: dict, period="daily") -> dict:
+    """Min/mean/max of AGGREGATED_COLUMNS and cooling degree-hours per day or week."""
+    df = pd.DataFrame({c: columns[c] for c in AGGREGATED_COLUMNS})
+    starts = pd.DatetimeIndex(columns["Timestamp"]).to_period(PERIODS[period]).start_time
+    grouped = df.groupby(starts)
+    stats = grouped.agg(["min", "mean", "max"])
+    table = {"Period": stats.index.to_numpy(dtype="datetime64[ns]")}
+    for column, stat in stats.columns:
+        table[f"{column} {stat}"] = stats[(column, stat)].to_numpy(dtype=np.float64)
+    excess = np.maximum(df["Temperature"] - DEGREE_HOUR_BASE, 0.0)
+    table["Cooling Degree-Hours"] = excess.groupby(starts).sum().to_numpy(dtype=np.float64)
+    table["Hours"] = grouped.size().to_numpy(dtype=np.int64)
+    return table
+
+
+def long_form(columns: dict, bounds) -> dict:
+    """(Hour, Metric code, Value) rows, partition by partition, metric by metric.
+
+    Partition rows [start, stop) land at [k*start, k*stop) for k metrics, so a
+    day's slice follows from the partition offsets alone.
+    """
+    hour, metric, value = [], [], []
+    for start, stop in bounds:
+        for code, name in enumerate(LONG_METRICS):
+            hour.append(columns["Hour"][start:stop])
+            metric.append(np.full(stop - start, code, dtype=np.int8))
+            value.append(columns[name][start:stop])
+    empty = np.empty(0)
+    return {
+        "Hour": np.concatenate(hour) if hour else empty.astype(np.int64),
+        "Metric": np.concatenate(metric) if metric else empty.astype(np.int8),
+        "Value": np.concatenate(value) if value else empty,
+    }
+
+
+def tiles(columns: dict) -> dict:
+    """{"tiles_<width>h": table} for every resolution level in TILE_HOURS."""
+    levels = build_tiles(columns["Timestamp"], {c: columns[c] for c in TILE_COLUMNS})
+    return {f"tiles_{width}h": table for width, table in levels.items()}
+
+
+def derive_tables(columns: dict, bounds) -> dict:
+    tables = {period: aggregate(columns, period) for period in PERIODS} if bounds else {}
+    tables["long"] = long_form(columns, bounds)
+    tables.update(tiles(columns))
+    return tables
+
+
+class WeatherDataset:
+    """Index of weather partitions with lazy loading and range queries."""
+
+    def __init__(self, stations=None, max_cached_partitions=64, use_cache=True):
+        self.station_specs = stations or STATIONS
+        self.max_cached_partitions = max_cached_partitions
+        self._index = self._build_index()
+        self._fingerprint = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._tables = {}  # (station, table) -> columns, when there is no cache to read them from
+        self._stores = self._open_stores() if use_cache else {}
+
+    def _open_stores(self):
+        stores = {}
+        for station, partitions in self._index.items():
+            if not partitions:
+                continue
+            try:
+                stores[station] = weather_cache.open_or_build(station, partitions, read_partition, STORED_COLUMNS,
+                                                               derive_tables=derive_tables, tables=DERIVED_TABLES)
+            except OSError as exc:
+                # Read-only deployments fall back to parsing the sources lazily
+                print(f"⚠️ Weather cache unavailable for {station}: {exc}")
+        return stores
+
+    # --- Index ---
+    def _build_index(self):
+        index = {}
+        for station, spec in self.station_specs.items():
+            entries = {}
+            folder = spec["folder"]
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                match = spec["pattern"].match(name)
+                if not match:
+                    continue
+                parts = match.groupdict()
+                day = date(int(parts.get("year") or spec["year"]),
+                           int(parts.get("month") or spec["month"]),
+                           int(parts["day"]))
+                entries[day] = os.path.join(folder, name)
+            index[station] = dict(sorted(entries.items()))
+        return index
+
+    def stations(self):
+        return list(self._index)
+
+    def fingerprint(self) -> str:
+        """Hash of every partition's path, size and modification time."""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for station, partitions in sorted(self._index.items()):
+                for day, path in partitions.items():
+                    stat = os.stat(path)
+                    digest.update(f"{station}|{day}|{os.path.basename(path)}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+            self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+
+    def dates(self, station=DEFAULT_STATION):
+        """Available dates as 'YYYY-MM-DD' strings, without loading any data."""
+        return [d.isoformat() for d in self._index.get(station, {})]
+
+    def partitions(self, start=None, end=None, station=None):
+        """(station, date, path) for every partition overlapping [start, end]."""
+        start, end = _parse_date(start), _parse_date(end)
+        stations = [station] if station else self.stations()
+        selected = []
+        for st_name in stations:
+            for day, path in self._index.get(st_name, {}).items():
+                if (start is None or day >= start) and (end is None or day <= end):
+                    selected.append((st_name, day, path))
+        return selected
+
+    # --- Partition cache ---
+    def _load(self, station, day, path):
+        store = self._stores.get(station)
+        if store is not None:
+            return store.partition(day.isoformat())
+
+        key = (station, day)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        columns = read_partition(path, day)
+        with self._lock:
+            self._cache[key] = columns
+            while len(self._cache) > self.max_cached_partitions:
+                self._cache.popitem(last=False)
+        return columns
+
+    def cached_partitions(self):
+        return len(self._cache)
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    # --- Queries ---
+    def _select(self, start, end, station, columns):
+        columns = list(columns) if columns else COLUMNS
+        unknown = [c for c in columns if c not in COLUMNS and c != "Timestamp"]
+        if unknown:
+            raise KeyError(f"Unknown weather columns: {unknown}")
+
+        t_start = pd.Timestamp(start) if start is not None else None
+        t_end = pd.Timestamp(end) if end is not None else None
+        # A bare date as end bound means "through the end of that day"
+        if t_end is not None and t_end == t_end.normalize() and not isinstance(end, datetime):
+            t_end = t_end + pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
+
+        for st_name, day, path in self.partitions(start, end, station):
+            data = self._load(st_name, day, path)
+            mask = None
+            if t_start is not None or t_end is not None:
+                ts = data["Timestamp"]
+                mask = np.ones(len(ts), dtype=bool)
+                if t_start is not None:
+                    mask &= ts >= t_start.to_datetime64()
+                if t_end is not None:
+                    mask &= ts <= t_end.to_datetime64()
+                if mask.all():
+                    mask = None
+            yield st_name, day, {c: (data[c] if mask is None else data[c][mask]) for c in columns}
+
+    # --- Derived tables ---
+    def _table(self, name, station):
+        store = self._stores.get(station)
+        if store is not None and name in store.tables:
+            return store.tables[name]
+        with self._lock:
+            cached = self._tables.get((station, name))
+        if cached is None:
+            if name.startswith("tiles_"):
+                built = tiles(self.to_numpy(["Timestamp"] + TILE_COLUMNS, station=station))
+            else:
+                built = {name: aggregate(self.to_numpy(["Timestamp"] + AGGREGATED_COLUMNS, station=station), name)}
+            with self._lock:
+                self._tables.update({(station, k): v for k, v in built.items()})
+            cached = built[name]
+        return cached
+
+    def aggregates(self, period="daily", station=DEFAULT_STATION) -> pd.DataFrame:
+        """Daily or weekly min/mean/max and cooling degree-hours, indexed by period start."""
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period {period!r}; expected one of {list(PERIODS)}")
+        if not self._index.get(station):
+            return pd.DataFrame()
+        table = self._table(period, station)
+        return pd.DataFrame({k: v for k, v in table.items() if k != "Period"},
+                            index=pd.DatetimeIndex(table["Period"], name="Period"))
+
+    def range_tiles(self, start=None, end=None, station=DEFAULT_STATION, max_points=MAX_POINTS):
+        """(bucket hours, DataFrame) of TILE_COLUMNS min/mean/max over [start, end].
+
+        The finest resolution level with at most `max_points` buckets in the
+        range is used, so the frame stays bounded however long the range is.
+        """
+        dates = self.dates(station)
+        if not dates:
+            return TILE_HOURS[0], pd.DataFrame()
+        start = pd.Timestamp(start if start is not None else dates[0])
+        end = pd.Timestamp(end if end is not None else dates[-1])
+        if end == end.normalize():
+            end = end + pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
+        levels = {w: self._table(f"tiles_{w}h", station) for w in TILE_HOURS}
+        width, rows = pick_level({w: t["Period"] for w, t in levels.items()}, start, end, max_points)
+        table = levels[width]
+        frame = pd.DataFrame({k: np.asarray(v[rows]) for k, v in table.items() if k != "Period"},
+                             index=pd.DatetimeIndex(np.asarray(table["Period"][rows]), name="Timestamp"))
+        return width, frame
+
+    def day_summary(self, selected_date, station=DEFAULT_STATION) -> dict:
+        """The daily aggregate row of one date (empty if the date is not indexed)."""
+        day = _parse_date(selected_date)
+        if day not in self._index.get(station, {}):
+            return {}
+        table = self._table("daily", station)
+        i = int(np.searchsorted(table["Period"], np.datetime64(day, "ns")))
+        return {k: v[i].item() for k, v in table.items() if k != "Period"}
+
+    def long_day(self, selected_date, station=DEFAULT_STATION) -> pd.DataFrame:
+        """One day as chart-ready (Hour, Metric, Value) rows for LONG_METRICS."""
+        day = _parse_date(selected_date)
+        path = self._index.get(station, {}).get(day)
+        if path is None:
+            return pd.DataFrame(columns=["Hour", "Metric", "Value"])
+        store = self._stores.get(station)
+        if store is not None and "long" in store.tables:
+            start, stop = store.offsets[day.isoformat()]
+            k = len(LONG_METRICS)
+            data = {c: v[k * start:k * stop] for c, v in store.tables["long"].items()}
+        else:
+            columns = self._load(station, day, path)
+            data = long_form(columns, [(0, len(columns["Hour"]))])
+        return pd.DataFrame({
+            "Hour": data["Hour"],
+            "Metric": pd.Categorical.from_codes(data["Metric"], categories=LONG_METRICS),
+            "Value": data["Value"],
+        })
+
+    def day(self, selected_date, station=DEFAULT_STATION, columns=None) -> pd.DataFrame:
+        """One day of data as a DataFrame (empty if the date is not indexed)."""
+        day = _parse_date(selected_date)
+        path = self._index.get(station, {}).get(day)
+        columns = list(columns) if columns else COLUMNS
+        if path is None:
+            return pd.DataFrame(columns=columns)
+        data = self._load(station, day, path)
+        return pd.DataFrame({c: data[c] for c in columns})
+
+    def __contains__(self, selected_date):
+        return _parse_date(selected_date) in self._index.get(DEFAULT_STATION, {})
+
+    def query(self, start=None, end=None, station=None, columns=None) -> pd.DataFrame:
+        """Rows in [start, end] for one or all stations, restricted to `columns`."""
+        frames = []
+        for st_name, _, data in self._select(start, end, station, columns):
+            df = pd.DataFrame(data)
+            if station is None:
+                df.insert(0, "Station", st_name)
+            frames.append(df)
+        if not frames:
+            return pd.DataFrame(columns=(["Station"] if station is None else []) + (list(columns) if columns else COLUMNS))
+        return pd.concat(frames, ignore_index=True)
+
+    def to_numpy(self, columns, start=None, end=None, station=DEFAULT_STATION) -> dict:
+        """Contiguous arrays for `columns` over the query range."""
+        chunks = {c: [] for c in columns}
+        for _, _, data in self._select(start, end, station, columns):
+            for c in columns:
+                chunks[c].append(data[c])
+        return {c: np.ascontiguousarray(np.concatenate(parts)) if parts else np.empty(0)
+                for c, parts in chunks.items()}
+
+    def to_arrow(self, start=None, end=None, station=DEFAULT_STATION, columns=None):
+        """Query result as a pyarrow Table whose chunks wrap the cached partition buffers."""
+        import pyarrow as pa
+
+        columns = list(columns) if columns else COLUMNS
+        tables = [pa.table({c: pa.array(data[c]) for c in columns})
+                  for _, _, data in self._select(start, end, station, columns)]
+        if not tables:
+            return pa.table({c: pa.array([], type=pa.float64()) for c in columns})
+        return pa.concat_tables(tables)
+
+
+_dataset = None
+_dataset_lock = threading.Lock()
+
+
+def get_dataset() -> WeatherDataset:
+    """Process-wide dataset instance shared by all sessions."""
+    global _dataset
+    with _dataset_lock:
+        if _dataset is None:
+            _dataset = WeatherDataset()
+        return _dataset
+
+
+def data_version() -> str:
+    """Version of the weather data, for caches of results derived from it."""
+    return get_dataset().fingerprint()
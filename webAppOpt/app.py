@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 from report import generate_latex_report
 from export_figures import generate_oil_plot_pdf, generate_comparison_bar_pdf
@@ -35,7 +33,11 @@ from simulation import (
 )
 
 from description import render_description
-from plot import render_oil_plots
+from plot import render_oil_plots, oil_summaries
+from cancellation import run_latest
+from lazy import lazy
+
+plt = lazy("matplotlib.pyplot")
 
 st.set_page_config(layout="wide")
 
@@ -59,55 +61,12 @@ results_summary = {
 }
 fluid_data = {}
 
-for oil_name, props in oil_data.items():
-    fluid = get_fluid_props(props)
+for oil_name, fluid, summary in run_latest("summaries", oil_summaries, debounce=0, label="Optimizing fin spacing…"):
     fluid_data[oil_name] = fluid
 
-    optimal_spacing = optimize_fin_spacing(fluid, delta_T)
-    suggested = suggested_spacing(fluid)
-    Ra_base = compute_rayleigh(g, fluid['beta'], delta_T, D, fluid['nu'], fluid['alpha'])
-    Nu_base = churchill_chu(Ra_base, fluid['Pr'])
-    h_base = compute_h(Nu_base, fluid['k'], D)
-    
-    A_base = np.pi * D * N_r * N_c * L_array
-    Q_no_fin = h_base * A_base * delta_T
-    
-    Ra_fins_opt = compute_rayleigh(g, fluid['beta'], delta_T, optimal_spacing, fluid['nu'], fluid['alpha'])
-    A_base_opt, A_total_opt = compute_surface_area(optimal_spacing)
-    A_fins_opt = A_total_opt - A_base_opt
-    Nu_fins_opt = compute_nusselt_elenbaas(Ra_fins_opt, optimal_spacing / H)
-
-    h_fins_opt = compute_h(Nu_fins_opt, fluid['k'], optimal_spacing)
-    eta_opt = np.tanh(np.sqrt(2 * h_fins_opt / (237 * 0.001)) * 0.5) / (np.sqrt(2 * h_fins_opt / (237 * 0.001)) * 0.5)
-    Q_opt = Q_no_fin + h_fins_opt * eta_opt * A_fins_opt * delta_T
-    h_opt = Q_opt / (A_total_opt * delta_T)
-
-    A_base_sug, A_total_sug = compute_surface_area(suggested)
-    A_fins_sug = A_total_sug - A_base_sug
-    Ra_sug = compute_rayleigh(g, fluid['beta'], delta_T, suggested, fluid['nu'], fluid['alpha'])
-    Nu_sug = compute_nusselt_elenbaas(Ra_sug, suggested / H)
-    h_fins_sug = compute_h(Nu_sug, fluid['k'], suggested)
-    # h_fins_sug = fluid['k'] * compute_nusselt_elenbaas(
-    #     9.81 * fluid['beta'] * delta_T * suggested**3 / (fluid['nu'] * fluid['alpha']),
-    #     suggested / 0.5
-    # ) / suggested
-    eta_sug = compute_fin_efficiency(h_fins_sug, k_aluminum, fin_thickness, H)
-
-    # eta_sug = np.tanh(np.sqrt(2 * h_fins_sug / (237 * 0.001)) * 0.5) / (np.sqrt(2 * h_fins_sug / (237 * 0.001)) * 0.5)
-    Q_sug = Q_no_fin + h_fins_sug * eta_sug * A_fins_sug * delta_T
-    h_sug = Q_sug / (A_total_sug * delta_T)
-
     results_summary['Oil'].append(oil_name)
-    results_summary['Q_no_fin'].append(Q_no_fin)
-    results_summary['Q_opt'].append(Q_opt)
-    results_summary['Q_suggested'].append(Q_sug)
-    results_summary['h_no_fin'].append(h_base)
-    results_summary['h_opt'].append(h_opt)
-    results_summary['h_suggested'].append(h_sug)
-    results_summary['eta_opt'].append(eta_opt * 100)
-    results_summary['eta_suggested'].append(eta_sug * 100)
-    results_summary['spacing_opt'].append(optimal_spacing * 1000)
-    results_summary['spacing_suggested'].append(suggested * 1000)
+    for key, value in summary.items():
+        results_summary[key].append(value)
 
 # Constants for display
 constants = {
@@ -185,19 +144,18 @@ with right_col:
 
     # Oil-specific plots
     for oil_name in results_summary["Oil"]:
-        oil_pdf = generate_oil_plot_pdf(oil_name)
+        # PDFs are generated when the button is clicked, not on every rerun
         st.download_button(
             label=f"📑 Download {oil_name} Plots PDF",
-            data=oil_pdf,
+            data=lambda oil_name=oil_name: generate_oil_plot_pdf(oil_name),
             file_name=f"15_04_25_AJ_HeatTransfer_finSpacingOptimizationTwoOil_NC_{oil_name.replace(' ', '_').lower()}_plots.pdf",
             mime="application/pdf"
         )
 
     # Bar chart PDF
-    comparison_pdf = generate_comparison_bar_pdf(fig)
     st.download_button(
         label="📊 Download Comparison Bar Chart PDF",
-        data=comparison_pdf,
+        data=lambda: generate_comparison_bar_pdf(fig),
         file_name="15_04_25_AJ_HeatTransfer_finSpacingOptimizationTwoOil_NC_bar_comparison.pdf",
         mime="application/pdf"
     )
@@ -0,0 +1,276 @@
+# disk_cache.py
+"""
+Content-addressed result cache on disk, shared by all sessions, server
+restarts and worker processes.
+
+A key is the hash of a namespace, a code version and the call inputs.
+Inputs JSON cannot encode go through `by_content`: arrays are hashed by
+their bytes (or elements, for object arrays), DataFrames by row hashes, so
+two equal arrays always give the same key. The code version hashes the
+source files the result depends on, so editing them makes the old entries
+unreachable and eviction removes them later.
+Values are stored by type: bytes as-is (rendered PNGs and PDFs), NumPy
+arrays as `.npy`, and anything else pickled.
+
+An SQLite index (`index.sqlite`, WAL mode) records the size and last access
+of every entry, plus per-namespace hit/miss counters. It serializes writers
+across processes. Files are written to a temp name and renamed into place,
+so a reader never sees a partial entry. After each write the least recently
+used entries are removed until the total size fits `max_bytes`.
+
+    RESULT_CACHE_MB=512   size bound (default 512 MB)
+"""
+
+import datetime
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "results")
+MAX_BYTES = int(float(os.environ.get("RESULT_CACHE_MB", "512")) * 1024 * 1024)
+TOUCH_INTERVAL = 60  # s; last-access times are only rewritten this often
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed);
+CREATE TABLE IF NOT EXISTS counters (
+    namespace TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    writes INTEGER NOT NULL DEFAULT 0,
+    evictions INTEGER NOT NULL DEFAULT 0
+);
+"""
+EXTENSIONS = {"bytes": ".bin", "array": ".npy", "pickle": ".pkl"}
+
+
+def _source_file(obj):
+    if isinstance(obj, str):
+        return obj
+    return inspect.getsourcefile(obj)
+
+
+def source_version(*objs) -> str:
+    """Hash of the source files of the given modules, functions or paths."""
+    digest = hashlib.sha256()
+    for path in sorted({os.path.abspath(_source_file(obj)) for obj in objs}):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def by_content(value):
+    """JSON stand-in for a value json cannot encode; json.dumps recurses into the result."""
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return {"elements": value.tolist(), "shape": list(value.shape)}
+        data = np.ascontiguousarray(value).tobytes()
+        return {"array": hashlib.sha256(data).hexdigest(), "dtype": str(value.dtype), "shape": list(value.shape)}
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        rows = pd.util.hash_pandas_object(value, index=True).to_numpy()
+        return {"frame": hashlib.sha256(rows.tobytes()).hexdigest(),
+                "columns": [str(c) for c in (value.columns if isinstance(value, pd.DataFrame) else [value.name])]}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (bytes, bytearray)):
+        return {"bytes": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return repr(value)
+
+
+def content_key(namespace, version, *parts) -> str:
+    payload = json.dumps([namespace, version, parts], sort_keys=True, separators=(",", ":"), default=by_content)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _kind(value):
+    if isinstance(value, (bytes, bytearray)):
+        return "bytes"
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return "array"
+    return "pickle"
+
+
+class DiskCache:
+    def __init__(self, folder=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(folder, "objects"), exist_ok=True)
+        self._local = threading.local()
+        with self._db() as db:
+            db.executescript(SCHEMA)
+
+    def _db(self):
+        # One connection per thread; sqlite3 connections must not be shared between threads
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(os.path.join(self.folder, "index.sqlite"), timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return db
+
+    def _path(self, key, kind):
+        return os.path.join(self.folder, "objects", key[:2], key + EXTENSIONS[kind])
+
+    def _count(self, db, namespace, column, n=1):
+        db.execute("INSERT OR IGNORE INTO counters(namespace) VALUES (?)", (namespace,))
+        db.execute(f"UPDATE counters SET {column} = {column} + ? WHERE namespace = ?", (n, namespace))
+
+    def get(self, key, namespace=""):
+        """(True, value) on a hit, (False, None) on a miss."""
+        db = self._db()
+        row = db.execute("SELECT kind, accessed FROM entries WHERE key = ?", (key,)).fetchone()
+        value, hit = None, False
+        if row is not None:
+            try:
+                value = self._read(self._path(key, row[0]), row[0])
+                hit = True
+            except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                pass  # evicted by another process, or written by incompatible code
+        now = time.time()
+        with db:
+            self._count(db, namespace, "hits" if hit else "misses")
+            if hit and now - row[1] > TOUCH_INTERVAL:
+                db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            elif row is not None and not hit:
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        return hit, value
+
+    @staticmethod
+    def _read(path, kind):
+        if kind == "bytes":
+            with open(path, "rb") as f:
+                return f.read()
+        if kind == "array":
+            return np.load(path, allow_pickle=False)
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def put(self, key, value, namespace=""):
+        kind = _kind(value)
+        path = self._path(key, kind)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if kind == "bytes":
+                    f.write(value)
+                elif kind == "array":
+                    np.save(f, value, allow_pickle=False)
+                else:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(tmp)
+            if size > self.max_bytes:
+                os.remove(tmp)
+                return
+            os.replace(tmp, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        now = time.time()
+        db = self._db()
+        with db:
+            db.execute("INSERT OR REPLACE INTO entries(key, namespace, kind, size, created, accessed) "
+                       "VALUES (?, ?, ?, ?, ?, ?)", (key, namespace, kind, size, now, now))
+            self._count(db, namespace, "writes")
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the total size fits."""
+        db = self._db()
+        with db:
+            db.execute("BEGIN IMMEDIATE")  # one evicting process at a time
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for key, namespace, kind, size in db.execute(
+                    "SELECT key, namespace, kind, size FROM entries ORDER BY accessed"):
+                if total <= self.max_bytes:
+                    break
+                victims.append((key, namespace, kind))
+                total -= size
+            for key, namespace, kind in victims:
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._count(db, namespace, "evictions")
+        for key, _, kind in victims:
+            try:
+                os.remove(self._path(key, kind))
+            except OSError:
+                pass
+
+    def clear(self, namespace=None):
+        db = self._db()
+        with db:
+            query = "SELECT key, kind FROM entries" + (" WHERE namespace = ?" if namespace else "")
+            rows = db.execute(query, (namespace,) if namespace else ()).fetchall()
+            db.execute("DELETE FROM entries" + (" WHERE namespace = ?" if namespace else ""),
+                       (namespace,) if namespace else ())
+        for key, kind in rows:
+            try:
+                os.remove(self._path(key, kind))
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        db = self._db()
+        entries, total = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        namespaces = {
+            name: {"hits": hits, "misses": misses, "writes": writes, "evictions": evictions}
+            for name, hits, misses, writes, evictions in db.execute(
+                "SELECT namespace, hits, misses, writes, evictions FROM counters ORDER BY namespace")
+        }
+        return {"entries": entries, "bytes": total, "max_bytes": self.max_bytes, "namespaces": namespaces}
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(folder=CACHE_DIR) -> DiskCache:
+    with _caches_lock:
+        if folder not in _caches:
+            _caches[folder] = DiskCache(folder)
+        return _caches[folder]
+
+
+def persistent(namespace=None, depends=()):
+    """Cache a function's results on disk by its arguments and the source of its module and `depends`."""
+    def decorator(func):
+        name = namespace or f"{func.__module__}.{func.__qualname__}"
+        version = source_version(func, *depends)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = content_key(name, version, args, kwargs)
+            hit, value = get_cache().get(key, name)
+            if not hit:
+                value = func(*args, **kwargs)
+                get_cache().put(key, value, name)
+            return value
+
+        wrapper.version = version
+        return wrapper
+    return decorator
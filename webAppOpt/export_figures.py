@@ -1,8 +1,10 @@
 
-import matplotlib.pyplot as plt
 import numpy as np
 from io import BytesIO
-from matplotlib.backends.backend_pdf import PdfPages
+
+import simulation
+from disk_cache import persistent
+from lazy import lazy
 
 from plot import (
     oil_data, get_fluid_props, optimize_fin_spacing, suggested_spacing,
@@ -11,11 +13,16 @@ from plot import (
     compute_surface_area, compute_fin_efficiency, churchill_chu
 )
 
+# Loaded when a PDF is first generated, i.e. on the first download click
+plt = lazy("matplotlib.pyplot")
+backend_pdf = lazy("matplotlib.backends.backend_pdf")
+
+@persistent(depends=(simulation,))
 def generate_oil_plot_pdf(oil_name: str) -> bytes:
     props = oil_data[oil_name]
     fluid = get_fluid_props(props)
     optimal_spacing = optimize_fin_spacing(fluid, delta_T)
-    spacing_suggested = suggested_spacing(fluid)
+    spacing_suggested = suggested_spacing(fluid, delta_T)
 
     spacings = np.linspace(0.001, 0.05, 300)
     area_list, eta_list, h_list, Ra_list, Q_list, Nu_list, Nu_base_list, Nu_fins_list = [], [], [], [], [], [], [], []
@@ -45,7 +52,7 @@ def generate_oil_plot_pdf(oil_name: str) -> bytes:
         Nu_fins_list.append(Nu_fins)
 
     buffer = BytesIO()
-    with PdfPages(buffer) as pdf:
+    with backend_pdf.PdfPages(buffer) as pdf:
         # Surface Area
         fig, ax = plt.subplots()
         ax.plot(spacings, area_list, color='teal')
@@ -120,7 +127,7 @@ def generate_oil_plot_pdf(oil_name: str) -> bytes:
 
 def generate_comparison_bar_pdf(fig) -> bytes:
     buffer = BytesIO()
-    with PdfPages(buffer) as pdf:
+    with backend_pdf.PdfPages(buffer) as pdf:
         pdf.savefig(fig)
     buffer.seek(0)
     return buffer.read()
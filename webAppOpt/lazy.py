@@ -0,0 +1,111 @@
+# lazy.py
+"""
+Heavy third-party modules imported on first use.
+
+    plt = lazy("matplotlib.pyplot")
+
+`plt` is an empty placeholder module until an attribute is read from it.
+The first read imports the real module and copies its namespace into the
+placeholder, so later lookups cost the same as on the real module. This
+keeps matplotlib out of the cold start of reruns that only show cached results.
+Note that `from x import name` imports x straight away, so modules behind a
+proxy are used as `plt.subplots`, not imported by name.
+
+Each app keeps its own copy of this file, since each is deployed on its own
+from its folder; keep the copies' code in sync.
+
+`load_times()` shows which proxies have loaded and how long each one took.
+Run this file to get a `python -X importtime` breakdown of a cold start:
+
+    python lazy.py            # imports app.py (Streamlit bare mode)
+    python lazy.py plot export_figures --top 25
+"""
+
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+import types
+
+_load_times = {}  # module name -> seconds of its first import through a proxy
+_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = name
+
+    def _load(self):
+        name = self.__dict__["_lazy_target"]
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        with _lock:
+            _load_times.setdefault(name, time.perf_counter() - started)
+            self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        name = self.__dict__["_lazy_target"]
+        return f"<lazy module {name!r}{' (loaded)' if name in _load_times else ''}>"
+
+
+def lazy(name) -> types.ModuleType:
+    """The module itself if it is already imported, else a proxy that imports it on first use."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def load_times() -> dict:
+    with _lock:
+        return dict(_load_times)
+
+
+# --- Import-time report ---
+def importtime(modules, cwd=None) -> list:
+    """[(cumulative s, self s, depth, module)] from a fresh interpreter importing `modules`."""
+    code = "; ".join(f"import {m}" for m in modules)
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd, env=env,
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(cumulative_us) / 1e6, int(self_us) / 1e6, depth, name.strip()))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+    return rows
+
+
+def report(modules, top=15, cwd=None) -> str:
+    """Total cold-start import time and the packages that cost the most of it."""
+    rows = importtime(modules, cwd)
+    total = sum(c for c, _, depth, _ in rows if depth == 0)
+    # Self times summed per top-level package, so scipy.interpolate etc. count towards scipy
+    packages = {}
+    for _, self_s, _, name in rows:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0.0) + self_s
+    heaviest = sorted(((s, n) for n, s in packages.items() if n not in modules), reverse=True)
+    lines = [f"Cold import of {', '.join(modules)}: {total:.2f} s", f"{'self':>9}  package (with submodules)"]
+    lines += [f"{s:>8.3f}s  {n}" for s, n in heaviest[:top]]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import-time report for this app (python -X importtime).")
+    parser.add_argument("modules", nargs="*", default=["app"])
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    print(report(args.modules, args.top, cwd=os.path.dirname(os.path.abspath(__file__))))
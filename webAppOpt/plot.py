@@ -1,6 +1,5 @@
 # plot.py
 
-import matplotlib.pyplot as plt
 import numpy as np
 import streamlit as st
 from simulation import (
@@ -14,27 +13,60 @@ from simulation import (
     optimize_fin_spacing,
     suggested_spacing,
     oil_data,
+    oil_summary,
     delta_T,
     D, H, k_aluminum, fin_thickness
 )
+import simulation
+from cancellation import run_latest
+from disk_cache import content_key, get_cache, source_version
+from lazy import lazy
 
-def render_oil_plots():
-    st.subheader("📈 Select Oil & Plot Type")
+plt = lazy("matplotlib.pyplot")
+
+# Finished results, in memory and on disk, so going back to an oil costs nothing
+RESULTS_VERSION = source_version(simulation, __file__)
+_results = {}
+
+
+def cached_result(namespace, inputs, compute):
+    """Result for `inputs` from memory, else from the disk cache, else `compute()`."""
+    key = content_key(namespace, RESULTS_VERSION, inputs)
+    if key not in _results:
+        hit, value = get_cache().get(key, namespace)
+        if not hit:
+            value = compute()
+            get_cache().put(key, value, namespace)
+        _results[key] = value
+    return _results[key]
+
+
+def stop_when_cancelled(token):
+    """differential_evolution callback that ends the search once the token is cancelled."""
+    return lambda xk, convergence=0.0: token.cancelled
+
+
+def oil_summaries(token):
+    """(oil name, fluid, summary) for every oil."""
+    def compute(props):
+        result = oil_summary(props, delta_T, stop_when_cancelled(token))
+        token.check()
+        return result
+
+    return [(oil_name, *cached_result("oil_summary", [props, delta_T], lambda: compute(props)))
+            for oil_name, props in oil_data.items()]
 
-    oil_choice = st.selectbox("Select Oil Type", list(oil_data.keys()), key="oil_plot_select")
-    plot_options = [
-        "Rayleigh Number vs Fin Spacing",
-        "Heat Transfer Coefficient vs Fin Spacing",
-        "Surface Area vs Fin Spacing",
-        "Heat Transfer Rate vs Fin Spacing",
-        "Nusselt Numbers vs Fin Spacing"
-    ]
-    selected_plots = st.multiselect("Select plots to display", plot_options)
 
-    props = oil_data[oil_choice]
-    fluid = get_fluid_props(props)
-    optimal_spacing = optimize_fin_spacing(fluid, delta_T)
-    spacing_suggested = suggested_spacing(fluid)
+def oil_curves(token, oil_choice):
+    """Optimal spacing and the fin-spacing sweep for one oil."""
+    return cached_result("oil_curves", [oil_data[oil_choice], delta_T], lambda: _oil_curves(token, oil_choice))
+
+
+def _oil_curves(token, oil_choice):
+    fluid = get_fluid_props(oil_data[oil_choice])
+    optimal_spacing = optimize_fin_spacing(fluid, delta_T, stop_when_cancelled(token))
+    token.check()
+    spacing_suggested = suggested_spacing(fluid, delta_T)
 
     spacings = np.linspace(0.001, 0.05, 300)
     area_list, eta_list, h_list, Ra_list, Q_list, Nu_list, Nu_base_list, Nu_fins_list = [], [], [], [], [], [], [], []
@@ -44,6 +76,7 @@ def render_oil_plots():
     h_base = compute_h(Nu_base_D, fluid['k'], D)
 
     for d in spacings:
+        token.check()
         Ra_d = compute_rayleigh(9.81, fluid['beta'], delta_T, d, fluid['nu'], fluid['alpha'])
         Nu_d = compute_nusselt_elenbaas(Ra_d, d / H)
         h_d = compute_h(Nu_d, fluid['k'], d)
@@ -63,6 +96,31 @@ def render_oil_plots():
         Nu_base_list.append(Nu_base_D)
         Nu_fins_list.append(Nu_fins)
 
+    return {
+        "optimal_spacing": optimal_spacing, "spacing_suggested": spacing_suggested, "spacings": spacings,
+        "area": area_list, "h": h_list, "Ra": Ra_list, "Q": Q_list,
+        "Nu_base": Nu_base_list, "Nu_fins": Nu_fins_list,
+    }
+
+
+def render_oil_plots():
+    st.subheader("📈 Select Oil & Plot Type")
+
+    oil_choice = st.selectbox("Select Oil Type", list(oil_data.keys()), key="oil_plot_select")
+    plot_options = [
+        "Rayleigh Number vs Fin Spacing",
+        "Heat Transfer Coefficient vs Fin Spacing",
+        "Surface Area vs Fin Spacing",
+        "Heat Transfer Rate vs Fin Spacing",
+        "Nusselt Numbers vs Fin Spacing"
+    ]
+    selected_plots = st.multiselect("Select plots to display", plot_options)
+
+    curves = run_latest("oil_plots", oil_curves, oil_choice, label=f"Optimizing {oil_choice}…")
+    optimal_spacing, spacing_suggested = curves["optimal_spacing"], curves["spacing_suggested"]
+    spacings, area_list, Ra_list, Q_list = curves["spacings"], curves["area"], curves["Ra"], curves["Q"]
+    h_list, Nu_base_list, Nu_fins_list = curves["h"], curves["Nu_base"], curves["Nu_fins"]
+
     if "Surface Area vs Fin Spacing" in selected_plots:
         fig, ax = plt.subplots()
         ax.plot(spacings, area_list, color='teal')
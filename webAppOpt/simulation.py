@@ -1,8 +1,6 @@
 # simulation.py
 
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.optimize import differential_evolution, fsolve
 
 # Constants and Parameters
 g = 9.81
@@ -59,7 +57,10 @@ def compute_surface_area(spacing):
     A_fins_total = A_base + N_fins * A_fin_single
     return A_base, A_fins_total
 
-def optimize_fin_spacing(fluid, delta_T):
+def optimize_fin_spacing(fluid, delta_T, callback=None):
+    # Imported here: results usually come from the result cache, so most starts never need scipy
+    from scipy.optimize import differential_evolution
+
     def objective(spacing):
         d = spacing[0]
         if not spacing_min <= d <= spacing_max:
@@ -72,10 +73,14 @@ def optimize_fin_spacing(fluid, delta_T):
         eta = compute_fin_efficiency(h, k_aluminum, fin_thickness, H)
         return -h * eta * A_fins * delta_T
 
-    result = differential_evolution(objective, [(spacing_min, spacing_max)], strategy='best1bin', tol=1e-6)
+    # callback(xk, convergence) runs once per generation; returning True stops the search
+    result = differential_evolution(objective, [(spacing_min, spacing_max)], strategy='best1bin', tol=1e-6,
+                                    callback=callback)
     return result.x[0]
 
-def suggested_spacing(fluid):
+def suggested_spacing(fluid, delta_T):
+    from scipy.optimize import fsolve
+
     def spacing_eq(S, L):
         Ra = compute_rayleigh(g, fluid['beta'], delta_T, S, fluid['nu'], fluid['alpha'])
         return S - 2.71 * (Ra / (S**3 * L))**(-0.25)
@@ -94,3 +99,39 @@ def get_fluid_props(props):
     fluid['alpha'] = fluid['k'] / (fluid['rho'] * fluid['c_p'])
     fluid['Pr'] = fluid['nu'] / fluid['alpha']
     return fluid
+
+def oil_summary(props, delta_T=delta_T, callback=None):
+    """Fluid properties and the no-fin / optimal / suggested comparison for one oil."""
+    fluid = get_fluid_props(props)
+
+    optimal_spacing = optimize_fin_spacing(fluid, delta_T, callback)
+    suggested = suggested_spacing(fluid, delta_T)
+    Ra_base = compute_rayleigh(g, fluid['beta'], delta_T, D, fluid['nu'], fluid['alpha'])
+    Nu_base = churchill_chu(Ra_base, fluid['Pr'])
+    h_base = compute_h(Nu_base, fluid['k'], D)
+
+    A_base = np.pi * D * N_r * N_c * L_array
+    Q_no_fin = h_base * A_base * delta_T
+
+    def with_fins(spacing):
+        A_base_s, A_total = compute_surface_area(spacing)
+        Ra = compute_rayleigh(g, fluid['beta'], delta_T, spacing, fluid['nu'], fluid['alpha'])
+        h_fins = compute_h(compute_nusselt_elenbaas(Ra, spacing / H), fluid['k'], spacing)
+        eta = compute_fin_efficiency(h_fins, k_aluminum, fin_thickness, H)
+        Q = Q_no_fin + h_fins * eta * (A_total - A_base_s) * delta_T
+        return Q, Q / (A_total * delta_T), eta
+
+    Q_opt, h_opt, eta_opt = with_fins(optimal_spacing)
+    Q_sug, h_sug, eta_sug = with_fins(suggested)
+    return fluid, {
+        'Q_no_fin': Q_no_fin,
+        'Q_opt': Q_opt,
+        'Q_suggested': Q_sug,
+        'h_no_fin': h_base,
+        'h_opt': h_opt,
+        'h_suggested': h_sug,
+        'eta_opt': eta_opt * 100,
+        'eta_suggested': eta_sug * 100,
+        'spacing_opt': optimal_spacing * 1000,
+        'spacing_suggested': suggested * 1000,
+    }